@@ -1,20 +1,26 @@
 # Import packages
-import streamlit as st
-import pandas as pd
-import sys
+import importlib
 import os
+import sys
+import uuid
 from pathlib import Path
 
-# Set Python path
-current_dir = os.path.dirname(__file__)
-parent_dir = str(Path(current_dir).resolve().parents[0])
-sys.path.append(parent_dir)
+import streamlit as st
+
+# Set Python path, once per process rather than on every rerun
+parent_dir = str(Path(__file__).resolve().parents[1])
+if parent_dir not in sys.path:
+    sys.path.append(parent_dir)
+
+
+def get_display_function(module_name, function_name):
+    """
+    Imports the display module of a tab the first time the tab renders and returns its display function.
 
-# Import custom functions
-from tab_df.display import display_tab_df_content
-from tab_num.display import display_tab_num_content
-from tab_text.display import display_tab_text_content
-from tab_date.display import display_tab_date_content
+    The tab modules pull in pandas, numpy and altair, so importing them lazily lets the upload page render before
+    any of these packages is loaded. Later calls are served from sys.modules.
+    """
+    return getattr(importlib.import_module(module_name), function_name)
 
 # Set Streamlit Page Configuration
 st.set_page_config(
@@ -24,32 +30,96 @@ st.set_page_config(
     initial_sidebar_state="collapsed",
 )
 
-# Set objects in Streamlit session state
-st.session_state["file_path"] = None
-st.session_state["df"] = None
-st.session_state["dataset"] = None
-st.session_state["selected_num_col"] = None
-st.session_state["num_column"] = None
-st.session_state["selected_text_col"] = None
-st.session_state["text_column"] = None
-st.session_state["selected_date_col"] = None
-st.session_state["date_column"] = None
+# Set objects in Streamlit session state, keeping the ones computed during previous reruns
+SESSION_KEYS = [
+    "file_path",
+    "df",
+    "dataset",
+    "selected_num_col",
+    "num_column",
+    "selected_text_col",
+    "text_column",
+    "selected_date_col",
+    "date_column",
+    "database_path",
+]
+for key in SESSION_KEYS:
+    if key not in st.session_state:
+        st.session_state[key] = None
+
+# Identify the session so the memory used by its datasets can be tracked
+if "session_id" not in st.session_state:
+    st.session_state["session_id"] = uuid.uuid4().hex
 
 # Display Title
 st.title("CSV Explorer")
 
 # Add Window to upload CSV file
 with st.expander("ℹ️ - Streamlit application for performing data exploration on a CSV", expanded=True):
-    st.session_state.file_path = st.file_uploader("Choose a CSV file")
+    uploaded_files = st.file_uploader(
+        "Choose a CSV file (optionally .gz or .zst), the parts of a split CSV file or a SQLite database",
+        accept_multiple_files=True,
+    )
+
+# A single file is explored on its own, several files being the parts of one dataset in the order of their names
+uploaded_files = sorted(uploaded_files or [], key=lambda uploaded: uploaded.name)
+if len(uploaded_files) == 0:
+    st.session_state.file_path = None
+elif len(uploaded_files) == 1:
+    st.session_state.file_path = uploaded_files[0]
+else:
+    st.session_state.file_path = uploaded_files
+
+# Reset the objects computed for a previously uploaded file
+upload_id = tuple((uploaded.name, uploaded.size) for uploaded in uploaded_files) or None
+if st.session_state.get("upload_id") != upload_id:
+    # Close the connections to a previously uploaded database and remove its temporary copy
+    if hasattr(st.session_state.get("dataset"), "close"):
+        st.session_state.dataset.close()
+    if st.session_state.get("database_path") is not None:
+        try:
+            os.remove(st.session_state.database_path)
+        except OSError:
+            pass
+    for key in SESSION_KEYS[1:]:
+        st.session_state[key] = None
+    st.session_state["upload_id"] = upload_id
+
+# Extensions of the uploaded files profiled with SQL queries instead of Pandas
+DATABASE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# If a SQLite database is uploaded, display the different tabs computed by the database
+if len(uploaded_files) == 1 and uploaded_files[0].name.lower().endswith(DATABASE_EXTENSIONS):
+    tab_df, tab_num, tab_text, tab_date = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"])
+    with tab_df:
+        get_display_function("tab_df.display", "display_tab_df_sql_content")(file_path=st.session_state.file_path)
+    if st.session_state.dataset is not None:
+        display_sql_column_content = get_display_function("tab_df.display", "display_sql_column_content")
+        with tab_num:
+            display_sql_column_content(st.session_state.dataset, "num")
+        with tab_text:
+            display_sql_column_content(st.session_state.dataset, "text")
+        with tab_date:
+            display_sql_column_content(st.session_state.dataset, "date")
 
 # If a CSV file is uploaded, display the different tabs
-if st.session_state.file_path is not None:
+elif st.session_state.file_path is not None:
     tab_df, tab_num, tab_text, tab_date = st.tabs(["DataFrame", "Numeric Serie", "Text Serie", "Datetime Serie"])
     with tab_df:
-        display_tab_df_content(file_path=st.session_state.file_path)
+        get_display_function("tab_df.display", "display_tab_df_content")(file_path=st.session_state.file_path)
+    # A dataset loaded column by column is passed as a store the tabs parse their selected column from, otherwise the
+    # tabs reuse the schema and fingerprint computed once by the dataset instead of deriving them from df on each rerun
+    if st.session_state.dataset.df is None and st.session_state.dataset.schema is not None:
+        tab_source = {"store": st.session_state.dataset}
+    else:
+        tab_source = {
+            "df": st.session_state.dataset.df,
+            "schema": st.session_state.dataset.schema,
+            "dataset_key": st.session_state.dataset.get_key(),
+        }
     with tab_num:
-        display_tab_num_content(df=st.session_state.dataset.df)
+        get_display_function("tab_num.display", "display_tab_num_content")(**tab_source)
     with tab_text:
-        display_tab_text_content(df=st.session_state.dataset.df)
+        get_display_function("tab_text.display", "display_tab_text_content")(**tab_source)
     with tab_date:
-        display_tab_date_content(df=st.session_state.dataset.df)
\ No newline at end of file
+        get_display_function("tab_date.display", "display_tab_date_content")(**tab_source)
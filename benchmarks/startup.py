@@ -0,0 +1,120 @@
+"""
+Startup benchmark of the CSV Explorer.
+
+Each measure runs in a fresh Python process, as on a newly started replica:
+-> import cost of the heavy packages and of each tab module, from the output of `python -X importtime`
+-> time to first render of the upload page, and optionally of all tabs for a given CSV file, using Streamlit's
+AppTest (Streamlit 1.28 or later)
+
+Run from the root of the repository:
+    python benchmarks/startup.py [--repeat 3] [--csv path/to/file.csv]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+APP_PATH = ROOT_DIR / "app" / "streamlit_app.py"
+
+MODULES = [
+    "streamlit",
+    "numpy",
+    "pandas",
+    "altair",
+    "common.executor",
+    "tab_df.display",
+    "tab_num.display",
+    "tab_text.display",
+    "tab_date.display",
+]
+
+# Script rendering all the tabs of a CSV file, the file uploader not being supported by AppTest
+TABS_SCRIPT = """
+import sys
+sys.path.insert(0, {root!r})
+import streamlit as st
+for key in ["file_path", "df", "dataset", "selected_num_col", "num_column", "selected_text_col", "text_column",
+            "selected_date_col", "date_column", "session_id"]:
+    st.session_state.setdefault(key, None)
+from tab_df.display import display_tab_df_content
+display_tab_df_content(file_path={csv!r})
+from tab_num.display import display_tab_num_content
+display_tab_num_content(df=st.session_state.dataset.df)
+from tab_text.display import display_tab_text_content
+display_tab_text_content(df=st.session_state.dataset.df)
+from tab_date.display import display_tab_date_content
+display_tab_date_content(df=st.session_state.dataset.df)
+"""
+
+RENDER_SNIPPET = """
+import sys, time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file({path!r}, default_timeout=600).run()
+elapsed = time.perf_counter() - start
+if app.exception:
+    sys.exit("The application raised: " + str(app.exception[0].value))
+print(elapsed)
+"""
+
+
+def run_python(args):
+    # Run a fresh interpreter from the root of the repository so the tab packages can be imported
+    env = dict(os.environ, PYTHONPATH=str(ROOT_DIR))
+    return subprocess.run([sys.executable] + args, cwd=ROOT_DIR, env=env, capture_output=True, text=True, check=True)
+
+
+def measure_import(module_name):
+    """
+    Measures the cumulative time needed to import a module in a fresh process, in seconds.
+    """
+    result = run_python(["-X", "importtime", "-c", f"import {module_name}"])
+    for line in reversed(result.stderr.splitlines()):
+        fields = [field.strip() for field in line.split("|")]
+        if len(fields) == 3 and fields[2] == module_name:
+            return int(fields[1]) / 1e6
+    return 0.0
+
+
+def measure_render(script_path):
+    """
+    Measures the time needed to import Streamlit and render a script once in a fresh process, in seconds.
+    """
+    result = run_python(["-c", RENDER_SNIPPET.format(path=str(script_path))])
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="number of runs of each measure, the best one being kept")
+    parser.add_argument("--csv", help="CSV file used to also measure the first render of all tabs")
+    args = parser.parse_args()
+
+    print(f"{'Module':<24}{'Import time (s)':>16}")
+    for module_name in MODULES:
+        best = min(measure_import(module_name) for _ in range(args.repeat))
+        print(f"{module_name:<24}{best:>16.3f}")
+
+    try:
+        import streamlit.testing.v1  # noqa: F401
+    except ImportError:
+        print("\nStreamlit 1.28 or later is needed to measure the time to first render.")
+        return
+
+    print(f"\n{'Render':<24}{'Time (s)':>16}")
+    best = min(measure_render(APP_PATH) for _ in range(args.repeat))
+    print(f"{'upload page':<24}{best:>16.3f}")
+
+    if args.csv:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            script_path = Path(tmp_dir) / "tabs.py"
+            script_path.write_text(TABS_SCRIPT.format(root=str(ROOT_DIR), csv=str(Path(args.csv).resolve())))
+            best = min(measure_render(script_path) for _ in range(args.repeat))
+        print(f"{'all tabs':<24}{best:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+import altair as alt
+
+
+def get_heatmap(matrix, value_name="Correlation"):
+    """
+    Computes the Altair heatmap of a square matrix of values between -1 and 1, such as a correlation matrix.
+
+    Only the aggregated matrix is embedded in the chart, so its size depends on the number of columns and not on the
+    number of rows of the dataset.
+
+    Parameters:
+    matrix (pd.DataFrame): Square matrix indexed by column names.
+    value_name (str): Name of the values displayed in the legend and tooltips. Default is 'Correlation'.
+
+    Returns:
+    alt.Chart: Heatmap of the matrix.
+    """
+    heatmap_df = matrix.rename_axis(index="Column").reset_index().melt(
+        id_vars="Column", var_name="Other Column", value_name=value_name
+    )
+    return alt.Chart(heatmap_df).mark_rect().encode(
+        x=alt.X("Column:N", sort=None),
+        y=alt.Y("Other Column:N", sort=None),
+        color=alt.Color(f"{value_name}:Q", scale=alt.Scale(domain=[-1, 1], scheme="redblue")),
+        tooltip=["Column", "Other Column", alt.Tooltip(f"{value_name}:Q", format=".2f")],
+    )
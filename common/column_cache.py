@@ -0,0 +1,196 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnCache:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ColumnCache (class): Thread-safe least-recently-used cache of column-level results, bounded by their size in
+    bytes
+
+    --------------------
+    Attributes
+    --------------------
+    -> max_bytes (int): Maximum total size of the cached results (mandatory)
+    -> n_bytes (int): Current total size of the cached results (default set to 0)
+    -> n_hits (int): Number of lookups served from the cache (default set to 0)
+    -> n_misses (int): Number of lookups that had to compute their result (default set to 0)
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+        self.n_hits = 0
+        self.n_misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, fn):
+        """
+        Returns the result cached under key, or computes it with fn() and caches it.
+
+        Results larger than max_bytes are returned without being cached. The least recently used results are evicted
+        until the new one fits.
+
+        Parameters:
+        key (tuple): Identifier of the result, usually (dataset fingerprint, column name, kind, primitive).
+        fn (callable): Function without arguments computing the result.
+
+        Returns:
+        object: Cached or freshly computed result.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.n_hits += 1
+                return self._entries[key][0]
+            self.n_misses += 1
+
+        # Computed outside of the lock so other columns are not blocked meanwhile
+        value = fn()
+        size = get_nbytes(value)
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (value, size)
+            self.n_bytes += size
+            while self.n_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.n_bytes -= evicted_size
+
+        return value
+
+    def clear(self):
+        """
+        Removes all the cached results.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.n_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_nbytes(value):
+    """
+    Estimates the memory used by a cached result.
+
+    Parameters:
+    value (object): Numpy array, Pandas object, tuple/list/dict of them, or object exposing an nbytes attribute.
+
+    Returns:
+    int: Size of value in bytes.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(get_nbytes(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(get_nbytes(key) + get_nbytes(item) for key, item in value.items())
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, (int, np.integer)):
+        # Results such as OutlierDetector or DatasetSchema report the size of the arrays they hold
+        return int(nbytes)
+    return sys.getsizeof(value)
+
+
+# Cache shared by all the tabs and sessions of the Streamlit server
+COLUMN_CACHE = ColumnCache(max_bytes=int(os.environ.get("CSV_EXPLORER_CACHE_MB", 512)) * 1024 ** 2)
+
+
+def _cached(key, fn):
+    # Results of a series that is not attached to a known dataset cannot be shared safely
+    if key[0] is None:
+        return fn()
+    return COLUMN_CACHE.get_or_compute(key, fn)
+
+
+def get_null_mask(serie, dataset_key, kind):
+    """
+    Returns the boolean mask of the missing values of serie.
+
+    Parameters:
+    serie (pd.Series): Column content, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    kind (str): Conversion applied to the column before caching ('num', 'text' or 'date').
+
+    Returns:
+    np.ndarray: True where the value is missing.
+    """
+    return _cached(
+        (dataset_key, serie.name, kind, "null_mask"),
+        lambda: serie.isna().to_numpy(),
+    )
+
+
+def get_factorized(serie, dataset_key, kind):
+    """
+    Returns the factorized codes of serie in order of first appearance, missing values being coded as -1.
+
+    Parameters:
+    serie (pd.Series): Column content, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    kind (str): Conversion applied to the column before caching ('num', 'text' or 'date').
+
+    Returns:
+    tuple: Codes (np.ndarray) and unique values (pd.Index).
+    """
+    def factorize():
+        codes, uniques = pd.factorize(serie, use_na_sentinel=True)
+        return codes, pd.Index(uniques, name=serie.name)
+
+    return _cached((dataset_key, serie.name, kind, "factorized"), factorize)
+
+
+def get_value_counts(serie, dataset_key, kind):
+    """
+    Returns the number of occurrences of each value of serie, sorted by decreasing count like pd.Series.value_counts.
+
+    Parameters:
+    serie (pd.Series): Column content, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    kind (str): Conversion applied to the column before caching ('num', 'text' or 'date').
+
+    Returns:
+    pd.Series: Counts named 'count' and indexed by the values of serie, missing values excluded.
+    """
+    def count():
+        codes, uniques = get_factorized(serie, dataset_key, kind)
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        order = np.argsort(-counts, kind="stable")
+        return pd.Series(counts[order], index=uniques[order], name="count")
+
+    return _cached((dataset_key, serie.name, kind, "value_counts"), count)
+
+
+def get_sorted(serie, dataset_key, kind):
+    """
+    Returns the non-missing values of serie sorted in ascending order.
+
+    Parameters:
+    serie (pd.Series): Column content, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    kind (str): Conversion applied to the column before caching ('num', 'text' or 'date').
+
+    Returns:
+    np.ndarray: Sorted values.
+    """
+    def sort():
+        values = serie.to_numpy()[~get_null_mask(serie, dataset_key, kind)]
+        return np.sort(values, kind="stable")
+
+    return _cached((dataset_key, serie.name, kind, "sorted"), sort)
@@ -0,0 +1,205 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+# Maximum number of futures kept once they are finished
+MAX_CACHED_FUTURES = 128
+
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(8, (os.cpu_count() or 1) + 2),
+    thread_name_prefix="csv-explorer",
+)
+_FUTURES = OrderedDict()
+_OWNERS = {}
+_LOCK = threading.Lock()
+
+
+def submit(key, fn, *args, session_id=None, **kwargs):
+    """
+    Schedules fn(*args, **kwargs) on the background executor, or returns the future already scheduled for this key.
+
+    Keys are tuples starting with (dataset fingerprint, tab name, column name, ...), so results are shared between
+    reruns and sessions looking at the same dataset and column. Each session requesting a key is recorded as one of
+    its owners, so a session can only cancel the computations nobody else is waiting for. Cancelled or failed futures
+    are replaced.
+
+    Parameters:
+    key (tuple): Identifier of the computation.
+    fn (callable): Function to run in the background.
+    session_id (str): Identifier of the session requesting the computation. Default is None.
+
+    Returns:
+    concurrent.futures.Future: Future holding the result of the computation.
+    """
+    with _LOCK:
+        future = _get_cached(key, session_id)
+        if future is None:
+            future = _EXECUTOR.submit(fn, *args, **kwargs)
+            _add(key, future, session_id)
+        return future
+
+
+def submit_after(key, parent, fn, *args, session_id=None):
+    """
+    Schedules fn(parent.result(), *args) once the parent future has completed, or returns the future already
+    scheduled for this key.
+
+    The step is chained with a done callback instead of waiting for the parent inside a worker, so dependent steps
+    never hold a thread of the executor while their input is computed. The step is cancelled with its parent, and
+    fails with the exception of its parent.
+
+    Parameters:
+    key (tuple): Identifier of the computation.
+    parent (concurrent.futures.Future): Future holding the input of fn.
+    fn (callable): Function to run in the background.
+    session_id (str): Identifier of the session requesting the computation. Default is None.
+
+    Returns:
+    concurrent.futures.Future: Future holding the result of the computation.
+    """
+    with _LOCK:
+        future = _get_cached(key, session_id)
+        if future is not None:
+            return future
+        future = Future()
+        _add(key, future, session_id)
+
+    parent.add_done_callback(lambda done: _schedule_after(done, future, fn, args))
+    return future
+
+
+def cancel_others(dataset_key, tab, col_name, session_id=None):
+    """
+    Cancels the computations of a tab that a session scheduled for another column than col_name.
+
+    The session stops owning those computations, and only the ones no other session owns are cancelled. Futures that
+    have already started cannot be interrupted; they are dropped from the cache so their result is simply discarded.
+    Finished futures are kept so switching back to a column stays instant.
+
+    Parameters:
+    dataset_key (str): Fingerprint of the dataset.
+    tab (str): Name of the tab owning the computations.
+    col_name (str): Column currently selected in the tab.
+    session_id (str): Identifier of the session that changed its selected column. Default is None.
+
+    Returns:
+    int: Number of computations cancelled.
+    """
+    n_cancelled = 0
+    with _LOCK:
+        for key in list(_FUTURES):
+            if key[:2] != (dataset_key, tab) or key[2] == col_name:
+                continue
+            future = _FUTURES[key]
+            if future.done():
+                continue
+            owners = _OWNERS.get(key, set())
+            owners.discard(session_id)
+            if owners:
+                continue
+            future.cancel()
+            _remove(key)
+            n_cancelled += 1
+
+    return n_cancelled
+
+
+def discard(key):
+    """
+    Drops the computation of a key from the cache, cancelling it if it has not started, so its result can be freed.
+
+    Parameters:
+    key (tuple): Identifier of the computation.
+
+    Returns:
+    None
+    """
+    with _LOCK:
+        future = _FUTURES.get(key)
+        if future is not None:
+            future.cancel()
+            _remove(key)
+
+
+def _get_cached(key, session_id):
+    # Returns the future of key if it can be reused, recording session_id as one of its owners (lock must be held)
+    future = _FUTURES.get(key)
+    if future is None or future.cancelled() or (future.done() and future.exception() is not None):
+        return None
+    _FUTURES.move_to_end(key)
+    _OWNERS.setdefault(key, set()).add(session_id)
+    return future
+
+
+def _add(key, future, session_id):
+    # Caches a new future owned by session_id (lock must be held)
+    _FUTURES[key] = future
+    _FUTURES.move_to_end(key)
+    _OWNERS[key] = {session_id}
+    _evict()
+
+
+def _remove(key):
+    # Drops a future from the cache (lock must be held)
+    del _FUTURES[key]
+    _OWNERS.pop(key, None)
+
+
+def _schedule_after(parent, future, fn, args):
+    # Runs once the parent has completed, in the thread that completed it
+    if parent.cancelled():
+        future.cancel()
+    elif parent.exception() is not None:
+        if future.set_running_or_notify_cancel():
+            future.set_exception(parent.exception())
+    elif not future.done():
+        _EXECUTOR.submit(_run, future, fn, parent.result(), *args)
+
+
+def _run(future, fn, *args):
+    # Runs fn in a worker and stores its result in a future created by submit_after, unless it was cancelled meanwhile
+    if not future.set_running_or_notify_cancel():
+        return
+    try:
+        future.set_result(fn(*args))
+    except BaseException as error:
+        future.set_exception(error)
+
+
+def _evict():
+    # Drops the oldest finished futures once the cache is over its size limit (lock must be held)
+    for key in list(_FUTURES):
+        if len(_FUTURES) <= MAX_CACHED_FUTURES:
+            break
+        if _FUTURES[key].done():
+            _remove(key)
+
+
+def render_when_ready(blocks, message="Computing..."):
+    """
+    Fills each placeholder with its block content as soon as the matching future completes.
+
+    Parameters:
+    blocks (list): List of (placeholder, future, render) tuples, where placeholder comes from st.empty() and render
+    is called with the future result inside the placeholder once it is available.
+    message (str): Text shown in the placeholders while waiting.
+
+    Returns:
+    None
+    """
+    waiting = {}
+    for placeholder, future, render in blocks:
+        placeholder.info(message)
+        waiting.setdefault(future, []).append((placeholder, render))
+
+    for future in as_completed(waiting):
+        for placeholder, render in waiting[future]:
+            if future.cancelled():
+                placeholder.warning("Computation cancelled.")
+                continue
+            if future.exception() is not None:
+                placeholder.error(f"An error occurred during the computation: {future.exception()}")
+                continue
+            with placeholder.container():
+                render(future.result())
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+import weakref
+
+import pandas as pd
+
+# Fingerprints already computed for live dataframes, keyed by object id because dataframes are not hashable.
+# Each entry is removed when its dataframe is garbage collected, so the id of a collected frame is never reused.
+_FINGERPRINTS = {}
+_LOCK = threading.Lock()
+
+
+def dataset_fingerprint(df, chunk_size=100_000):
+    """
+    Computes a short, stable identifier for the content of a dataframe.
+
+    The shape, column names, data types and a hash of every row are combined, so two uploads only share an
+    identifier, and the cached results keyed on it, when their content is the same. The rows are hashed chunk_size
+    at a time, once per dataframe.
+
+    Parameters:
+    df (pd.DataFrame): Dataframe to identify.
+    chunk_size (int): Number of rows hashed at once. Default is 100,000.
+
+    Returns:
+    str: Hexadecimal fingerprint of the dataframe.
+    """
+    if df is None:
+        return None
+
+    key = id(df)
+    with _LOCK:
+        if key in _FINGERPRINTS:
+            return _FINGERPRINTS[key]
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(df.shape).encode())
+    digest.update(repr(list(df.columns)).encode())
+    digest.update(repr([str(dtype) for dtype in df.dtypes]).encode())
+    for start in range(0, len(df), chunk_size):
+        chunk = df.iloc[start:start + chunk_size]
+        digest.update(pd.util.hash_pandas_object(chunk, index=True).to_numpy().tobytes())
+
+    fingerprint = digest.hexdigest()
+    with _LOCK:
+        if key not in _FINGERPRINTS:
+            _FINGERPRINTS[key] = fingerprint
+            weakref.finalize(df, _FINGERPRINTS.pop, key, None)
+
+    return fingerprint
+
+
+def file_fingerprint(stream, chunk_size=1024 ** 2):
+    """
+    Computes a short identifier for the content of a binary stream, for instance an uploaded file as it is stored.
+
+    Parameters:
+    stream (file-like): Binary stream, read until its end.
+    chunk_size (int): Number of bytes read at once. Default is 1 MB.
+
+    Returns:
+    str: Hexadecimal fingerprint of the content.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in iter(lambda: stream.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
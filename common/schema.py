@@ -0,0 +1,226 @@
+import numpy as np
+import pandas as pd
+from common.column_cache import COLUMN_CACHE, get_nbytes
+from common.fingerprint import dataset_fingerprint
+
+# Types a column can be classified as
+NUMERIC = "numeric"
+NUMERIC_TEXT = "numeric as text"
+DATETIME = "datetime"
+CATEGORICAL = "categorical"
+TEXT = "free text"
+BOOLEAN = "boolean"
+ID = "ID-like"
+
+# Datetime formats tried, in order, on text columns
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y/%m/%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M",
+    "%d %b %Y",
+    "%b %d, %Y",
+]
+
+BOOLEAN_VALUES = {"true", "false", "yes", "no", "t", "f", "y", "n"}
+
+
+class DatasetSchema:
+    """
+    --------------------
+    Description
+    --------------------
+    -> DatasetSchema (class): Class that classifies every column of a dataset once, from a sample of its values, so
+    all tabs share the same column types
+
+    --------------------
+    Attributes
+    --------------------
+    -> cols_list (list): List of columns names of dataset (default set to empty list)
+    -> types (dict): Inferred type of each column (default set to empty dict)
+    -> formats (dict): Datetime format of the datetime columns stored as text, 'mixed' when no single format matches (default set to empty dict)
+    -> dtypes (dict): Pandas data type of each column (default set to empty dict)
+    """
+    def __init__(self):
+        self.cols_list = []
+        self.types = {}
+        self.formats = {}
+        self.dtypes = {}
+
+    @classmethod
+    def infer(cls, df, n_sample=1000, threshold=0.95):
+        """
+        Classifies each column of a dataframe as numeric, numeric as text, datetime, categorical, free text, boolean
+        or ID-like.
+
+        Parameters:
+        df (pd.DataFrame): Dataframe to classify.
+        n_sample (int): Number of non-missing values sampled per column. Default is 1000.
+        threshold (float): Minimum fraction of sampled values that must parse as numbers or dates. Default is 0.95.
+
+        Returns:
+        DatasetSchema: Inferred schema of df.
+        """
+        schema = cls()
+        schema.cols_list = df.columns.tolist()
+        for col_name in schema.cols_list:
+            serie = df[col_name]
+            schema.dtypes[col_name] = serie.dtype
+            col_type, col_format = infer_column_type(serie, n_sample, threshold)
+            schema.types[col_name] = col_type
+            if col_type == DATETIME:
+                schema.formats[col_name] = col_format
+        return schema
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the schema, in bytes, so the column cache can account for it.
+        """
+        return get_nbytes([self.cols_list, self.types, self.formats, self.dtypes])
+
+    def get_cols(self, *types):
+        """
+        Lists the columns classified as one of the given types, in the order of the dataset.
+
+        Returns:
+        list: Names of the matching columns.
+        """
+        return [col_name for col_name in self.cols_list if self.types[col_name] in types]
+
+    def get_num_cols(self):
+        """
+        Lists the columns analysed in the Numeric tab: numbers, including the ones stored as text.
+        """
+        return self.get_cols(NUMERIC, NUMERIC_TEXT)
+
+    def get_text_cols(self):
+        """
+        Lists the columns analysed in the Text tab: text values that are neither numbers nor dates.
+        """
+        return [
+            col_name for col_name in self.get_cols(CATEGORICAL, TEXT, BOOLEAN, ID)
+            if not pd.api.types.is_numeric_dtype(self.dtypes[col_name])
+        ]
+
+    def get_date_cols(self):
+        """
+        Lists the columns analysed in the Datetime tab.
+        """
+        return self.get_cols(DATETIME)
+
+    def get_table(self):
+        """
+        Formats the schema as a Pandas dataframe with the columns Column Name, Data Type, Inferred Type and Format.
+        """
+        return pd.DataFrame({
+            "Column Name": self.cols_list,
+            "Data Type": [str(self.dtypes[col_name]) for col_name in self.cols_list],
+            "Inferred Type": [self.types[col_name] for col_name in self.cols_list],
+            "Format": [self.formats.get(col_name) for col_name in self.cols_list],
+        })
+
+
+def sample_values(serie, n_sample):
+    """
+    Picks up to n_sample non-missing values spread evenly over a series.
+    """
+    values = serie.dropna()
+    if len(values) > n_sample:
+        values = values.iloc[np.linspace(0, len(values) - 1, n_sample).astype(int)]
+    return values
+
+
+def infer_column_type(serie, n_sample=1000, threshold=0.95):
+    """
+    Classifies a single column from a sample of its non-missing values.
+
+    Parameters:
+    serie (pd.Series): Column to classify.
+    n_sample (int): Number of non-missing values sampled. Default is 1000.
+    threshold (float): Minimum fraction of sampled values that must parse as numbers or dates. Default is 0.95.
+
+    Returns:
+    tuple: Inferred type (str) and datetime format (str or None).
+    """
+    if pd.api.types.is_bool_dtype(serie.dtype):
+        return BOOLEAN, None
+    if pd.api.types.is_datetime64_any_dtype(serie.dtype):
+        return DATETIME, None
+
+    values = sample_values(serie, n_sample)
+    if len(values) == 0:
+        return TEXT, None
+
+    # Numeric columns stay in the Numeric tab, even when they hold sequential identifiers
+    if pd.api.types.is_numeric_dtype(serie.dtype):
+        return NUMERIC, None
+
+    text = values.astype(str).str.strip()
+    if text.str.lower().isin(BOOLEAN_VALUES).all():
+        return BOOLEAN, None
+
+    if pd.to_numeric(text, errors="coerce").notna().mean() >= threshold:
+        return NUMERIC_TEXT, None
+
+    col_format = infer_date_format(text, threshold)
+    if col_format is not None:
+        return DATETIME, col_format
+
+    # Values that are all different and have no spaces look like identifiers (codes, UUIDs, ...)
+    n_unique = text.nunique()
+    if n_unique == len(text) and not text.str.contains(" ").any() and text.str.len().nunique() == 1:
+        return ID, None
+
+    if n_unique <= max(20, 0.05 * len(text)):
+        return CATEGORICAL, None
+
+    return TEXT, None
+
+
+def infer_date_format(text, threshold=0.95):
+    """
+    Finds the datetime format matching a sample of text values.
+
+    Parameters:
+    text (pd.Series): Sample of text values.
+    threshold (float): Minimum fraction of values that must parse. Default is 0.95.
+
+    Returns:
+    str: Matching format, 'mixed' when the values are dates without a single format, None when they are not dates.
+    """
+    for col_format in DATE_FORMATS:
+        if pd.to_datetime(text, format=col_format, errors="coerce").notna().mean() >= threshold:
+            return col_format
+
+    # Values mixing several formats are still dates, but have to be parsed one by one
+    if not text.str.contains(r"\d").all():
+        return None
+    if pd.to_datetime(text, format="mixed", errors="coerce").notna().mean() >= threshold:
+        return "mixed"
+    return None
+
+
+def get_schema(df):
+    """
+    Returns the schema of a dataframe that no dataset inferred it for, shared through the column cache. Datasets keep
+    their schema and pass it to the column objects, so it is never inferred again once evicted from the cache.
+
+    Parameters:
+    df (pd.DataFrame): Dataframe to classify.
+
+    Returns:
+    DatasetSchema: Inferred schema of df.
+    """
+    dataset_key = dataset_fingerprint(df)
+    if dataset_key is None:
+        return DatasetSchema()
+    return COLUMN_CACHE.get_or_compute(
+        (dataset_key, None, "schema", "schema"), lambda: DatasetSchema.infer(df)
+    )
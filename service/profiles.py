@@ -0,0 +1,221 @@
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from common.executor import discard, submit
+from tab_df.logics import Dataset
+from tab_df.snapshot import ProfileSnapshot
+from tab_df.sources import get_compression
+
+# Maximum size of an uploaded file, which can be changed through an environment variable (in megabytes)
+MAX_UPLOAD_BYTES = int(os.environ.get("CSV_EXPLORER_SERVICE_MAX_MB", 1024)) * 1024 ** 2
+
+# Maximum number of datasets kept, and number of seconds a dataset is kept after it was last requested, which can be
+# changed through environment variables
+MAX_DATASETS = int(os.environ.get("CSV_EXPLORER_SERVICE_MAX_DATASETS", 32))
+DATASET_TTL = int(os.environ.get("CSV_EXPLORER_SERVICE_TTL_S", 3600))
+
+# Session the datasets loaded by the service are registered under in the memory governor
+SERVICE_SESSION = "service"
+
+
+def compute_profile(file_path, name):
+    """
+    Loads a CSV file and computes its full profile with the same classes as the Streamlit tabs.
+
+    Parameters:
+    file_path (str): Path of the CSV file.
+    name (str): Name of the uploaded file.
+
+    Returns:
+    ProfileSnapshot: Profile of the dataset.
+    """
+    dataset = Dataset(file_path, session_id=SERVICE_SESSION)
+    dataset.set_df()
+    if dataset.is_df_none():
+        raise ValueError(f"The file {name} could not be loaded as a CSV file.")
+    dataset.set_data()
+    return ProfileSnapshot.from_dataset(dataset, name)
+
+
+def describe(dataset_id, dataset):
+    """
+    Describes the progress of the profile of a dataset of a ProfileStore.
+
+    Returns:
+    dict: Identifier, file name, status ('pending', 'running', 'done' or 'failed') and error message.
+    """
+    future = dataset["future"]
+    status, error = "pending", None
+    if future.cancelled():
+        # A cancelled profile is computed again at the next upload of the file
+        status, error = "failed", "The profile computation was cancelled."
+    elif future.running():
+        status = "running"
+    elif future.done():
+        error = future.exception()
+        status = "done" if error is None else "failed"
+    return {"id": dataset_id, "name": dataset["name"], "status": status, "error": None if error is None else str(error)}
+
+
+class ProfileStore:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProfileStore (class): Class that keeps the files uploaded to the profiling service and schedules their profile
+    on the shared background executor, identical uploads sharing the same profile
+
+    --------------------
+    Attributes
+    --------------------
+    -> directory (str): Folder the uploaded files are saved in (default set to a new temporary folder)
+    -> max_bytes (int): Maximum size of an uploaded file, in bytes (default set to 1 GB)
+    -> max_datasets (int): Maximum number of datasets kept, the least recently requested ones being removed first (default set to 32)
+    -> ttl (float): Number of seconds a dataset is kept after it was last requested (default set to 1 hour)
+    -> datasets (OrderedDict): Name, path, profile future and time of the last request of each dataset, by identifier,
+    from the least to the most recently requested (default set to empty OrderedDict)
+    """
+    def __init__(self, directory=None, max_bytes=MAX_UPLOAD_BYTES, max_datasets=MAX_DATASETS, ttl=DATASET_TTL):
+        self.directory = directory or tempfile.mkdtemp(prefix="csv-explorer-")
+        self.max_bytes = max_bytes
+        self.max_datasets = max_datasets
+        self.ttl = ttl
+        self.datasets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, stream, n_bytes, name="dataset.csv", chunk_size=1024 ** 2):
+        """
+        Saves an uploaded file chunk by chunk and schedules its profile, unless the same content was already uploaded.
+
+        Parameters:
+        stream (file-like): Stream the file content is read from.
+        n_bytes (int): Size of the file content, in bytes.
+        name (str): Name of the uploaded file. Default is 'dataset.csv'.
+        chunk_size (int): Number of bytes read at once. Default is 1 MB.
+
+        Returns:
+        str: Identifier of the dataset, derived from its content.
+        """
+        if n_bytes > self.max_bytes:
+            raise ValueError(f"The file exceeds the maximum upload size of {self.max_bytes} bytes.")
+
+        # Compressed uploads keep their extension, so they are decompressed while being loaded
+        suffix = ".csv" + (os.path.splitext(name)[1] if get_compression(name) else "")
+        digest = hashlib.blake2b(digest_size=16)
+        with tempfile.NamedTemporaryFile(dir=self.directory, suffix=suffix, delete=False) as file:
+            remaining = n_bytes
+            while remaining > 0:
+                chunk = stream.read(min(chunk_size, remaining))
+                if not chunk:
+                    break
+                digest.update(chunk)
+                file.write(chunk)
+                remaining -= len(chunk)
+        if remaining > 0:
+            os.remove(file.name)
+            raise ValueError("The upload ended before the announced size was received.")
+
+        dataset_id = digest.hexdigest()
+        with self._lock:
+            if dataset_id in self.datasets:
+                os.remove(file.name)
+            else:
+                self.datasets[dataset_id] = {"name": name, "path": file.name, "future": None}
+            self.touch(dataset_id)
+            self.schedule(dataset_id)
+            self.evict()
+        return dataset_id
+
+    def schedule(self, dataset_id):
+        # Profiles are computed on the shared executor, which returns the running future if there is one
+        dataset = self.datasets[dataset_id]
+        future = dataset["future"]
+        if future is None or future.cancelled() or (future.done() and future.exception() is not None):
+            dataset["future"] = submit(
+                (dataset_id, "service", None, "profile"), compute_profile, dataset["path"], dataset["name"]
+            )
+
+    def touch(self, dataset_id):
+        # Marks a dataset as the most recently requested one (lock must be held)
+        self.datasets[dataset_id]["accessed"] = time.monotonic()
+        self.datasets.move_to_end(dataset_id)
+
+    def evict(self):
+        """
+        Removes the datasets that were not requested for ttl seconds, then the least recently requested ones beyond
+        max_datasets, deleting their uploaded file and dropping their profile (lock must be held).
+
+        Returns:
+        None
+        """
+        now = time.monotonic()
+        for dataset_id in list(self.datasets):
+            dataset = self.datasets[dataset_id]
+            if len(self.datasets) <= self.max_datasets and now - dataset["accessed"] <= self.ttl:
+                continue
+            del self.datasets[dataset_id]
+            discard((dataset_id, "service", None, "profile"))
+            try:
+                os.remove(dataset["path"])
+            except OSError:
+                pass
+
+    def get(self, dataset_id):
+        """
+        Returns the name, path and profile future of a dataset, marking it as requested.
+
+        Parameters:
+        dataset_id (str): Identifier returned by add.
+
+        Returns:
+        dict: Dataset, None if it is unknown or was removed.
+        """
+        with self._lock:
+            self.evict()
+            if dataset_id not in self.datasets:
+                return None
+            self.touch(dataset_id)
+            return self.datasets[dataset_id]
+
+    def get_status(self, dataset_id):
+        """
+        Describes the progress of the profile of a dataset.
+
+        Parameters:
+        dataset_id (str): Identifier returned by add.
+
+        Returns:
+        dict: Identifier, file name, status ('pending', 'running', 'done' or 'failed') and error message.
+        """
+        dataset = self.get(dataset_id)
+        if dataset is None:
+            raise KeyError(dataset_id)
+        return describe(dataset_id, dataset)
+
+    def list(self):
+        """
+        Describes the progress of the profile of every dataset, without marking them as requested.
+        """
+        with self._lock:
+            self.evict()
+            datasets = list(self.datasets.items())
+        return [describe(dataset_id, dataset) for dataset_id, dataset in datasets]
+
+    def get_profile(self, dataset_id):
+        """
+        Returns the profile of a dataset, or None while it is being computed.
+
+        Parameters:
+        dataset_id (str): Identifier returned by add.
+
+        Returns:
+        ProfileSnapshot: Profile of the dataset, None if it is not ready yet.
+        """
+        dataset = self.get(dataset_id)
+        if dataset is None or not dataset["future"].done() or dataset["future"].cancelled():
+            return None
+        return dataset["future"].result()
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import re
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+# Add the project root so the service can be started as a script
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.append(ROOT)
+
+from service.profiles import ProfileStore, describe
+
+# Routes of the GET requests, matched in order against the decoded path of the URL, so column names can contain "/"
+ROUTES = [
+    (re.compile(r"^/datasets$"), "list_datasets"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)$"), "get_status"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)/profile$"), "get_profile"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)/summary$"), "get_summary"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)/columns$"), "list_columns"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)/columns/(?P<col_name>.+)/frequent$"), "get_frequent"),
+    (re.compile(r"^/datasets/(?P<dataset_id>\w+)/columns/(?P<col_name>.+)$"), "get_column"),
+]
+
+
+class ProfileRequestHandler(BaseHTTPRequestHandler):
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProfileRequestHandler (class): Class that answers the HTTP requests of the profiling service with JSON, each
+    request being handled in its own thread by ThreadingHTTPServer
+
+    --------------------
+    Attributes
+    --------------------
+    -> store (ProfileStore): Uploaded datasets and their profiles, shared by all requests (set by create_server)
+    """
+    store = None
+
+    def do_POST(self):
+        # Uploads a CSV file sent as the request body, its name being given by the 'name' query parameter
+        url = urlparse(self.path)
+        if url.path != "/datasets":
+            self.send_json(404, {"error": f"Unknown path {url.path}"})
+            return
+
+        n_bytes = self.headers.get("Content-Length", "")
+        if not n_bytes.isdigit():
+            self.send_json(411, {"error": "The Content-Length header is required."})
+            return
+        if int(n_bytes) > self.store.max_bytes:
+            self.send_json(413, {"error": f"The file exceeds the maximum upload size of {self.store.max_bytes} bytes."})
+            return
+
+        name = parse_qs(url.query).get("name", ["dataset.csv"])[0]
+        try:
+            dataset_id = self.store.add(self.rfile, int(n_bytes), name)
+        except ValueError as error:
+            self.send_json(400, {"error": str(error)})
+            return
+        try:
+            self.send_json(202, self.store.get_status(dataset_id))
+        except KeyError:
+            # Concurrent uploads can evict the dataset before its status is read
+            self.send_json(404, {"error": f"Unknown dataset {dataset_id}"})
+
+    def do_GET(self):
+        # Dispatches the request to the method of the first matching route. The dataset is fetched once and passed to
+        # the method, so it can be evicted by another request in the meantime without failing this one.
+        path = unquote(urlparse(self.path).path.rstrip("/"))
+        for pattern, method in ROUTES:
+            match = pattern.match(path)
+            if match is None:
+                continue
+            params = match.groupdict()
+            if "dataset_id" in params:
+                params["dataset"] = self.store.get(params["dataset_id"])
+                if params["dataset"] is None:
+                    self.send_json(404, {"error": f"Unknown dataset {params['dataset_id']}"})
+                    return
+            getattr(self, method)(**params)
+            return
+        self.send_json(404, {"error": f"Unknown path {path}"})
+
+    def list_datasets(self):
+        self.send_json(200, self.store.list())
+
+    def get_status(self, dataset_id, dataset):
+        self.send_json(200, describe(dataset_id, dataset))
+
+    def get_profile(self, dataset_id, dataset):
+        profile = self.get_ready_profile(dataset_id, dataset)
+        if profile is not None:
+            self.send_json(200, {"source": profile.source, "created": profile.created,
+                                 "summary": profile.summary, "columns": profile.columns})
+
+    def get_summary(self, dataset_id, dataset):
+        profile = self.get_ready_profile(dataset_id, dataset)
+        if profile is not None:
+            self.send_json(200, profile.summary)
+
+    def list_columns(self, dataset_id, dataset):
+        profile = self.get_ready_profile(dataset_id, dataset)
+        if profile is not None:
+            self.send_json(200, {col_name: column["kind"] for col_name, column in profile.columns.items()})
+
+    def get_column(self, dataset_id, dataset, col_name):
+        column = self.get_ready_column(dataset_id, dataset, col_name)
+        if column is not None:
+            self.send_json(200, {"kind": column["kind"], "summary": column["summary"]})
+
+    def get_frequent(self, dataset_id, dataset, col_name):
+        column = self.get_ready_column(dataset_id, dataset, col_name)
+        if column is not None:
+            self.send_json(200, column["frequent"])
+
+    def get_ready_profile(self, dataset_id, dataset):
+        # Answers 202 while the profile is computed and 500 if it failed, returning the profile otherwise
+        status = describe(dataset_id, dataset)
+        if status["status"] in ("pending", "running"):
+            self.send_json(202, status)
+            return None
+        if status["status"] == "failed":
+            self.send_json(500, status)
+            return None
+        return dataset["future"].result()
+
+    def get_ready_column(self, dataset_id, dataset, col_name):
+        profile = self.get_ready_profile(dataset_id, dataset)
+        if profile is None:
+            return None
+        if col_name not in profile.columns:
+            self.send_json(404, {"error": f"Unknown column {col_name}"})
+            return None
+        return profile.columns[col_name]
+
+    def send_json(self, code, content):
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def create_server(host="127.0.0.1", port=8765, store=None):
+    """
+    Creates the profiling service, answering each request in its own thread.
+
+    Parameters:
+    host (str): Address the service listens on. Default is '127.0.0.1'.
+    port (int): Port the service listens on, 0 picking a free one. Default is 8765.
+    store (ProfileStore): Store holding the datasets. Default is a new ProfileStore.
+
+    Returns:
+    ThreadingHTTPServer: Server, started with serve_forever().
+    """
+    handler = type("Handler", (ProfileRequestHandler,), {"store": store or ProfileStore()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the profiles of uploaded CSV files as JSON.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on.")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port)
+    print(f"Profiling service listening on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,134 @@
 import streamlit as st
+from common.executor import cancel_others, render_when_ready, submit, submit_after
+from common.fingerprint import dataset_fingerprint
 from tab_date.logics import DateColumn
 
-def display_tab_date_content(file_path=None, df=None):
-   
-    # Instantiates the DateColumn object
-    if st.session_state.date_column is None:
-        st.session_state.date_column = DateColumn(file_path=file_path, df=df)
-    
-    # Calls find_date_cols method to generate a list of datetime columns
-    st.session_state.date_column.find_date_cols()
+def display_tab_date_content(file_path=None, df=None, store=None, schema=None, dataset_key=None):
+
+    if store is not None:
+        # Lists the datetime columns of a dataset loaded column by column from its schema, or its text columns like find_date_cols
+        cols_list = store.schema.get_date_cols() or store.schema.get_text_cols()
+    else:
+        # Instantiates the DateColumn object
+        if st.session_state.date_column is None:
+            st.session_state.date_column = DateColumn(file_path=file_path, df=df, schema=schema, dataset_key=dataset_key)
+
+        # Calls find_date_cols method to generate a list of datetime columns
+        st.session_state.date_column.find_date_cols()
+        cols_list = st.session_state.date_column.cols_list
 
     # Dropdown list for datetime columns
     st.session_state.selected_date_col = st.selectbox(
         'Which datetime column do you want to explore',
-        st.session_state.date_column.cols_list
+        cols_list
     )
 
-    # Setting up the data for the selected column
-    st.session_state.date_column.set_data(col_name=st.session_state.selected_date_col)
+    if st.session_state.selected_date_col is None:
+        return
+
+    # Cancels the computations this session still has pending for a previously selected column
+    session_id = st.session_state.get('session_id')
+    # The fingerprint passed by the dataset is kept on the DateColumn object, so it is only computed once without one
+    if store is not None:
+        dataset_key = store.get_key()
+    else:
+        if st.session_state.date_column.dataset_key is None:
+            st.session_state.date_column.dataset_key = dataset_fingerprint(st.session_state.date_column.df)
+        dataset_key = st.session_state.date_column.dataset_key
+    cancel_others(dataset_key, 'date', st.session_state.selected_date_col, session_id)
+
+    # Setting up the data for the selected column and each block of results in the background, the column of a
+    # dataset loaded column by column being parsed first
+    key = (dataset_key, 'date', st.session_state.selected_date_col)
+    if store is not None:
+        column = submit(key + ('serie',), _load_projected_column, store, st.session_state.selected_date_col, session_id=session_id)
+    else:
+        column = submit(
+            key + ('serie',), _load_column, st.session_state.date_column.df, st.session_state.selected_date_col,
+            st.session_state.date_column.get_schema(), dataset_key, session_id=session_id,
+        )
+    summary = submit_after(key + ('summary',), column, _compute_summary, session_id=session_id)
+    barchart = submit_after(key + ('barchart',), column, _compute_barchart, session_id=session_id)
+    frequent = submit_after(key + ('frequent',), column, _compute_frequent, session_id=session_id)
+    regularity = submit_after(key + ('regularity',), column, _compute_regularity, session_id=session_id)
 
     # First Streamlit Expander container
     with st.expander('Datetime Column', expanded=True):
-        # Display the summary as a Streamlit table
-        st.table(st.session_state.date_column.get_summary())
+        # Placeholder for the summary as a Streamlit table
+        summary_slot = st.empty()
 
-        # Display the bar chart
+        # Placeholder for the bar chart
         st.write('**Bar Chart**')
-        st.altair_chart(st.session_state.date_column.barchart, use_container_width=True)
+        barchart_slot = st.empty()
 
-        # Display the most frequent values dataframe
+        # Placeholder for the most frequent values dataframe
         st.write('**Most Frequent Values**')
-        st.dataframe(st.session_state.date_column.frequent)
+        frequent_slot = st.empty()
+
+        # Placeholder for the intervals between timestamps
+        st.write('**Regularity and Gaps**')
+        regularity_slot = st.empty()
+
+        # Displays each block as soon as its result is ready
+        render_when_ready([
+            (summary_slot, summary, st.table),
+            (barchart_slot, barchart, lambda chart: st.altair_chart(chart, use_container_width=True)),
+            (frequent_slot, frequent, st.dataframe),
+            (regularity_slot, regularity, display_regularity),
+        ])
+
+def display_regularity(regularity):
+    """
+    Displays the dominant interval, the largest gaps and the bursts of the column.
+    """
+    st.table(regularity.get_summary())
+    st.write('Largest Gaps')
+    st.dataframe(regularity.get_gaps())
+    st.write('Bursts')
+    st.dataframe(regularity.get_bursts())
+
+def _load_projected_column(store, col_name):
+    """
+    Parses the selected column the first time it is explored.
+    """
+    return _load_column(store.get_columns([col_name]), col_name, store.schema, store.get_key())
+
+def _load_column(df, col_name, schema=None, dataset_key=None):
+    """
+    Loads the selected column as datetime in a new DateColumn object, with the schema and fingerprint of its dataset.
+    """
+    date_column = DateColumn(df=df, schema=schema, dataset_key=dataset_key)
+    date_column.find_date_cols()
+    date_column.set_serie(col_name)
+    return date_column
+
+def _compute_summary(date_column):
+    """
+    Computes the summary table of the column loaded by _load_column.
+    """
+    date_column.set_stats()
+    return date_column.get_summary()
+
+def _compute_barchart(date_column):
+    """
+    Computes the bar chart of the column loaded by _load_column.
+    """
+    date_column.set_barchart()
+    return date_column.barchart
+
+def _compute_frequent(date_column):
+    """
+    Computes the most frequent values of the column loaded by _load_column.
+    """
+    date_column.set_frequent()
+    return date_column.frequent
+
+def _compute_regularity(date_column):
+    """
+    Computes the regularity analysis of the column loaded by _load_column.
+    """
+    date_column.set_regularity()
+    return date_column.regularity
 
 if __name__ == '__main__':
     display_tab_date_content()
@@ -2,16 +2,23 @@
 
 import pandas as pd
 import altair as alt
+from common.column_cache import get_null_mask, get_sorted, get_value_counts
+from common.fingerprint import dataset_fingerprint
+from common.schema import get_schema
+from tab_date.regularity import TimeRegularity
 
 class DateColumn:
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, schema=None, dataset_key=None):
         """
-        Class constructor to initialize the DateColumn object.
+        Class constructor to initialize the DateColumn object, the schema and fingerprint of df being passed by the dataset that loaded it.
         """
         self.file_path = file_path
         self.df = df
+        self.schema = schema
+        self.dataset_key = dataset_key
         self.cols_list = []
         self.serie = None
+        self.date_format = None
         self.n_unique = None
         self.n_missing = None
         self.col_min = None
@@ -21,6 +28,7 @@ class DateColumn:
         self.n_future = None
         self.n_empty_1900 = None
         self.n_empty_1970 = None
+        self.regularity = None
         self.barchart = alt.Chart()
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
     
@@ -35,13 +43,13 @@ class DateColumn:
             else:
                 return
 
-        date_cols = self.df.select_dtypes(include=['datetime']).columns
+        schema = self.get_schema()
+        date_cols = schema.get_date_cols()
         if len(date_cols) == 0:
             # If no datetime columns found, look for text columns
-            text_cols = self.df.select_dtypes(include=['object']).columns
-            self.cols_list = text_cols.tolist()
+            self.cols_list = schema.get_text_cols()
         else:
-            self.cols_list = date_cols.tolist()
+            self.cols_list = date_cols
 
     def set_data(self, col_name):
         """
@@ -51,26 +59,54 @@ class DateColumn:
             return
 
         if col_name in self.cols_list:
-            self.serie = self.df[col_name].dropna()  # Drop rows with null values
-            self.convert_serie_to_date()
-            self.set_unique()
-            self.set_missing()
-            self.set_min()
-            self.set_max()
-            self.set_weekend()
-            self.set_weekday()
-            self.set_future()
-            self.set_empty_1900()
-            self.set_empty_1970()
+            self.set_serie(col_name)
+            self.set_stats()
             self.set_barchart()
             self.set_frequent()
+            self.set_regularity()
+
+    def set_serie(self, col_name):
+        """
+        Method to load the selected column as datetime without computing any information.
+        """
+        if self.df is None:
+            return
+
+        if col_name in self.cols_list:
+            if self.dataset_key is None:
+                self.dataset_key = dataset_fingerprint(self.df)
+            self.serie = self.df[col_name].dropna()  # Drop rows with null values
+            self.date_format = self.get_schema().formats.get(col_name)
+            self.convert_serie_to_date()
+
+    def set_stats(self):
+        """
+        Method to compute all the information displayed in the summary table.
+        """
+        self.set_unique()
+        self.set_missing()
+        self.set_min()
+        self.set_max()
+        self.set_weekend()
+        self.set_weekday()
+        self.set_future()
+        self.set_empty_1900()
+        self.set_empty_1970()
 
     def convert_serie_to_date(self):
         """
-        Method to convert a Pandas Series to datetime data type.
+        Method to convert a Pandas Series to datetime data type, using the format found by the schema when there is one.
         """
         if self.serie is not None:
-            self.serie = pd.to_datetime(self.serie, errors='coerce')
+            self.serie = pd.to_datetime(self.serie, errors='coerce', format=self.date_format)
+
+    def get_schema(self):
+        """
+        Method to return the schema of the dataframe, inferring it only if the dataset did not pass one.
+        """
+        if self.schema is None:
+            self.schema = get_schema(self.df)
+        return self.schema
 
     def is_serie_none(self):
         """
@@ -83,28 +119,30 @@ class DateColumn:
         Method to compute the number of unique values in a series.
         """
         if not self.is_serie_none():
-            self.n_unique = self.serie.nunique()
+            self.n_unique = len(get_value_counts(self.serie, self.dataset_key, 'date'))
 
     def set_missing(self):
         """
         Method to compute the number of missing values in a series.
         """
         if not self.is_serie_none():
-            self.n_missing = self.serie.isnull().sum()
+            self.n_missing = get_null_mask(self.serie, self.dataset_key, 'date').sum()
 
     def set_min(self):
         """
         Method to compute the minimum value in a series.
         """
         if not self.is_serie_none():
-            self.col_min = self.serie.min()
+            values = get_sorted(self.serie, self.dataset_key, 'date')
+            self.col_min = pd.Timestamp(values[0]) if len(values) > 0 else pd.NaT
 
     def set_max(self):
         """
         Method to compute the maximum value in a series.
         """
         if not self.is_serie_none():
-            self.col_max = self.serie.max()
+            values = get_sorted(self.serie, self.dataset_key, 'date')
+            self.col_max = pd.Timestamp(values[-1]) if len(values) > 0 else pd.NaT
 
     def set_weekend(self):
         """
@@ -162,11 +200,21 @@ class DateColumn:
         Method to compute the dataframe containing the most frequent values in a series.
         """
         if not self.is_serie_none():
-            values_count = self.serie.value_counts().reset_index()
+            values_count = get_value_counts(self.serie, self.dataset_key, 'date').reset_index()
             values_count.columns = ['value', 'occurrence']
             values_count['percentage'] = values_count['occurrence'] / len(self.serie) * 100
             self.frequent = values_count.head(end)
 
+    def set_regularity(self):
+        """
+        Method to analyse the intervals between the timestamps of a series, reusing its cached sorted values.
+        """
+        if not self.is_serie_none():
+            sorted_values = None
+            if self.serie.dtype.kind == 'M':
+                sorted_values = get_sorted(self.serie, self.dataset_key, 'date')
+            self.regularity = TimeRegularity.from_values(self.serie, sorted_values)
+
     def get_summary(self):
         """
         Method to format all requested information from self.serie for display.
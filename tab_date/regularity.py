@@ -0,0 +1,235 @@
+import numpy as np
+import pandas as pd
+
+
+def to_int64(values):
+    """
+    Converts datetime values into int64 nanoseconds since the epoch, missing values excluded.
+
+    Parameters:
+    values (pd.Series or np.ndarray): Datetime values, timezone-aware values being converted to UTC.
+
+    Returns:
+    np.ndarray: Timestamps as int64, in the same order as values.
+    """
+    values = pd.Series(values)
+    if not pd.api.types.is_datetime64_any_dtype(values.dtype):
+        values = pd.to_datetime(values, errors="coerce")
+    if isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = values.dt.tz_convert(None)
+    values = values.dropna()
+    return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+
+
+class TimeRegularity:
+    """
+    --------------------
+    Description
+    --------------------
+    -> TimeRegularity (class): Class that analyses the spacing of the timestamps of a datetime column from their sorted
+    values and the differences between consecutive ones: dominant interval, gaps, bursts and order of arrival
+
+    --------------------
+    Attributes
+    --------------------
+    -> sorted_values (np.ndarray): Timestamps sorted in ascending order, as int64 nanoseconds (default set to empty array)
+    -> diffs (np.ndarray): Differences between consecutive sorted timestamps, in nanoseconds (default set to empty array)
+    -> last_value (int): Last timestamp in order of arrival (default set to None)
+    -> n_out_of_order (int): Number of timestamps earlier than the one received just before (default set to 0)
+    -> n_increasing (int): Number of timestamps later than the one received just before (default set to 0)
+    """
+    def __init__(self):
+        self.sorted_values = np.array([], dtype=np.int64)
+        self.diffs = np.array([], dtype=np.int64)
+        self.last_value = None
+        self.n_out_of_order = 0
+        self.n_increasing = 0
+
+    @classmethod
+    def from_values(cls, values, sorted_values=None):
+        """
+        Analyses the timestamps of a column.
+
+        Parameters:
+        values (pd.Series or np.ndarray): Datetime values in order of arrival.
+        sorted_values (np.ndarray): Same values already sorted, for instance from the column cache, to avoid sorting
+        them again. Default is None.
+
+        Returns:
+        TimeRegularity: Analysis of the timestamps.
+        """
+        regularity = cls()
+        values = to_int64(values)
+        if sorted_values is None:
+            sorted_values = np.sort(values)
+        else:
+            sorted_values = np.asarray(sorted_values, dtype="datetime64[ns]").view(np.int64)
+
+        regularity.count_order(values)
+        regularity.sorted_values = sorted_values
+        regularity.diffs = np.diff(sorted_values)
+        return regularity
+
+    def count_order(self, values):
+        # Counts the timestamps arriving before or after the previous one, including the last one of the previous block
+        if len(values) == 0:
+            return
+        steps = np.diff(values) if self.last_value is None else np.diff(values, prepend=self.last_value)
+        self.n_out_of_order += int((steps < 0).sum())
+        self.n_increasing += int((steps > 0).sum())
+        self.last_value = int(values[-1])
+
+    def update(self, values):
+        """
+        Adds timestamps appended after the ones already analysed, without sorting the previous ones again.
+
+        When the new timestamps are all later than the current maximum, as in most event logs, only their own
+        differences are computed. Otherwise they are merged into the sorted values and the differences recomputed.
+
+        Parameters:
+        values (pd.Series or np.ndarray): New datetime values in order of arrival.
+
+        Returns:
+        None
+        """
+        values = to_int64(values)
+        if len(values) == 0:
+            return
+
+        self.count_order(values)
+        new_values = np.sort(values)
+        if len(self.sorted_values) == 0 or new_values[0] >= self.sorted_values[-1]:
+            boundary = new_values[0] - self.sorted_values[-1] if len(self.sorted_values) else None
+            new_diffs = np.diff(new_values) if boundary is None else np.concatenate(([boundary], np.diff(new_values)))
+            self.sorted_values = np.concatenate((self.sorted_values, new_values))
+            self.diffs = np.concatenate((self.diffs, new_diffs))
+        else:
+            positions = np.searchsorted(self.sorted_values, new_values, side="right")
+            self.sorted_values = np.insert(self.sorted_values, positions, new_values)
+            self.diffs = np.diff(self.sorted_values)
+
+    @property
+    def n_values(self):
+        """
+        Number of timestamps analysed.
+        """
+        return len(self.sorted_values)
+
+    def get_step(self, n_sample=1_000_000):
+        """
+        Finds the dominant sampling interval, i.e. the most common positive difference between consecutive timestamps.
+
+        The candidate is the mode of an evenly spread sample of the differences, its share is then counted exactly.
+
+        Parameters:
+        n_sample (int): Maximum number of differences sampled to find the mode. Default is 1,000,000.
+
+        Returns:
+        tuple: Dominant interval in nanoseconds (int, None when all timestamps are equal) and share of the positive
+        differences equal to it (float).
+        """
+        positive = self.diffs[self.diffs > 0]
+        if len(positive) == 0:
+            return None, 0.0
+
+        sample = positive[::max(1, len(positive) // n_sample)]
+        steps, counts = np.unique(sample, return_counts=True)
+        step = int(steps[np.argmax(counts)])
+        return step, float((positive == step).mean())
+
+    def get_gaps(self, end=10):
+        """
+        Lists the largest intervals without any timestamp.
+
+        Parameters:
+        end (int): Number of gaps returned. Default is 10.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns start, end and duration, sorted by decreasing duration.
+        """
+        # Only the differences above the dominant interval are ranked, which are few on a regular series
+        step, _ = self.get_step()
+        positions = np.array([], dtype=np.int64)
+        if step is not None:
+            positions = np.flatnonzero(self.diffs > step)
+            if len(positions) < end:
+                positions = np.concatenate((positions, np.flatnonzero(self.diffs == step)[:end - len(positions)]))
+        if len(positions) < end:
+            positions = np.arange(len(self.diffs))
+        n_gaps = min(end, len(positions))
+        if n_gaps:
+            positions = positions[np.argpartition(self.diffs[positions], len(positions) - n_gaps)[len(positions) - n_gaps:]]
+        positions = positions[np.argsort(-self.diffs[positions], kind="stable")]
+        return pd.DataFrame({
+            "start": pd.to_datetime(self.sorted_values[positions]),
+            "end": pd.to_datetime(self.sorted_values[positions + 1]),
+            "duration": pd.to_timedelta(self.diffs[positions]),
+        })
+
+    def get_bursts(self, ratio=0.1, min_events=10, end=10):
+        """
+        Lists the bursts, i.e. runs of timestamps much closer to each other than the dominant interval.
+
+        Parameters:
+        ratio (float): Fraction of the dominant interval under which two timestamps belong to the same burst. Default is 0.1.
+        min_events (int): Minimum number of timestamps of a burst. Default is 10.
+        end (int): Number of bursts returned. Default is 10.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns start, end, n_events and duration, sorted by decreasing n_events.
+        """
+        step, _ = self.get_step()
+        columns = ["start", "end", "n_events", "duration"]
+        if step is None:
+            return pd.DataFrame(columns=columns)
+
+        # Runs of consecutive close differences are found from the edges of the boolean mask
+        close = np.concatenate(([False], self.diffs < step * ratio, [False]))
+        edges = np.flatnonzero(close[1:] != close[:-1])
+        starts, stops = edges[::2], edges[1::2]
+        n_events = stops - starts + 1
+        keep = n_events >= min_events
+        starts, stops, n_events = starts[keep], stops[keep], n_events[keep]
+
+        order = np.argsort(-n_events, kind="stable")[:end]
+        starts, stops, n_events = starts[order], stops[order], n_events[order]
+        return pd.DataFrame({
+            "start": pd.to_datetime(self.sorted_values[starts]),
+            "end": pd.to_datetime(self.sorted_values[stops]),
+            "n_events": n_events,
+            "duration": pd.to_timedelta(self.sorted_values[stops] - self.sorted_values[starts]),
+        }, columns=columns)
+
+    def get_summary(self, gap_ratio=2.0):
+        """
+        Formats the analysis as a Pandas dataframe with 2 columns: Description and Value.
+
+        Parameters:
+        gap_ratio (float): Multiple of the dominant interval above which a difference counts as a gap. Default is 2.0.
+        """
+        step, share = self.get_step()
+        n_steps = max(self.n_values - 1, 0)
+        return pd.DataFrame({
+            "Description": [
+                "Number of Timestamps",
+                "Dominant Interval",
+                "Share of the Dominant Interval",
+                "Number of Duplicated Timestamps",
+                "Number of Gaps",
+                "Largest Gap",
+                "Monotonic Increasing",
+                "Monotonic Decreasing",
+                "Number of Out-of-Order Timestamps",
+            ],
+            "Value": [
+                self.n_values,
+                pd.Timedelta(step) if step is not None else None,
+                f"{share:.2%}",
+                int((self.diffs == 0).sum()),
+                int((self.diffs > step * gap_ratio).sum()) if step is not None else 0,
+                pd.Timedelta(int(self.diffs.max())) if len(self.diffs) else None,
+                self.n_out_of_order == 0,
+                self.n_increasing == 0 and n_steps > 0,
+                self.n_out_of_order,
+            ],
+        }).astype(str)
@@ -1,18 +1,28 @@
+import os
+import tempfile
+
+import altair as alt
 import streamlit as st
+from common.charts import get_heatmap
+from common.executor import render_when_ready, submit
 from tab_df.logics import Dataset
+from tab_df.memory import GOVERNOR
+from tab_df.projected import ProjectedDataset, is_wide
+from tab_df.snapshot import ProfileSnapshot
+from tab_df.sources import get_name
+from tab_df.sql import SQLDataset
 
 
 def display_tab_df_content(file_path):
-    # Instantiate Dataset class and save it in Streamlit session state
-    dataset = Dataset(file_path)
-    
+    # Instantiate Dataset class, compute all the information to be displayed and save it in Streamlit session state
     if st.session_state.dataset is None:
+        # Wide files are loaded column by column, each column being parsed the first time a tab needs it
+        dataset_class = ProjectedDataset if is_wide(file_path) else Dataset
+        dataset = dataset_class(file_path, session_id=st.session_state.get("session_id"))
+        dataset.set_df()
+        dataset.set_data()
         st.session_state.dataset = dataset
 
-    # Compute all the information to be displayed
-    st.session_state.dataset.set_df()
-    st.session_state.dataset.set_data()
-
     # First Streamlit Expander container
     with st.expander("Dataframe Summary"):
         # Display the summary as a Streamlit table
@@ -21,18 +31,216 @@ def display_tab_df_content(file_path):
         # Display the table attribute using Streamlit.write()
         st.write(st.session_state.dataset.table)
 
+    # Warn when the file did not fit in the memory budget
+    load_plan = st.session_state.dataset.load_plan
+    if load_plan is not None and load_plan.strategy == "columns":
+        st.warning("The file exceeds the memory budget: only some of its columns were loaded.")
+    elif load_plan is not None and load_plan.strategy == "sample":
+        st.warning(f"The file exceeds the memory budget: only {load_plan.fraction:.2%} of its rows were loaded.")
+
     # Second Streamlit Expander container
     with st.expander("Explore Dataframe"):
-        # Slider to select the number of rows
-        n_rows = st.slider("Select number of rows to display:", 1, 100, 5)
-        
-        # Radio button to select the method
-        method = st.radio("Select method to view data:", ["head", "tail", "sample"])
-
-        # Display the subset of the dataframe based on the selected method
-        if method == "head":
-            st.dataframe(st.session_state.dataset.df.head(n_rows))
-        elif method == "tail":
-            st.dataframe(st.session_state.dataset.df.tail(n_rows))
-        elif method == "sample":
-            st.dataframe(st.session_state.dataset.df.sample(n_rows))
+        display_pages(st.session_state.dataset)
+
+    # Third Streamlit Expander container
+    with st.expander("Missing Values"):
+        missing = st.session_state.dataset.missing
+        if missing is None:
+            st.info("The file is loaded column by column: the missing values of each column are shown in its tab.")
+        else:
+            display_missing_content(st.session_state.dataset)
+
+    # Fourth Streamlit Expander container
+    with st.expander("Memory Usage"):
+        display_memory_usage(st.session_state.dataset)
+
+    # Fifth Streamlit Expander container
+    with st.expander("Profile Snapshot"):
+        display_snapshot_content(st.session_state.dataset, file_path)
+
+
+def display_missing_content(dataset):
+    # Placeholder for the size of the bit-packed nullity matrix, which needs the number of missing values of each row
+    missing = dataset.missing
+    summary_slot = st.empty()
+
+    # Display the number of missing values of each column
+    st.write("**Missing Values per Column**")
+    st.dataframe(missing.get_column_counts())
+
+    # Placeholders for the analyses that need a pass over the nullity matrix
+    st.write("**Missing Values per Row**")
+    rows_slot = st.empty()
+    st.write("**Most Common Missing Patterns**")
+    patterns_slot = st.empty()
+    st.write("**Co-Missing Correlation**")
+    co_missing_slot = st.empty()
+
+    key = (dataset.get_key(), "df", None)
+    render_when_ready([
+        (summary_slot, submit(key + ("missing_summary",), missing.get_summary), st.table),
+        (rows_slot, submit(key + ("missing_rows",), missing.get_row_distribution), st.dataframe),
+        (patterns_slot, submit(key + ("missing_patterns",), missing.get_patterns), st.dataframe),
+        (co_missing_slot, submit(key + ("co_missing",), missing.get_co_missing), display_co_missing),
+    ])
+
+
+def display_co_missing(correlation):
+    # Display the correlation between missing values of columns as a heatmap
+    if correlation.empty:
+        st.write("No column has missing values.")
+        return
+
+    st.altair_chart(get_heatmap(correlation), use_container_width=True)
+
+
+def display_memory_usage(dataset):
+    # Display the projected and current memory usage compared with the budgets
+    if dataset.load_plan is not None:
+        st.table(dataset.load_plan.get_summary())
+    st.table(GOVERNOR.get_summary(dataset.session_id))
+
+
+def display_snapshot_content(dataset, file_path):
+    # Computing the profile of every column is only started on request, in the background
+    snapshot = None
+    if st.checkbox("Compute a profile snapshot of the whole dataset"):
+        key = (dataset.get_key(), "df", None, "snapshot")
+        source = get_name(file_path)
+        future = submit(key, ProfileSnapshot.from_dataset, dataset, source)
+        snapshot_slot = st.empty()
+        render_when_ready([(snapshot_slot, future, display_snapshot_download)])
+        if future.done() and future.exception() is None:
+            snapshot = future.result()
+
+    # File uploader to reload a saved snapshot, without the CSV file it was computed from
+    uploaded_snapshot = st.file_uploader("Load a saved profile snapshot", type=["profile"], key="snapshot_file")
+    if uploaded_snapshot is None:
+        return
+
+    try:
+        saved = ProfileSnapshot.from_bytes(uploaded_snapshot.getvalue())
+    except Exception as error:
+        st.error(f"The snapshot could not be loaded: {error}")
+        return
+
+    st.write(f"**Snapshot of {saved.source} computed on {saved.created}**")
+    st.table(saved.get_summary())
+    selected_col = st.selectbox("Which column of the snapshot do you want to explore?", list(saved.columns), key="snapshot_col")
+    if selected_col is not None:
+        st.table(saved.get_column_summary(selected_col))
+        st.dataframe(saved.get_frequent(selected_col))
+
+    # Compare the saved snapshot with the current dataset to show the drift between both extracts
+    if snapshot is not None:
+        st.write("**Differences with the Current Dataset**")
+        st.dataframe(saved.diff(snapshot))
+
+
+def display_snapshot_download(snapshot):
+    # Download button saving the snapshot in its compact binary format
+    st.download_button(
+        "Download Profile Snapshot",
+        data=snapshot.to_bytes(),
+        file_name=f"{os.path.splitext(os.path.basename(snapshot.source or 'dataset'))[0]}.profile",
+        mime="application/octet-stream",
+    )
+
+
+def display_pages(source):
+    # Select box to choose the number of rows per page
+    page_size = st.selectbox("Select number of rows per page:", [10, 25, 50, 100, 500, 1000])
+
+    # Number input to jump to any page
+    n_pages = max(source.get_n_pages(page_size), 1)
+    page = st.number_input(f"Select page (1 - {n_pages}):", min_value=1, max_value=n_pages, value=1, step=1)
+
+    # Display the rows of the selected page, read directly from the file or database
+    st.dataframe(source.get_page(int(page) - 1, page_size))
+
+
+def display_tab_df_sql_content(file_path):
+    # Save the uploaded database to a temporary file, SQLite needing a path to open it
+    if st.session_state.get("database_path") is None:
+        suffix = os.path.splitext(file_path.name)[1]
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as database:
+            database.write(file_path.getvalue())
+        st.session_state["database_path"] = database.name
+
+    # Select box to choose the table holding the dataset
+    database_path = st.session_state["database_path"]
+    table_name = st.selectbox("Which table do you want to explore?", SQLDataset.list_tables(database_path))
+    if table_name is None:
+        st.warning("The database does not contain any table.")
+        return
+
+    # Instantiate SQLDataset class, compute all the information with aggregate queries and save it in Streamlit session state
+    dataset = st.session_state.dataset
+    if dataset is None or dataset.table_name != table_name:
+        # Close the connections opened for the previously selected table
+        if dataset is not None:
+            dataset.close()
+        dataset = SQLDataset(database_path, table_name)
+        dataset.set_df()
+        dataset.set_data()
+        st.session_state.dataset = dataset
+
+    # First Streamlit Expander container
+    with st.expander("Dataframe Summary"):
+        st.table(dataset.get_summary())
+        st.write(dataset.table)
+
+    # Second Streamlit Expander container
+    with st.expander("Explore Dataframe"):
+        display_pages(dataset)
+
+
+def display_sql_column_content(dataset, kind):
+    # Columns and labels of the tab matching the kind of column
+    cols_list, label = {
+        "num": (dataset.num_cols_list, "numeric"),
+        "text": (dataset.text_cols_list, "text"),
+        "date": (dataset.date_cols_list, "datetime"),
+    }[kind]
+
+    selected_col = st.selectbox(f"Which {label} column do you want to explore?", cols_list, key=f"sql_{kind}_col")
+    if selected_col is None:
+        return
+
+    # Run the aggregate queries in the background, only their results being transferred
+    get_summary = {"num": dataset.get_num_summary, "text": dataset.get_text_summary, "date": dataset.get_date_summary}[kind]
+    key = (dataset.file_path, dataset.table_name, kind, selected_col)
+    summary = submit(key + ("summary",), get_summary, selected_col)
+    frequent = submit(key + ("frequent",), dataset.get_frequent, selected_col)
+    if kind == "num":
+        chart = submit(key + ("histogram",), dataset.get_histogram, selected_col)
+    else:
+        chart = submit(key + ("barchart",), dataset.get_frequent, selected_col, 50)
+
+    with st.expander(f"{label.capitalize()} Column", expanded=True):
+        summary_slot = st.empty()
+        st.write("**Histogram**" if kind == "num" else "**Bar Chart**")
+        chart_slot = st.empty()
+        st.write("**Most Frequent Values**")
+        frequent_slot = st.empty()
+
+        render_when_ready([
+            (summary_slot, summary, st.table),
+            (chart_slot, chart, lambda counts: st.altair_chart(get_sql_chart(counts, kind), use_container_width=True)),
+            (frequent_slot, frequent, st.dataframe),
+        ])
+
+
+def get_sql_chart(counts, kind):
+    # Bar chart of the aggregated counts returned by the database
+    if kind == "num":
+        return alt.Chart(counts).mark_bar().encode(
+            x=alt.X("bin_start:Q", bin="binned", title="Value"),
+            x2="bin_end:Q",
+            y=alt.Y("count:Q", title="Count"),
+        )
+
+    return alt.Chart(counts).mark_bar().encode(
+        x=alt.X("value:N", sort="-y"),
+        y=alt.Y("occurrence:Q", title="Count of Records"),
+    )
@@ -1,5 +1,14 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 
+from common.fingerprint import dataset_fingerprint
+from common.schema import get_schema
+from tab_df.memory import GOVERNOR
+from tab_df.missing import NullityMatrix
+from tab_df.row_index import RowIndex
+from tab_df.sources import get_compression, get_name, is_multipart
+
 
 class Dataset:
     """
@@ -11,28 +20,38 @@ class Dataset:
     --------------------
     Attributes
     --------------------
-    -> file_path (str): Path to the uploaded CSV file (mandatory)
+    -> file_path (str or list): Path to the uploaded CSV file, optionally compressed with gzip or zstd, or list of the parts of a multi-part dataset (mandatory)
+    -> session_id (str): Identifier of the Streamlit session loading the dataset, used to enforce its memory budget (default set to None)
     -> df (pd.Dataframe): Pandas dataframe (default set to None)
     -> cols_list (list): List of columns names of dataset (default set to empty list)
     -> n_rows (int): Number of rows of dataset (default set to 0)
     -> n_cols (int): Number of columns of dataset (default set to 0)
     -> n_duplicates (int): Number of duplicated rows of dataset (default set to 0)
     -> n_missing (int): Number of missing values of dataset (default set to 0)
+    -> missing (NullityMatrix): Bit-packed matrix of the missing cells of dataset (default set to None)
     -> n_num_cols (int): Number of columns that are numeric type (default set to 0)
     -> n_text_cols (int): Number of columns that are text type (default set to 0)
-    -> table (pd.Series): Pandas DataFrame containing the list of columns, their data types and memory usage from dataframe (default set to None)
+    -> schema (DatasetSchema): Type inferred for each column, shared by all tabs (default set to None)
+    -> table (pd.Series): Pandas DataFrame containing the list of columns, their data types, inferred types and memory usage from dataframe (default set to None)
+    -> row_index (RowIndex): Byte offsets of the rows of the CSV file used to read any page of rows from it (default set to None)
+    -> load_plan (LoadPlan): Projected memory of the CSV file and the way it was loaded to fit the memory budgets (default set to None)
     """
-    def __init__(self, file_path):
+    def __init__(self, file_path, session_id=None):
         self.file_path = file_path
+        self.session_id = session_id
         self.df = None
         self.cols_list = []
         self.n_rows = 0
         self.n_cols = 0
         self.n_duplicates = 0
         self.n_missing = 0
+        self.missing = None
         self.n_num_cols = 0
         self.n_text_cols = 0
+        self.schema = None
         self.table = None
+        self.row_index = None
+        self.load_plan = None
 
     def set_data(self):
         if self.df is None:
@@ -48,14 +67,19 @@ class Dataset:
         # Compute the number of duplicated rows
         self.n_duplicates = self.df.duplicated().sum()
 
-        # Compute the number of missing values in the dataframe
-        self.n_missing = self.df.isnull().sum().sum()
+        # Compute the number of missing values in the dataframe from its bit-packed nullity matrix, unless it was built while loading the parts
+        if self.missing is None or self.missing.n_rows != self.n_rows:
+            self.missing = NullityMatrix.from_df(self.df)
+        self.n_missing = self.missing.n_missing
+
+        # Infer the type of each column once for all tabs
+        self.schema = get_schema(self.df)
 
         # Compute the number of numeric columns
-        self.n_num_cols = self.df.select_dtypes(include=["number"]).shape[1]
+        self.n_num_cols = len(self.schema.get_num_cols())
 
         # Compute the number of text columns
-        self.n_text_cols = self.df.select_dtypes(exclude=["number"]).shape[1]
+        self.n_text_cols = self.n_cols - self.n_num_cols
 
         # Update the table with column information
         self.create_table()
@@ -67,13 +91,115 @@ class Dataset:
             return
 
         try:
-            self.df = pd.read_csv(self.file_path)
-            print("Dataframe loaded successfully from", self.file_path)
+            # Project the memory needed before loading, to fall back on a column subset or a sample of rows if needed
+            self.load_plan = GOVERNOR.estimate(self.file_path, self.session_id)
+            if is_multipart(self.file_path):
+                self.df, self.missing = self.read_parts()
+            else:
+                self.df = self.load_plan.read_csv(self.file_path)
+            self.load_plan.loaded_bytes = int(self.df.memory_usage(deep=True).sum())
+            GOVERNOR.register(self, self.session_id, self.load_plan.loaded_bytes)
+            print(f"Dataframe loaded successfully from {get_name(self.file_path)} with the '{self.load_plan.strategy}' strategy")
+            self.set_row_index()
         except FileNotFoundError:
-            print(f"Error: File {self.file_path} not found.")
+            print(f"Error: File {get_name(self.file_path)} not found.")
         except Exception as e:
             print(f"An error occurred while loading the dataframe: {e}")
 
+
+    def read_parts(self, max_workers=4):
+        """
+        Loads the parts of a multi-part dataset in parallel following the load plan, each thread decompressing and parsing one part and building its nullity matrix, then merges them in the order of the parts.
+
+        Parameters:
+        max_workers (int): Maximum number of parts loaded at the same time. Default is 4.
+
+        Returns:
+        tuple: Dataframe of all the parts (pd.DataFrame) and its nullity matrix (NullityMatrix).
+        """
+        def read_part(part):
+            df = self.load_plan.read_csv(part)
+            return df, NullityMatrix.from_df(df)
+
+        # A pool of its own is used, the shared executor running the tasks that wait for this dataset
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(self.file_path)))) as pool:
+            parts = list(pool.map(read_part, self.file_path))
+
+        cols_list = parts[0][0].columns.tolist()
+        for part, (df, _) in zip(self.file_path, parts):
+            if df.columns.tolist() != cols_list:
+                raise ValueError(f"The columns of {get_name(part)} do not match the columns of {get_name(self.file_path[0])}.")
+
+        df = pd.concat([df for df, _ in parts], ignore_index=True)
+        return df, NullityMatrix.merge([missing for _, missing in parts])
+
+
+    def get_key(self):
+        """
+        Identifies the dataset in the results shared by the background computations, from the fingerprint of self.df.
+        """
+        return dataset_fingerprint(self.df)
+
+
+    def get_schema(self):
+        """
+        Returns the type inferred for each column of self.df, kept on the dataset once inferred so the tabs never infer it again.
+        """
+        if self.schema is None:
+            self.schema = get_schema(self.df)
+        return self.schema
+
+
+    def set_row_index(self):
+        """
+        Scans the CSV file once to index the byte offsets of its rows and stores the result in the relevant attribute (self.row_index).
+        Compressed and multi-part files cannot be read from an offset, so their pages are taken from self.df instead.
+        """
+        if is_multipart(self.file_path) or get_compression(self.file_path) is not None:
+            self.row_index = None
+            print("Row index skipped for a compressed or multi-part file, pages are read from the dataframe.")
+            return
+
+        try:
+            self.row_index = RowIndex(self.file_path)
+            self.row_index.build()
+            print(f"Row index built for {self.row_index.n_rows} rows.")
+        except Exception as e:
+            self.row_index = None
+            print(f"An error occurred while indexing the rows of the file: {e}")
+
+
+    def get_page(self, page, page_size=10):
+        """
+        Reads a page of rows directly from the CSV file using the row index, so its cost does not depend on the position of the page.
+        Without a row index, the page is taken from self.df.
+
+        Parameters:
+        page (int): Number of the page, starting at 0.
+        page_size (int): Number of rows per page. Default is 10.
+
+        Returns:
+        pd.DataFrame: Rows of the requested page.
+        """
+        if self.row_index is not None:
+            return self.row_index.get_page(page, page_size)
+
+        if self.is_df_none():
+            print("self.df is None or empty. Unable to retrieve the page.")
+            return pd.DataFrame()  # Return empty dataframe as a fallback
+
+        return self.df.iloc[page * page_size:(page + 1) * page_size]
+
+
+    def get_n_pages(self, page_size):
+        """
+        Computes the number of pages of page_size rows, from the row index or from self.df.
+        """
+        if self.row_index is not None:
+            return self.row_index.get_n_pages(page_size)
+
+        return -(-len(self.df) // page_size) if self.df is not None else 0
+
         
 
     def is_df_none(self):
@@ -132,7 +258,8 @@ class Dataset:
             print("self.df is None or empty. Unable to compute number of missing values.")
             return
 
-        self.n_missing = self.df.isnull().sum().sum()
+        self.missing = NullityMatrix.from_df(self.df)
+        self.n_missing = self.missing.n_missing
         print(f"Number of missing values computed: {self.n_missing}.")
 
         
@@ -145,7 +272,7 @@ class Dataset:
             print("self.df is None or empty. Unable to compute number of numeric columns.")
             return
 
-        self.n_num_cols = self.df.select_dtypes(include=['number']).shape[1]
+        self.n_num_cols = len(self.get_schema().get_num_cols())
         print(f"Number of numeric columns computed: {self.n_num_cols}.")
 
         
@@ -158,7 +285,7 @@ class Dataset:
             print("self.df is None or empty. Unable to compute number of text columns.")
             return
 
-        self.n_text_cols = self.df.select_dtypes(include=['object']).shape[1]
+        self.n_text_cols = len(self.get_schema().get_text_cols())
         print(f"Number of text columns computed: {self.n_text_cols}.")
 
         
@@ -229,14 +356,18 @@ class Dataset:
             print("self.df is None or empty. Unable to compute the table.")
             return
 
-        data_types = self.df.dtypes
+        # Values are listed positionally, the last row holding the memory used by the index
+        schema = self.get_schema()
+        data_types = [str(dtype) for dtype in self.df.dtypes]
+        inferred_types = [schema.types[col_name] for col_name in self.df.columns]
         memory_usage = self.df.memory_usage(deep=True)
 
         self.table = pd.DataFrame({
 			"Column Name": list(self.df.columns) + [''],
-			"Data Type": data_types,
-			"Memory Usage (Bytes)": memory_usage
-		}).reset_index(drop=True)
+			"Data Type": data_types + [''],
+			"Inferred Type": inferred_types + [''],
+			"Memory Usage (Bytes)": list(memory_usage.iloc[1:]) + [memory_usage.iloc[0]]
+		})
 
         print("Table computed and stored in self.table.")
 
@@ -0,0 +1,286 @@
+import io
+import os
+import threading
+import weakref
+
+import pandas as pd
+
+from tab_df.row_index import find_row_ends
+from tab_df.sources import get_compression, get_data_size, is_multipart, is_path, open_stream
+
+# Default budgets, which can be changed through environment variables (in megabytes)
+SESSION_BUDGET_BYTES = int(os.environ.get("CSV_EXPLORER_SESSION_BUDGET_MB", 1024)) * 1024 ** 2
+PROCESS_BUDGET_BYTES = int(os.environ.get("CSV_EXPLORER_PROCESS_BUDGET_MB", 4096)) * 1024 ** 2
+
+
+def get_file_size(file_path):
+    """
+    Computes the uncompressed size of a file given as a path or as a seekable file object, or of all the parts of a
+    multi-part dataset.
+
+    Parameters:
+    file_path (str, file-like or list): File to measure, or list of its parts.
+
+    Returns:
+    int: Size of the data in bytes.
+    """
+    if is_multipart(file_path):
+        return sum(get_file_size(part) for part in file_path)
+    if get_compression(file_path) is not None:
+        return get_data_size(file_path)
+    if is_path(file_path):
+        return os.path.getsize(file_path)
+
+    position = file_path.tell()
+    size = file_path.seek(0, io.SEEK_END)
+    file_path.seek(position)
+    return size
+
+
+def read_head(file_path, n_bytes):
+    """
+    Reads the first n_bytes uncompressed bytes of a file given as a path or as a seekable file object, or of the first
+    part of a multi-part dataset.
+    """
+    if is_multipart(file_path):
+        return read_head(file_path[0], n_bytes)
+
+    with open_stream(file_path) as file:
+        head = file.read(n_bytes)
+    if not is_path(file_path):
+        file_path.seek(0)
+    return head
+
+
+class LoadPlan:
+    """
+    --------------------
+    Description
+    --------------------
+    -> LoadPlan (class): Class that holds the projected memory cost of loading a CSV file and the way it should be loaded
+
+    --------------------
+    Attributes
+    --------------------
+    -> file_size (int): Size of the file in bytes (mandatory)
+    -> col_bytes (pd.Series): Projected memory of each column once loaded, in bytes (mandatory)
+    -> available (int): Memory available for the dataset given the budgets, in bytes (mandatory)
+    -> strategy (str): 'full', 'columns' or 'sample' (default set to 'full')
+    -> usecols (list): Columns to load, None meaning all of them (default set to None)
+    -> fraction (float): Fraction of the rows to keep (default set to 1.0)
+    -> chunksize (int): Number of rows read at once when sampling (default set to None)
+    -> loaded_bytes (int): Memory actually used by the loaded dataframe, in bytes (default set to None)
+    """
+    def __init__(self, file_size, col_bytes, available):
+        self.file_size = file_size
+        self.col_bytes = col_bytes
+        self.available = available
+        self.strategy = "full"
+        self.usecols = None
+        self.fraction = 1.0
+        self.chunksize = None
+        self.loaded_bytes = None
+
+    @property
+    def projected_bytes(self):
+        """
+        Projected memory of the whole file once loaded, in bytes.
+        """
+        return int(self.col_bytes.sum())
+
+    def read_csv(self, file_path, random_state=0):
+        """
+        Loads the CSV file following the plan.
+
+        Compressed files are decompressed while they are parsed, so the uncompressed file is never written to disk
+        nor held whole in memory.
+
+        Parameters:
+        file_path (str or file-like): CSV file to load, optionally compressed with gzip or zstd.
+        random_state (int): Seed of the row sampling. Default is 0.
+
+        Returns:
+        pd.DataFrame: Loaded dataframe.
+        """
+        with open_stream(file_path) as stream:
+            if self.strategy != "sample":
+                return pd.read_csv(stream, usecols=self.usecols)
+
+            # Only one chunk and the kept rows are in memory at the same time
+            chunks = []
+            for i, chunk in enumerate(pd.read_csv(stream, usecols=self.usecols, chunksize=self.chunksize)):
+                chunks.append(chunk.sample(frac=self.fraction, random_state=random_state + i))
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=self.col_bytes.index)
+
+    def get_summary(self):
+        """
+        Formats the plan as a Pandas dataframe with 2 columns: Description and Value.
+        """
+        n_loaded_cols = len(self.col_bytes) if self.usecols is None else len(self.usecols)
+        return pd.DataFrame({
+            "Description": [
+                "Load Strategy",
+                "File Size (Bytes)",
+                "Projected Memory (Bytes)",
+                "Available Memory (Bytes)",
+                "Loaded Memory (Bytes)",
+                "Number of Loaded Columns",
+                "Fraction of Loaded Rows",
+            ],
+            "Value": [
+                self.strategy,
+                self.file_size,
+                self.projected_bytes,
+                self.available,
+                self.loaded_bytes,
+                f"{n_loaded_cols} / {len(self.col_bytes)}",
+                f"{self.fraction:.2%}",
+            ],
+        }).astype(str)
+
+
+class MemoryGovernor:
+    """
+    --------------------
+    Description
+    --------------------
+    -> MemoryGovernor (class): Class that projects the memory needed to load a file, compares it with the per-session
+    and per-process budgets and keeps track of the memory used by the loaded datasets
+
+    --------------------
+    Attributes
+    --------------------
+    -> session_budget (int): Maximum memory used by the datasets of a session, in bytes (default set to 1 GB)
+    -> process_budget (int): Maximum memory used by the datasets of all sessions, in bytes (default set to 4 GB)
+    -> min_columns_ratio (float): Minimum fraction of the columns kept by a column subset before sampling rows instead (default set to 0.5)
+    """
+    def __init__(self, session_budget=SESSION_BUDGET_BYTES, process_budget=PROCESS_BUDGET_BYTES, min_columns_ratio=0.5):
+        self.session_budget = session_budget
+        self.process_budget = process_budget
+        self.min_columns_ratio = min_columns_ratio
+        self._usage = {}
+        self._lock = threading.Lock()
+
+    def get_session_usage(self, session_id):
+        """
+        Computes the memory used by the datasets of a session, in bytes.
+        """
+        with self._lock:
+            return sum(n_bytes for owner, n_bytes in self._usage.values() if owner == session_id)
+
+    def get_process_usage(self):
+        """
+        Computes the memory used by the datasets of all sessions, in bytes.
+        """
+        with self._lock:
+            return sum(n_bytes for _, n_bytes in self._usage.values())
+
+    def get_available(self, session_id):
+        """
+        Computes the memory a session can still use for a new dataset, in bytes.
+        """
+        return max(0, min(
+            self.session_budget - self.get_session_usage(session_id),
+            self.process_budget - self.get_process_usage(),
+        ))
+
+    def estimate(self, file_path, session_id=None, n_sample_bytes=1024 ** 2):
+        """
+        Projects the memory needed to load a CSV file from its first rows and decides how to load it.
+
+        The memory used by the rows found in the first n_sample_bytes bytes is extrapolated to the size of the file.
+        The file is loaded whole if it fits in the available memory, otherwise only the cheapest columns are loaded if
+        enough of them fit, otherwise a uniform sample of the rows is read chunk by chunk.
+
+        The parts of a multi-part dataset are projected together, from the head of the first part and the total size.
+
+        Parameters:
+        file_path (str, file-like or list): CSV file to load, optionally compressed, or list of its parts.
+        session_id (str): Identifier of the session loading the file. Default is None.
+        n_sample_bytes (int): Number of bytes read to project the memory. Default is 1 MB.
+
+        Returns:
+        LoadPlan: Projected memory and load strategy.
+        """
+        file_size = get_file_size(file_path)
+        head = read_head(file_path, n_sample_bytes)
+
+        # Only keep complete rows of the head of the file
+        if len(head) < file_size:
+            row_ends, _ = find_row_ends(head)
+            if len(row_ends) > 1:
+                head = head[:row_ends[-1] + 1]
+        sample = pd.read_csv(io.BytesIO(head))
+
+        header_bytes = len(head.split(b"\n", 1)[0]) + 1
+        sample_bytes = max(len(head) - header_bytes, 1)
+        col_bytes = sample.memory_usage(index=False, deep=True) * (max(file_size - header_bytes, 0) / sample_bytes)
+
+        plan = LoadPlan(file_size, col_bytes.astype("int64"), self.get_available(session_id))
+        if plan.projected_bytes <= plan.available:
+            return plan
+
+        # Keep the cheapest columns, in the order of the file, as long as they fit
+        cheapest = col_bytes.sort_values(kind="stable")
+        kept = cheapest[cheapest.cumsum() <= plan.available].index
+        if len(kept) >= max(1, self.min_columns_ratio * len(col_bytes)):
+            plan.strategy = "columns"
+            plan.usecols = [col_name for col_name in col_bytes.index if col_name in kept]
+            return plan
+
+        # Otherwise sample rows, leaving room for the chunk being read
+        n_sample_rows = max(len(sample), 1)
+        plan.strategy = "sample"
+        plan.chunksize = max(n_sample_rows * 10, 10_000)
+        plan.fraction = max(0.0, min(1.0, 0.9 * plan.available / max(plan.projected_bytes, 1)))
+        return plan
+
+    def register(self, dataset, session_id, n_bytes):
+        """
+        Records the memory used by a loaded dataset until it is garbage collected. Registering the same dataset again
+        updates its memory usage.
+
+        Parameters:
+        dataset (object): Object owning the loaded data.
+        session_id (str): Identifier of the session owning the dataset.
+        n_bytes (int): Memory used by the dataset, in bytes.
+
+        Returns:
+        None
+        """
+        key = id(dataset)
+        with self._lock:
+            is_new = key not in self._usage
+            self._usage[key] = (session_id, int(n_bytes))
+        if is_new:
+            weakref.finalize(dataset, self.release, key)
+
+    def release(self, key):
+        """
+        Forgets the memory used by a dataset registered under key.
+        """
+        with self._lock:
+            self._usage.pop(key, None)
+
+    def get_summary(self, session_id):
+        """
+        Formats the current usage and budgets as a Pandas dataframe with 2 columns: Description and Value.
+        """
+        return pd.DataFrame({
+            "Description": [
+                "Session Memory Usage (Bytes)",
+                "Session Memory Budget (Bytes)",
+                "Process Memory Usage (Bytes)",
+                "Process Memory Budget (Bytes)",
+            ],
+            "Value": [
+                self.get_session_usage(session_id),
+                self.session_budget,
+                self.get_process_usage(),
+                self.process_budget,
+            ],
+        })
+
+
+# Governor shared by all the sessions of the Streamlit server
+GOVERNOR = MemoryGovernor()
@@ -0,0 +1,242 @@
+import numpy as np
+import pandas as pd
+
+# Number of bits set in each possible byte value
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+class NullityMatrix:
+    """
+    --------------------
+    Description
+    --------------------
+    -> NullityMatrix (class): Class that stores which cells of a dataset are missing as a bit-packed matrix, using
+    one bit per cell instead of the one byte per cell of a boolean dataframe
+
+    --------------------
+    Attributes
+    --------------------
+    -> cols_list (list): List of columns names of dataset (mandatory)
+    -> n_rows (int): Number of rows added to the matrix (default set to 0)
+    -> n_cols (int): Number of columns of dataset (default set to length of cols_list)
+    -> col_counts (np.ndarray): Number of missing values of each column (default set to zeros)
+    -> blocks (list): List of packed blocks of rows, each being an array of shape (rows, ceil(n_cols / 8))
+    (default set to empty list)
+    -> row_counts (np.ndarray): Number of missing values of each row, computed once after the last update (default set to None)
+    """
+    def __init__(self, cols_list):
+        self.cols_list = list(cols_list)
+        self.n_rows = 0
+        self.n_cols = len(self.cols_list)
+        self.col_counts = np.zeros(self.n_cols, dtype=np.int64)
+        self.blocks = []
+        self.row_counts = None
+
+    @classmethod
+    def from_df(cls, df, chunk_size=100_000):
+        """
+        Builds the nullity matrix of a dataframe, chunk_size rows at a time so the boolean frame of the whole dataset
+        is never materialised.
+
+        Parameters:
+        df (pd.DataFrame): Dataframe to analyse.
+        chunk_size (int): Number of rows converted at once. Default is 100,000.
+
+        Returns:
+        NullityMatrix: Nullity matrix of df.
+        """
+        nullity = cls(df.columns)
+        for start in range(0, len(df), chunk_size):
+            nullity.update(df.iloc[start:start + chunk_size])
+        return nullity
+
+    def update(self, chunk):
+        """
+        Appends the rows of a chunk of the dataset, for instance one returned by pd.read_csv(..., chunksize=...).
+
+        Parameters:
+        chunk (pd.DataFrame): Rows to append, with the same columns as the matrix.
+
+        Returns:
+        None
+        """
+        if list(chunk.columns) != self.cols_list:
+            raise ValueError("The chunk columns do not match the columns of the nullity matrix.")
+
+        mask = chunk.isna().to_numpy()
+        self.col_counts += mask.sum(axis=0)
+        self.blocks.append(np.packbits(mask, axis=1))
+        self.n_rows += len(chunk)
+        self.row_counts = None
+
+    @classmethod
+    def merge(cls, matrices):
+        """
+        Stacks the nullity matrices of consecutive parts of a dataset, for instance computed in parallel, without
+        unpacking them.
+
+        Parameters:
+        matrices (list): Nullity matrices with the same columns, in the order of the rows.
+
+        Returns:
+        NullityMatrix: Nullity matrix of all the rows.
+        """
+        nullity = cls(matrices[0].cols_list)
+        for matrix in matrices:
+            if matrix.cols_list != nullity.cols_list:
+                raise ValueError("The columns of the nullity matrices do not match.")
+            nullity.col_counts += matrix.col_counts
+            nullity.blocks.extend(matrix.blocks)
+            nullity.n_rows += matrix.n_rows
+        return nullity
+
+    @property
+    def n_missing(self):
+        """
+        Total number of missing values of the dataset.
+        """
+        return int(self.col_counts.sum())
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the packed matrix, in bytes.
+        """
+        return sum(block.nbytes for block in self.blocks)
+
+    def iter_unpacked(self):
+        """
+        Yields each block of rows unpacked as a uint8 array of shape (rows, n_cols) holding 1 for missing cells.
+        """
+        for block in self.blocks:
+            yield np.unpackbits(block, axis=1, count=self.n_cols)
+
+    def get_column_counts(self):
+        """
+        Computes the number and percentage of missing values of each column.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns Column Name, Number of Missing Values and Percentage.
+        """
+        percentage = self.col_counts / self.n_rows * 100 if self.n_rows else np.zeros(self.n_cols)
+        return pd.DataFrame({
+            "Column Name": self.cols_list,
+            "Number of Missing Values": self.col_counts,
+            "Percentage": percentage,
+        })
+
+    def get_row_counts(self):
+        """
+        Computes the number of missing values of each row by counting the bits set in its packed bytes, once until
+        rows are added to the matrix.
+
+        Returns:
+        np.ndarray: Number of missing values of each row.
+        """
+        if self.row_counts is None:
+            if self.blocks:
+                self.row_counts = np.concatenate([_POPCOUNT[block].sum(axis=1, dtype=np.int64) for block in self.blocks])
+            else:
+                self.row_counts = np.zeros(0, dtype=np.int64)
+        return self.row_counts
+
+    def get_row_distribution(self):
+        """
+        Computes how many rows have each number of missing values.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns Missing Values per Row, Number of Rows and Percentage.
+        """
+        counts = np.bincount(self.get_row_counts(), minlength=1)
+        n_missing = np.flatnonzero(counts)
+        return pd.DataFrame({
+            "Missing Values per Row": n_missing,
+            "Number of Rows": counts[n_missing],
+            "Percentage": counts[n_missing] / max(self.n_rows, 1) * 100,
+        })
+
+    def get_co_missing(self):
+        """
+        Computes the correlation between the missing indicators of the columns having at least one missing value
+        (phi coefficient). Columns that are always or never missing are left out, their correlation being undefined.
+
+        Returns:
+        pd.DataFrame: Square correlation matrix indexed by column names.
+        """
+        selected = np.flatnonzero((self.col_counts > 0) & (self.col_counts < self.n_rows))
+        names = [self.cols_list[i] for i in selected]
+
+        # Number of rows where both columns are missing, accumulated block by block
+        joint = np.zeros((len(selected), len(selected)), dtype=np.float64)
+        for unpacked in self.iter_unpacked():
+            indicators = unpacked[:, selected].astype(np.float32)
+            joint += indicators.T @ indicators
+
+        n_rows = float(self.n_rows)
+        counts = self.col_counts[selected].astype(np.float64)
+        covariance = n_rows * joint - np.outer(counts, counts)
+        spread = np.sqrt(counts * (n_rows - counts))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            correlation = covariance / np.outer(spread, spread)
+
+        return pd.DataFrame(correlation, index=names, columns=names)
+
+    def get_patterns(self, end=10):
+        """
+        Computes the most common combinations of missing columns across rows.
+
+        Parameters:
+        end (int): Number of patterns to be returned. Default is 10.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns Missing Columns, Number of Missing Columns, Number of Rows and
+        Percentage, sorted by decreasing number of rows.
+        """
+        n_bytes = (self.n_cols + 7) // 8
+        pattern_counts = {}
+        blocks = self.blocks if n_bytes > 0 else []
+        for block in blocks:
+            rows = np.ascontiguousarray(block).view(np.dtype((np.void, n_bytes))).ravel()
+            patterns, counts = np.unique(rows, return_counts=True)
+            for pattern, count in zip(patterns, counts):
+                key = pattern.tobytes()
+                pattern_counts[key] = pattern_counts.get(key, 0) + int(count)
+
+        top = sorted(pattern_counts.items(), key=lambda item: item[1], reverse=True)[:end]
+        missing_cols = []
+        for key, _ in top:
+            bits = np.unpackbits(np.frombuffer(key, dtype=np.uint8), count=self.n_cols).astype(bool)
+            missing_cols.append([name for name, bit in zip(self.cols_list, bits) if bit])
+
+        return pd.DataFrame({
+            "Missing Columns": [", ".join(map(str, cols)) if cols else "None" for cols in missing_cols],
+            "Number of Missing Columns": [len(cols) for cols in missing_cols],
+            "Number of Rows": [count for _, count in top],
+            "Percentage": [count / max(self.n_rows, 1) * 100 for _, count in top],
+        })
+
+    def get_summary(self):
+        """
+        Formats the size of the nullity matrix compared with a boolean dataframe as a Pandas dataframe with 2
+        columns: Description and Value.
+
+        Returns:
+        pd.DataFrame: Formatted dataframe to be displayed on the Streamlit app.
+        """
+        row_counts = self.get_row_counts()
+        return pd.DataFrame({
+            "Description": [
+                "Number of Missing Values",
+                "Number of Columns with Missing Values",
+                "Number of Rows with Missing Values",
+                "Nullity Matrix Memory (Bytes)",
+                "Boolean DataFrame Memory (Bytes)",
+            ],
+            "Value": [
+                self.n_missing,
+                int((self.col_counts > 0).sum()),
+                int((row_counts > 0).sum()),
+                self.nbytes,
+                self.n_rows * self.n_cols,
+            ],
+        })
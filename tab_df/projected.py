@@ -0,0 +1,329 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from common.fingerprint import file_fingerprint
+from common.schema import DATETIME, DatasetSchema, infer_column_type
+from tab_df.logics import Dataset
+from tab_df.memory import GOVERNOR, read_head
+from tab_df.row_index import find_row_ends
+from tab_df.sources import get_name, is_multipart, open_raw, open_stream
+
+# pyarrow only converts the requested columns of each block of the file, Pandas' C parser is used if it is not installed
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# Files with at least this many columns are loaded column by column, which can be changed through an environment variable
+PROJECTED_MIN_COLS = int(os.environ.get("CSV_EXPLORER_PROJECTED_MIN_COLS", 50))
+
+
+def read_sample(file_path, n_sample_bytes=1024 ** 2):
+    """
+    Reads the header and the complete rows found in the first n_sample_bytes uncompressed bytes of a CSV file.
+
+    Parameters:
+    file_path (str, file-like or list): CSV file, optionally compressed, or list of its parts.
+    n_sample_bytes (int): Number of bytes read. Default is 1 MB.
+
+    Returns:
+    pd.DataFrame: First rows of the file.
+    """
+    head = read_head(file_path, n_sample_bytes)
+    if len(head) == n_sample_bytes:
+        row_ends, _ = find_row_ends(head)
+        if len(row_ends) > 1:
+            head = head[:row_ends[-1] + 1]
+    return pd.read_csv(io.BytesIO(head))
+
+
+def is_wide(file_path, min_cols=PROJECTED_MIN_COLS):
+    """
+    Checks if a CSV file has enough columns to be loaded column by column with ProjectedDataset.
+    """
+    try:
+        return read_sample(file_path, 64 * 1024).shape[1] >= min_cols
+    except Exception:
+        return False
+
+
+def read_columns(file_path, cols_list):
+    """
+    Parses some columns of a CSV file, the other fields of each row being skipped without being converted.
+
+    Parameters:
+    file_path (str or file-like): CSV file, optionally compressed with gzip or zstd.
+    cols_list (list): Names of the columns to parse.
+
+    Returns:
+    pd.DataFrame: Parsed columns, in the order of cols_list.
+    """
+    if pyarrow is not None:
+        try:
+            with open_stream(file_path) as stream:
+                return pd.read_csv(stream, usecols=cols_list, engine="pyarrow")[cols_list]
+        except Exception:
+            # Files pyarrow cannot parse, for instance with ragged rows, are read again by the C parser
+            pass
+
+    with open_stream(file_path) as stream:
+        return pd.read_csv(stream, usecols=cols_list)[cols_list]
+
+
+class ProjectedDataset(Dataset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProjectedDataset (class): Class that manages a wide CSV file column by column: only its header and first rows
+    are parsed when it is opened, each column being parsed the first time a tab needs it and then kept in memory
+
+    --------------------
+    Attributes
+    --------------------
+    -> file_path (str or list): Path to the uploaded CSV file, optionally compressed, or list of its parts (mandatory)
+    -> session_id (str): Identifier of the Streamlit session loading the dataset, used to enforce its memory budget (default set to None)
+    -> n_sample_bytes (int): Number of bytes read at the start of the file to infer the type of each column (default set to 1 MB)
+    -> sample (pd.DataFrame): First rows of the file used to infer the type of each column (default set to None)
+    -> columns (dict): Columns parsed so far, by name (default set to empty dict)
+    -> loaded_bytes (int): Memory used by the parsed columns, in bytes (default set to 0)
+    -> part_rows (list): Number of rows of each part of the file, known once a column is parsed (default set to None)
+    -> col_bytes (pd.Series): Projected memory of each column once parsed, in bytes (default set to None)
+    -> Other attributes are inherited from Dataset, df staying None
+    """
+    def __init__(self, file_path, session_id=None, n_sample_bytes=1024 ** 2, max_frames=8):
+        super().__init__(file_path, session_id=session_id)
+        self.n_sample_bytes = n_sample_bytes
+        self.sample = None
+        self.columns = {}
+        self.loaded_bytes = 0
+        self.part_rows = None
+        self.col_bytes = None
+        self._frames = OrderedDict()
+        self._max_frames = max_frames
+        self._lock = threading.Lock()
+        self._key = None
+
+    def set_df(self):
+        """
+        Reads the header and first rows of the file to infer the type of each column. No column is parsed whole.
+        """
+        if self.sample is not None:
+            print("Dataset schema already loaded.")
+            return
+
+        try:
+            self.sample = read_sample(self.file_path, self.n_sample_bytes)
+            print(f"Dataset schema loaded successfully from {get_name(self.file_path)}")
+        except FileNotFoundError:
+            print(f"Error: File {get_name(self.file_path)} not found.")
+            return
+        except Exception as e:
+            print(f"An error occurred while loading the dataset schema: {e}")
+            return
+
+        self.cols_list = self.sample.columns.tolist()
+        self.schema = DatasetSchema.infer(self.sample)
+
+        # Project the memory of each column, so parsing columns stays within the memory budget of the session
+        self.col_bytes = GOVERNOR.estimate(self.file_path, self.session_id, self.n_sample_bytes).col_bytes
+        self.set_row_index()
+
+    def is_df_none(self):
+        return self.sample is None or not self.cols_list
+
+    def set_data(self):
+        if self.sample is None:
+            raise ValueError("No dataset schema loaded. Use `set_df` method to load the schema first.")
+
+        # Count the rows from the row index, or from the first column when the file could not be indexed
+        self.n_cols = len(self.cols_list)
+        if self.row_index is not None:
+            self.n_rows = self.row_index.n_rows
+        elif self.cols_list:
+            self.n_rows = len(self.get_columns(self.cols_list[:1]))
+
+        # Duplicated rows and missing values need every column, so they are not computed
+        self.n_duplicates = None
+        self.n_missing = None
+
+        # Compute the number of numeric and text columns from the schema
+        self.n_num_cols = len(self.schema.get_num_cols())
+        self.n_text_cols = self.n_cols - self.n_num_cols
+
+        # Update the table with column information
+        self.create_table()
+
+    def get_key(self):
+        """
+        Identifies the dataset from the stored bytes of its file, hashed once, its columns not being loaded.
+        """
+        if self._key is None:
+            parts = self.file_path if is_multipart(self.file_path) else [self.file_path]
+            fingerprints = []
+            for part in parts:
+                with open_raw(part) as raw:
+                    fingerprints.append(file_fingerprint(raw))
+            self._key = "-".join(fingerprints)
+        return self._key
+
+    def get_columns(self, cols_list):
+        """
+        Returns some columns of the dataset, parsing in a single pass over the file the ones that were not parsed yet.
+
+        Parameters:
+        cols_list (list): Names of the columns.
+
+        Returns:
+        pd.DataFrame: Dataframe with the requested columns, its schema being the one inferred from the first rows.
+        """
+        cols_list = list(cols_list)
+        key = tuple(cols_list)
+        with self._lock:
+            missing_cols = [col_name for col_name in cols_list if col_name not in self.columns]
+            if missing_cols:
+                self.check_budget(missing_cols)
+                parsed = self.read_columns(missing_cols)
+                for col_name in missing_cols:
+                    self.columns[col_name] = parsed[col_name]
+                    self.set_column_type(col_name)
+                self.loaded_bytes += int(parsed.memory_usage(index=False, deep=True).sum())
+                GOVERNOR.register(self, self.session_id, self.loaded_bytes)
+                print(f"Columns parsed: {', '.join(map(str, missing_cols))}.")
+
+            # The same dataframe is returned for the same columns, so its fingerprint is computed once
+            if key in self._frames:
+                self._frames.move_to_end(key)
+            else:
+                self._frames[key] = pd.DataFrame({col_name: self.columns[col_name] for col_name in cols_list}, copy=False)
+                if len(self._frames) > self._max_frames:
+                    self._frames.popitem(last=False)
+            df = self._frames[key]
+
+        return df
+
+    def check_budget(self, cols_list):
+        """
+        Checks that parsing some columns fits in the memory the session can still use.
+
+        Parameters:
+        cols_list (list): Names of the columns to parse.
+
+        Returns:
+        None
+        """
+        if self.col_bytes is None:
+            return
+
+        needed = int(self.col_bytes.reindex(cols_list).fillna(0).sum())
+        available = GOVERNOR.get_available(self.session_id)
+        if needed > available:
+            raise MemoryError(
+                f"Parsing {len(cols_list)} columns needs about {needed} bytes, but only {available} bytes of the "
+                "memory budget are available."
+            )
+
+    def set_column_type(self, col_name):
+        """
+        Classifies a parsed column again when its data type differs from the one of the first rows, for instance a
+        column of numbers holding text further in the file, so the tabs get the type of the whole column.
+        """
+        serie = self.columns[col_name]
+        if serie.dtype == self.schema.dtypes[col_name]:
+            return
+
+        col_type, col_format = infer_column_type(serie)
+        self.schema.dtypes[col_name] = serie.dtype
+        self.schema.types[col_name] = col_type
+        self.schema.formats.pop(col_name, None)
+        if col_type == DATETIME:
+            self.schema.formats[col_name] = col_format
+
+    def read_columns(self, cols_list):
+        # Parses the columns from each part of the file, decompressing it while it is read
+        parts = self.file_path if is_multipart(self.file_path) else [self.file_path]
+        frames = [read_columns(part, cols_list) for part in parts]
+        self.part_rows = [len(frame) for frame in frames]
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    def get_page(self, page, page_size=10):
+        """
+        Reads a page of rows directly from the CSV file, using the row index when the file could be indexed.
+
+        Parameters:
+        page (int): Number of the page, starting at 0.
+        page_size (int): Number of rows per page. Default is 10.
+
+        Returns:
+        pd.DataFrame: Rows of the requested page.
+        """
+        if self.row_index is not None:
+            return self.row_index.get_page(page, page_size)
+
+        # Otherwise the rows before the page are skipped, without being converted, while each part is streamed
+        if self.part_rows is None:
+            self.get_columns(self.cols_list[:1])
+        parts = self.file_path if is_multipart(self.file_path) else [self.file_path]
+        start, rows = page * page_size, []
+        for part, n_part_rows in zip(parts, self.part_rows):
+            n_needed = page_size - sum(len(chunk) for chunk in rows)
+            if n_needed <= 0:
+                break
+            if start >= n_part_rows:
+                start -= n_part_rows
+                continue
+            with open_stream(part) as stream:
+                rows.append(pd.read_csv(stream, skiprows=range(1, start + 1), nrows=n_needed))
+            start = 0
+
+        rows = pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=self.cols_list)
+        rows.index = pd.RangeIndex(page * page_size, page * page_size + len(rows))
+        return rows
+
+    def get_n_pages(self, page_size):
+        return -(-self.n_rows // page_size)
+
+    def create_table(self):
+        """
+        Computes a DataFrame containing the list of columns with their data types, inferred types and memory usage once parsed.
+        """
+        if self.is_df_none():
+            print("The dataset schema is not loaded. Unable to compute the table.")
+            return
+
+        self.table = pd.DataFrame({
+            "Column Name": self.cols_list,
+            "Data Type": [str(self.schema.dtypes[col_name]) for col_name in self.cols_list],
+            "Inferred Type": [self.schema.types[col_name] for col_name in self.cols_list],
+            "Parsed": [col_name in self.columns for col_name in self.cols_list],
+            "Memory Usage (Bytes)": [
+                int(self.columns[col_name].memory_usage(index=False, deep=True)) if col_name in self.columns else 0
+                for col_name in self.cols_list
+            ],
+        })
+
+    def get_summary(self):
+        """
+        Formats the information of the dataset as a Pandas dataframe with 2 columns: Description and Value, the
+        information needing every column being reported as not computed.
+        """
+        if self.is_df_none():
+            print("The dataset schema is not loaded. Unable to compute the summary.")
+            return pd.DataFrame(columns=["Description", "Value"])
+
+        values = [self.n_rows, self.n_cols, self.n_duplicates, self.n_missing, self.n_num_cols, self.n_text_cols]
+        return pd.DataFrame({
+            "Description": [
+                "Number of Rows",
+                "Number of Columns",
+                "Number of Duplicated Rows",
+                "Number of Missing Values",
+                "Number of Numeric Columns",
+                "Number of Text Columns",
+            ],
+            "Value": ["Not computed" if value is None else str(value) for value in values],
+        })
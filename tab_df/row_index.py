@@ -0,0 +1,242 @@
+import io
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Size of the blocks read from the file while scanning it
+BLOCK_SIZE = 4 * 1024 ** 2
+
+_NEWLINE = ord("\n")
+_QUOTE = ord('"')
+_CARRIAGE_RETURN = ord("\r")
+
+
+def find_row_ends(block, n_quotes=0):
+    """
+    Finds the newlines of a block of CSV bytes that end a row, ignoring the ones inside quoted fields.
+
+    Parameters:
+    block (bytes): Block of the CSV file.
+    n_quotes (int): Number of quote characters seen since the start of the current row. Default is 0.
+
+    Returns:
+    tuple: Positions of the row ending newlines in block (np.ndarray) and number of quote characters seen since the
+    start of the last unfinished row (int).
+    """
+    values = np.frombuffer(block, dtype=np.uint8)
+    newlines = np.flatnonzero(values == _NEWLINE)
+    quotes = np.flatnonzero(values == _QUOTE)
+
+    # A newline ends a row when an even number of quotes precedes it
+    quotes_before = np.searchsorted(quotes, newlines) + n_quotes
+    row_ends = newlines[quotes_before % 2 == 0]
+
+    n_quotes_after = len(quotes) - np.searchsorted(quotes, row_ends[-1]) if len(row_ends) else len(quotes) + n_quotes
+    return row_ends, int(n_quotes_after)
+
+
+def drop_blank_rows(block, row_ends, prefix=b""):
+    """
+    Removes the ends of the empty rows, which pd.read_csv skips (skip_blank_lines=True), from the row ends of a block.
+
+    Parameters:
+    block (bytes): Block of the CSV file.
+    row_ends (np.ndarray): Positions of the row ending newlines in block, as returned by find_row_ends.
+    prefix (bytes): Start of the row left unfinished by the previous block, only its first 2 bytes being needed.
+    Default is empty bytes, the block starting right after the end of a row.
+
+    Returns:
+    np.ndarray: Positions of the newlines ending a non-empty row.
+    """
+    if len(row_ends) == 0:
+        return row_ends
+
+    # Length of each row, the first one including the bytes read from the previous block
+    starts = np.concatenate(([-len(prefix)], row_ends[:-1] + 1))
+    lengths = row_ends - starts
+
+    # Rows ending with \r\n are blank when the \r is their only character
+    blank = lengths == 0
+    carriage = lengths == 1
+    values = np.frombuffer(prefix[:1] + block, dtype=np.uint8)
+    carriage[carriage] = values[row_ends[carriage] - 1 + len(prefix[:1])] == _CARRIAGE_RETURN
+    return row_ends[~(blank | carriage)]
+
+
+def get_row_prefix(block, row_ends, prefix=b""):
+    """
+    Returns the first 2 bytes of the row left unfinished at the end of block, to be passed to drop_blank_rows.
+    """
+    if len(row_ends):
+        return block[row_ends[-1] + 1:row_ends[-1] + 3]
+    return (prefix + block[:2])[:2]
+
+
+class RowIndex:
+    """
+    --------------------
+    Description
+    --------------------
+    -> RowIndex (class): Class that indexes the byte offsets where the rows of a CSV file start, so any page of rows
+    can be read from the file without loading the rest of it
+
+    --------------------
+    Attributes
+    --------------------
+    -> file_path (str or file-like): Path or seekable binary file object of the CSV file (mandatory)
+    -> stride (int): Number of rows between two indexed offsets (default set to 128)
+    -> header (bytes): Header row of the CSV file, including its newline (default set to empty bytes)
+    -> offsets (np.ndarray): Byte offset of every stride-th data row (default set to empty array)
+    -> n_rows (int): Number of data rows of the CSV file (default set to 0)
+    """
+    def __init__(self, file_path, stride=128):
+        self.file_path = file_path
+        self.stride = stride
+        self.header = b""
+        self.offsets = np.zeros(0, dtype=np.int64)
+        self.n_rows = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        # Opens the file, or rewinds the file object provided instead of a path
+        if isinstance(self.file_path, (str, bytes)) or hasattr(self.file_path, "__fspath__"):
+            return open(self.file_path, "rb")
+        self.file_path.seek(0)
+        return _Unclosed(self.file_path)
+
+    def build(self):
+        """
+        Scans the whole file once, block by block, to record the offset of every stride-th row.
+
+        Returns:
+        None
+        """
+        offsets = []
+        n_quotes = 0
+        n_rows = -1  # The first row ending is the end of the header
+        position = 0
+        header_end = None
+        prefix = b""
+
+        with self._lock, self._open() as file:
+            while True:
+                block = file.read(BLOCK_SIZE)
+                if not block:
+                    break
+
+                # Blank lines are skipped by pd.read_csv, so they are not counted as rows
+                all_row_ends, n_quotes = find_row_ends(block, n_quotes)
+                row_ends = drop_blank_rows(block, all_row_ends, prefix)
+                prefix = get_row_prefix(block, all_row_ends, prefix)
+                row_starts = position + row_ends + 1
+                if header_end is None and len(row_starts):
+                    header_end = int(row_starts[0])
+
+                # Row numbers (0 being the first data row) of the rows starting right after each newline
+                numbers = np.arange(n_rows + 1, n_rows + 1 + len(row_starts))
+                offsets.append(row_starts[numbers % self.stride == 0])
+
+                n_rows += len(row_starts)
+                position += len(block)
+                last_block = block
+
+            # The last row may not end with a newline
+            if position and not last_block.endswith(b"\n"):
+                n_rows += 1
+
+            if header_end is None:
+                header_end = position
+            file.seek(0)
+            self.header = file.read(header_end)
+
+        self.n_rows = max(n_rows, 0)
+        offsets = np.concatenate(offsets) if offsets else np.zeros(0, dtype=np.int64)
+        self.offsets = offsets[offsets < position] if self.n_rows else offsets[:0]
+
+    def get_n_pages(self, page_size):
+        """
+        Computes the number of pages needed to display all the rows.
+
+        Parameters:
+        page_size (int): Number of rows per page.
+
+        Returns:
+        int: Number of pages.
+        """
+        return -(-self.n_rows // page_size)
+
+    def get_rows(self, start, n_rows):
+        """
+        Reads n_rows rows starting at row number start (0 being the first data row) from the file.
+
+        Parameters:
+        start (int): Number of the first row to read.
+        n_rows (int): Number of rows to read.
+
+        Returns:
+        pd.DataFrame: Requested rows, indexed by their row number.
+        """
+        start = max(0, min(start, self.n_rows))
+        n_rows = max(0, min(n_rows, self.n_rows - start))
+        if n_rows == 0:
+            return pd.read_csv(io.BytesIO(self.header))
+
+        # Seek to the closest indexed row, then skip the few rows before start
+        checkpoint = start // self.stride
+        n_skipped = start - checkpoint * self.stride
+        n_wanted = n_skipped + n_rows
+
+        chunks = []
+        n_found = 0
+        n_quotes = 0
+        prefix = b""
+        with self._lock, self._open() as file:
+            file.seek(int(self.offsets[checkpoint]))
+            while n_found < n_wanted:
+                block = file.read(min(BLOCK_SIZE, 64 * 1024 * max(1, n_wanted - n_found)))
+                if not block:
+                    break
+                all_row_ends, n_quotes = find_row_ends(block, n_quotes)
+                row_ends = drop_blank_rows(block, all_row_ends, prefix)
+                prefix = get_row_prefix(block, all_row_ends, prefix)
+                if n_found + len(row_ends) >= n_wanted:
+                    chunks.append(block[:row_ends[n_wanted - n_found - 1] + 1])
+                    n_found = n_wanted
+                else:
+                    chunks.append(block)
+                    n_found += len(row_ends)
+
+        data = b"".join(chunks)
+        if n_skipped:
+            row_ends = drop_blank_rows(data, find_row_ends(data)[0])
+            data = data[row_ends[n_skipped - 1] + 1:]
+
+        rows = pd.read_csv(io.BytesIO(self.header + data))
+        rows.index = pd.RangeIndex(start, start + len(rows))
+        return rows
+
+    def get_page(self, page, page_size):
+        """
+        Reads one page of rows from the file.
+
+        Parameters:
+        page (int): Number of the page, starting at 0.
+        page_size (int): Number of rows per page.
+
+        Returns:
+        pd.DataFrame: Rows of the page, indexed by their row number.
+        """
+        return self.get_rows(page * page_size, page_size)
+
+
+class _Unclosed:
+    # Context manager giving access to a file object provided by the caller without closing it
+    def __init__(self, file):
+        self.file = file
+
+    def __enter__(self):
+        return self.file
+
+    def __exit__(self, *args):
+        return False
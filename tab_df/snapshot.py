@@ -0,0 +1,274 @@
+import datetime
+import json
+import math
+import struct
+import zlib
+
+import numpy as np
+import pandas as pd
+
+# Header of the snapshot files: magic bytes, format version, flags and length of the compressed payload
+MAGIC = b"CSVP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+
+# Attributes saved for each kind of column, with the descriptions used in the summary tables
+NUM_FIELDS = [
+    ("Number of Unique Values", "n_unique"),
+    ("Number of Missing Values", "n_missing"),
+    ("Average Value", "col_mean"),
+    ("Standard Deviation", "col_std"),
+    ("Minimum Value", "col_min"),
+    ("Maximum Value", "col_max"),
+    ("Median Value", "col_median"),
+    ("Number of Zeros", "n_zeros"),
+    ("Number of Negatives", "n_negatives"),
+]
+TEXT_FIELDS = [
+    ("Number of Unique Values", "n_unique"),
+    ("Number of Rows with Missing Values", "n_missing"),
+    ("Number of Empty Rows", "n_empty"),
+    ("Number of Rows with Only Whitespace", "n_space"),
+    ("Number of Rows with Only Lowercases", "n_lower"),
+    ("Number of Rows with Only Uppercases", "n_upper"),
+    ("Number of Rows with Only Alphabet", "n_alpha"),
+    ("Number of Rows with Only Digits", "n_digit"),
+    ("Mode Value", "n_mode"),
+    ("Minimum Length", "len_min"),
+    ("Maximum Length", "len_max"),
+    ("Average Length", "len_mean"),
+    ("25th Percentile Length", "len_p25"),
+    ("Median Length", "len_median"),
+    ("75th Percentile Length", "len_p75"),
+    ("95th Percentile Length", "len_p95"),
+    ("Average Number of Tokens", "tokens_mean"),
+    ("Maximum Number of Tokens", "tokens_max"),
+]
+DATE_FIELDS = [
+    ("Number of Unique Values", "n_unique"),
+    ("Number of Missing Values", "n_missing"),
+    ("Min Value", "col_min"),
+    ("Max Value", "col_max"),
+    ("Number of Weekend Dates", "n_weekend"),
+    ("Number of Weekday Dates", "n_weekday"),
+    ("Number of Future Dates", "n_future"),
+    ("Number of '1900-01-01' Dates", "n_empty_1900"),
+    ("Number of Numeric Dates", "n_empty_1970"),
+]
+
+
+def to_json_value(value):
+    """
+    Converts a value computed by Pandas or Numpy into a value that can be written as JSON.
+
+    Parameters:
+    value (object): Value to convert.
+
+    Returns:
+    object: None, bool, int, float or str.
+    """
+    if value is None or value is pd.NaT:
+        return None
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    if isinstance(value, (pd.Timestamp, datetime.datetime, datetime.date, np.datetime64)):
+        return pd.Timestamp(value).isoformat()
+    return str(value)
+
+
+def get_fields(column, fields):
+    # Reads the attributes listed in fields from a column object
+    return {description: to_json_value(getattr(column, attribute)) for description, attribute in fields}
+
+
+def get_records(df):
+    # Converts a dataframe into a list of JSON-compatible dictionaries
+    return [{key: to_json_value(value) for key, value in row.items()} for row in df.to_dict(orient="records")]
+
+
+class ProfileSnapshot:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ProfileSnapshot (class): Class that holds the full profile of a dataset (summaries and most frequent values of
+    every column) and saves it in a versioned, compressed binary format that can be reloaded without the CSV file
+
+    --------------------
+    Attributes
+    --------------------
+    -> source (str): Name of the profiled file (default set to None)
+    -> created (str): Date and time the profile was computed, in ISO format (default set to None)
+    -> summary (dict): Dataset summary, mapping each description to its value (default set to empty dict)
+    -> columns (dict): Profile of each column, holding its kind ('num', 'text' or 'date'), summary and frequent values (default set to empty dict)
+    """
+    def __init__(self, source=None, created=None, summary=None, columns=None):
+        self.source = source
+        self.created = created
+        self.summary = summary or {}
+        self.columns = columns or {}
+
+    @classmethod
+    def from_dataset(cls, dataset, source=None, end=20):
+        """
+        Computes the profile of a loaded dataset, using the same column classes as the tabs.
+
+        Parameters:
+        dataset (Dataset): Dataset with its dataframe loaded and set_data called.
+        source (str): Name of the profiled file. Default is None.
+        end (int): Number of most frequent values saved per column. Default is 20.
+
+        Returns:
+        ProfileSnapshot: Profile of the dataset.
+        """
+        # The column classes load altair, so they are only imported once a snapshot is first computed
+        from tab_date.logics import DateColumn
+        from tab_num.logics import NumericColumn
+        from tab_text.logics import TextColumn
+
+        summary_df = dataset.get_summary()
+        snapshot = cls(
+            source=source,
+            created=datetime.datetime.now().isoformat(timespec="seconds"),
+            summary={row["Description"]: to_json_value(row["Value"]) for _, row in summary_df.iterrows()},
+        )
+
+        # A dataset loaded column by column has all its columns parsed, the profile covering every column
+        df = dataset.df if dataset.df is not None else dataset.get_columns(dataset.cols_list)
+        schema = dataset.schema
+        dataset_key = dataset.get_key()
+        for kind, cols_list, column_class, fields in [
+            ("num", schema.get_num_cols(), NumericColumn, NUM_FIELDS),
+            ("text", schema.get_text_cols(), TextColumn, TEXT_FIELDS),
+            ("date", schema.get_date_cols(), DateColumn, DATE_FIELDS),
+        ]:
+            for col_name in cols_list:
+                column = column_class(df=df, schema=schema, dataset_key=dataset_key)
+                column.cols_list = cols_list
+                column.set_serie(col_name)
+                if kind == "text" and column.is_serie_none():
+                    continue
+                column.set_stats()
+                column.set_frequent(end=end)
+                snapshot.columns[str(col_name)] = {
+                    "kind": kind,
+                    "summary": get_fields(column, fields),
+                    "frequent": get_records(column.frequent),
+                }
+
+        return snapshot
+
+    def to_bytes(self):
+        """
+        Serialises the profile: a fixed header followed by the zlib-compressed JSON payload.
+
+        Returns:
+        bytes: Snapshot content.
+        """
+        payload = json.dumps(
+            {"source": self.source, "created": self.created, "summary": self.summary, "columns": self.columns},
+            separators=(",", ":"),
+        ).encode("utf-8")
+        compressed = zlib.compress(payload, 9)
+        return HEADER.pack(MAGIC, VERSION, 0, len(compressed)) + compressed
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Reads a profile serialised by to_bytes.
+
+        Parameters:
+        data (bytes): Snapshot content.
+
+        Returns:
+        ProfileSnapshot: Loaded profile.
+        """
+        if len(data) < HEADER.size:
+            raise ValueError("The snapshot is truncated.")
+
+        magic, version, _, length = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("The file is not a profile snapshot.")
+        if version > VERSION:
+            raise ValueError(f"Snapshot version {version} is newer than the supported version {VERSION}.")
+
+        payload = json.loads(zlib.decompress(data[HEADER.size:HEADER.size + length]).decode("utf-8"))
+        return cls(payload["source"], payload["created"], payload["summary"], payload["columns"])
+
+    def save(self, path):
+        """
+        Writes the snapshot to a file.
+        """
+        with open(path, "wb") as file:
+            file.write(self.to_bytes())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a snapshot from a file.
+        """
+        with open(path, "rb") as file:
+            return cls.from_bytes(file.read())
+
+    def get_summary(self):
+        """
+        Formats the dataset summary as a Pandas dataframe with 2 columns: Description and Value.
+        """
+        return pd.DataFrame({"Description": list(self.summary), "Value": pd.Series(list(self.summary.values()), dtype=object)}).astype(str)
+
+    def get_column_summary(self, col_name):
+        """
+        Formats the summary of a column as a Pandas dataframe with 2 columns: Description and Value.
+        """
+        summary = self.columns[col_name]["summary"]
+        return pd.DataFrame({"Description": list(summary), "Value": pd.Series(list(summary.values()), dtype=object)}).astype(str)
+
+    def get_frequent(self, col_name):
+        """
+        Returns the most frequent values of a column as a Pandas dataframe with the columns value, occurrence and percentage.
+        """
+        return pd.DataFrame(self.columns[col_name]["frequent"], columns=["value", "occurrence", "percentage"])
+
+    def diff(self, other):
+        """
+        Compares this snapshot (before) with another one (after) to show the drift between two extracts.
+
+        Parameters:
+        other (ProfileSnapshot): Snapshot of the newer extract.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns Column, Description, Before, After and Change, listing only the values
+        that differ. Change is the relative change in percent for numbers.
+        """
+        rows = []
+
+        def compare(col_name, before, after):
+            for description in list(before) + [key for key in after if key not in before]:
+                old, new = before.get(description), after.get(description)
+                if old == new:
+                    continue
+                change = None
+                if isinstance(old, (int, float)) and isinstance(new, (int, float)) and not isinstance(old, bool):
+                    change = (new - old) / abs(old) * 100 if old else None
+                rows.append((col_name, description, old, new, change))
+
+        compare("(dataset)", self.summary, other.summary)
+
+        for col_name in list(self.columns) + [name for name in other.columns if name not in self.columns]:
+            if col_name not in other.columns:
+                rows.append((col_name, "Column", "present", "removed", None))
+            elif col_name not in self.columns:
+                rows.append((col_name, "Column", "absent", "added", None))
+            else:
+                before, after = self.columns[col_name], other.columns[col_name]
+                if before["kind"] != after["kind"]:
+                    rows.append((col_name, "Column Kind", before["kind"], after["kind"], None))
+                compare(col_name, before["summary"], after["summary"])
+
+        diff_df = pd.DataFrame(rows, columns=["Column", "Description", "Before", "After", "Change (%)"])
+        diff_df[["Before", "After"]] = diff_df[["Before", "After"]].astype(str)
+        return diff_df
@@ -0,0 +1,165 @@
+import gzip
+import io
+import os
+import struct
+
+# zstandard is only needed to read .zst files
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compression of the files, found from the extension of their name
+COMPRESSIONS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+# Highest compression ratio of deflate, bounding the uncompressed size of a gzip file from its compressed size
+GZIP_MAX_RATIO = 1032
+
+# Margin added to the uncompressed sizes extrapolated from the beginning of a file, whose end may compress less well
+ESTIMATE_MARGIN = 1.25
+
+
+def is_path(file_path):
+    """
+    Checks if a file is given as a path rather than as a file object.
+    """
+    return isinstance(file_path, (str, bytes)) or hasattr(file_path, "__fspath__")
+
+
+def is_multipart(file_path):
+    """
+    Checks if a dataset is split into several parts.
+    """
+    return isinstance(file_path, (list, tuple))
+
+
+def get_name(file_path):
+    """
+    Returns the name of a file given as a path or as an uploaded file, or of the first part of a multi-part dataset.
+    """
+    if is_multipart(file_path):
+        name = get_name(file_path[0]) if file_path else ""
+        return f"{name} (+{len(file_path) - 1} more)" if len(file_path) > 1 else name
+    if is_path(file_path):
+        return os.fsdecode(file_path)
+    return getattr(file_path, "name", "")
+
+
+def get_compression(file_path):
+    """
+    Finds the compression of a file from its name.
+
+    Returns:
+    str: 'gzip', 'zstd' or None for an uncompressed file.
+    """
+    return COMPRESSIONS.get(os.path.splitext(get_name(file_path).lower())[1])
+
+
+def open_raw(file_path):
+    # Opens the file as it is stored, rewinding the file object provided instead of a path
+    if is_path(file_path):
+        return open(file_path, "rb")
+    file_path.seek(0)
+    return io.BufferedReader(_Unclosed(file_path))
+
+
+def open_stream(file_path):
+    """
+    Opens a CSV file for reading, decompressing it incrementally while it is read so it is never inflated whole on
+    disk or in memory.
+
+    Parameters:
+    file_path (str or file-like): Path or binary file object of the file, optionally compressed with gzip or zstd.
+
+    Returns:
+    file-like: Binary stream of the uncompressed content.
+    """
+    compression = get_compression(file_path)
+    if compression == "gzip" and is_path(file_path):
+        return gzip.open(file_path, "rb")
+
+    raw = open_raw(file_path)
+    try:
+        return decompress(raw, compression)
+    except ImportError:
+        raw.close()
+        raise
+
+
+def decompress(raw, compression):
+    # Wraps a stream of compressed bytes into a stream of uncompressed bytes, read incrementally
+    if compression == "gzip":
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+    if compression == "zstd":
+        if zstandard is None:
+            raise ImportError("The zstandard package is needed to read .zst files: pip install zstandard")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(raw, closefd=True))
+    return raw
+
+
+def get_data_size(file_path, n_sample_bytes=1024 ** 2):
+    """
+    Computes or estimates the uncompressed size of a file.
+
+    The size is exact for uncompressed files, for gzip files small enough for their trailer not to have wrapped
+    around 4 GB and for zstd files whose frame header holds it. Otherwise it is extrapolated from the compression
+    ratio of the first n_sample_bytes uncompressed bytes, with a margin of ESTIMATE_MARGIN, so the file is never
+    decompressed whole just to be measured.
+
+    Parameters:
+    file_path (str or file-like): File to measure.
+    n_sample_bytes (int): Number of uncompressed bytes read to estimate the compression ratio. Default is 1 MB.
+
+    Returns:
+    int: Uncompressed size of the file in bytes.
+    """
+    with open_raw(file_path) as raw:
+        file_size = raw.seek(0, io.SEEK_END)
+        compression = get_compression(file_path)
+        if compression is None:
+            return file_size
+
+        # The gzip trailer holds the size modulo 4 GB, which is only trusted when the file is too small to hold more
+        if compression == "gzip":
+            if 18 <= file_size and file_size * GZIP_MAX_RATIO < 1 << 32:
+                raw.seek(-4, io.SEEK_END)
+                size = struct.unpack("<I", raw.read(4))[0]
+                if size >= file_size - 18:
+                    return size
+
+        if compression == "zstd" and zstandard is not None:
+            raw.seek(0)
+            size = zstandard.frame_content_size(raw.read(18))
+            if size >= 0:
+                return size
+
+    # Otherwise apply the compression ratio of the beginning of the file, the whole file being read if it is shorter
+    with open_raw(file_path) as raw:
+        head = decompress(raw, compression).read(n_sample_bytes)
+        consumed = max(raw.tell(), 1)
+    if len(head) < n_sample_bytes:
+        return len(head)
+    return int(len(head) * file_size / consumed * ESTIMATE_MARGIN)
+
+
+class _Unclosed(io.RawIOBase):
+    # Wraps a file object owned by the caller, such as an uploaded file, so closing the stream does not close it
+    def __init__(self, file):
+        self._file = file
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
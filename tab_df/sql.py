@@ -0,0 +1,474 @@
+import math
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+
+from common.schema import DatasetSchema
+from tab_df.logics import Dataset
+
+# SQL snippets that differ between database engines, {col} being a quoted column name and param the placeholder of
+# a bound parameter
+DIALECTS = {
+    "sqlite": {
+        "whitespace": "{col} <> '' AND {col} NOT GLOB '*[^ ' || char(9, 10, 13) || ']*'",
+        "alpha": "{col} <> '' AND {col} NOT GLOB '*[^A-Za-z]*'",
+        "digit": "{col} <> '' AND {col} NOT GLOB '*[^0-9]*'",
+        "weekend": "strftime('%w', {col}) IN ('0', '6')",
+        "weekday": "strftime('%w', {col}) NOT IN ('0', '6')",
+        "future": "date({col}) > date('now')",
+        "date_1900": "date({col}) = '1900-01-01'",
+        "floor": "CAST({expr} AS INTEGER)",
+        "real": "CAST({col} AS REAL)",
+        "param": "?",
+    },
+    "postgresql": {
+        "whitespace": "{col} ~ '^\\s+$'",
+        "alpha": "{col} ~ '^[[:alpha:]]+$'",
+        "digit": "{col} ~ '^[0-9]+$'",
+        "weekend": "EXTRACT(ISODOW FROM CAST({col} AS timestamp)) IN (6, 7)",
+        "weekday": "EXTRACT(ISODOW FROM CAST({col} AS timestamp)) NOT IN (6, 7)",
+        "future": "CAST({col} AS date) > CURRENT_DATE",
+        "date_1900": "CAST({col} AS date) = DATE '1900-01-01'",
+        "floor": "FLOOR({expr})",
+        "real": "CAST({col} AS DOUBLE PRECISION)",
+        "param": "%s",
+    },
+}
+
+
+def quote(name):
+    """
+    Quotes a table or column name so it can be used in a SQL query.
+
+    Parameters:
+    name (str): Name to quote.
+
+    Returns:
+    str: Name between double quotes, inner double quotes being escaped.
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+class ConnectionPool:
+    """
+    --------------------
+    Description
+    --------------------
+    -> ConnectionPool (class): Thread-safe pool of DB-API connections reused between queries
+
+    --------------------
+    Attributes
+    --------------------
+    -> connect (callable): Function without arguments opening a new connection (mandatory)
+    -> size (int): Maximum number of open connections (default set to 4)
+    -> closed (bool): Whether the pool was closed, the borrowed connections being closed once returned (default set to False)
+    """
+    def __init__(self, connect, size=4):
+        self.connect = connect
+        self.size = size
+        self.closed = False
+        self._idle = queue.LifoQueue()
+        self._n_open = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """
+        Borrows a connection from the pool, opening one if none is idle and the pool is not full.
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._n_open < self.size
+                if can_open:
+                    self._n_open += 1
+            if can_open:
+                try:
+                    connection = self.connect()
+                except Exception:
+                    # The slot reserved for the connection is released, so the pool does not block on it
+                    with self._lock:
+                        self._n_open -= 1
+                    raise
+            else:
+                connection = self._idle.get()
+
+        try:
+            yield connection
+        finally:
+            if self.closed:
+                connection.close()
+                with self._lock:
+                    self._n_open -= 1
+            else:
+                self._idle.put(connection)
+
+    def query(self, sql, params=()):
+        """
+        Runs a query on a pooled connection.
+
+        Parameters:
+        sql (str): Query to run.
+        params (tuple): Values bound to the placeholders of the query. Default is no values.
+
+        Returns:
+        tuple: Rows returned by the query (list of tuples) and names of the columns (list).
+        """
+        with self.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                names = [description[0] for description in cursor.description or []]
+            finally:
+                cursor.close()
+        return rows, names
+
+    def close(self):
+        """
+        Closes all the idle connections, the ones still borrowed being closed when they are returned.
+        """
+        self.closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._n_open -= 1
+
+
+class SQLDataset(Dataset):
+    """
+    --------------------
+    Description
+    --------------------
+    -> SQLDataset (class): Class that manages a dataset stored in a database table, computing all its information
+    with SQL aggregate queries so only aggregated results are transferred
+
+    --------------------
+    Attributes
+    --------------------
+    -> file_path (str): Path to the SQLite database file, or None when connect is provided (mandatory)
+    -> table_name (str): Name of the table holding the dataset (mandatory)
+    -> dialect (str): SQL dialect of the database, 'sqlite' or 'postgresql' (default set to 'sqlite')
+    -> pool (ConnectionPool): Pool of connections to the database (default set to a pool of SQLite connections)
+    -> sample (pd.DataFrame): First rows of the table used to infer the type of each column (default set to None)
+    -> num_cols_list (list): List of columns names that are numeric type (default set to empty list)
+    -> text_cols_list (list): List of columns names that are text type (default set to empty list)
+    -> date_cols_list (list): List of columns names that hold dates (default set to empty list)
+    -> Other attributes are inherited from Dataset, df staying None
+    """
+    def __init__(self, file_path, table_name, connect=None, dialect="sqlite", pool_size=4, n_sample=1000):
+        super().__init__(file_path)
+        self.table_name = table_name
+        self.dialect = dialect
+        self.n_sample = n_sample
+        if connect is None:
+            connect = lambda: sqlite3.connect(file_path, check_same_thread=False)
+        self.pool = ConnectionPool(connect, size=pool_size)
+        self.sample = None
+        self.num_cols_list = []
+        self.text_cols_list = []
+        self.date_cols_list = []
+
+    @staticmethod
+    def list_tables(file_path):
+        """
+        Lists the tables of a SQLite database file.
+
+        Parameters:
+        file_path (str): Path to the SQLite database file.
+
+        Returns:
+        list: Names of the tables.
+        """
+        with sqlite3.connect(file_path) as connection:
+            rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name").fetchall()
+        return [row[0] for row in rows]
+
+    def query(self, sql, params=()):
+        """
+        Runs a query on the database and returns its result as a Pandas dataframe.
+
+        Parameters:
+        sql (str): Query to run.
+        params (tuple): Values bound to the placeholders of the query. Default is no values.
+
+        Returns:
+        pd.DataFrame: Result of the query.
+        """
+        rows, names = self.pool.query(sql, params)
+        return pd.DataFrame.from_records(rows, columns=names)
+
+    def query_row(self, sql, params=()):
+        """
+        Runs a query returning a single row and returns it as a tuple.
+        """
+        rows, _ = self.pool.query(sql, params)
+        return rows[0]
+
+    def close(self):
+        """
+        Closes the connections to the database.
+        """
+        self.pool.close()
+
+    def set_df(self):
+        """
+        Reads the first rows of the table to infer the type of each column. The table itself is never loaded.
+        """
+        if self.sample is not None:
+            print("Table schema already loaded.")
+            return
+
+        try:
+            self.sample = self.query(f"SELECT * FROM {quote(self.table_name)} LIMIT {int(self.n_sample)}")
+            print("Table schema loaded successfully from", self.table_name)
+        except Exception as e:
+            print(f"An error occurred while loading the table schema: {e}")
+            return
+
+        # Classify the columns like the CSV datasets, the aggregate queries only needing the numeric ones to be stored as numbers
+        self.cols_list = self.sample.columns.tolist()
+        self.schema = DatasetSchema.infer(self.sample.infer_objects())
+        self.num_cols_list = [
+            col_name for col_name in self.schema.get_num_cols()
+            if pd.api.types.is_numeric_dtype(self.schema.dtypes[col_name])
+        ]
+        self.text_cols_list = self.schema.get_text_cols()
+
+        # Like DateColumn.find_date_cols, fall back to the text columns when none of them holds dates
+        self.date_cols_list = self.schema.get_date_cols() or list(self.text_cols_list)
+
+    def is_df_none(self):
+        return self.sample is None or not self.cols_list
+
+    def set_data(self):
+        if self.sample is None:
+            raise ValueError("No table schema loaded. Use `set_df` method to load the schema first.")
+
+        table = quote(self.table_name)
+        columns = [quote(col_name) for col_name in self.cols_list]
+
+        # Update the number of rows and columns
+        self.n_rows = self.query_row(f"SELECT COUNT(*) FROM {table}")[0]
+        self.n_cols = len(self.cols_list)
+
+        # Compute the number of duplicated rows
+        n_distinct = self.query_row(f"SELECT COUNT(*) FROM (SELECT DISTINCT * FROM {table}) AS distinct_rows")[0]
+        self.n_duplicates = self.n_rows - n_distinct
+
+        # Compute the number of missing values and the size of each column in one scan
+        aggregates = []
+        for column in columns:
+            aggregates.append(f"SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)")
+            aggregates.append(f"SUM(LENGTH(CAST({column} AS TEXT)))")
+        values = self.query_row(f"SELECT {', '.join(aggregates)} FROM {table}") if columns else ()
+        col_missing = [value or 0 for value in values[0::2]]
+        col_sizes = [value or 0 for value in values[1::2]]
+        self.n_missing = sum(col_missing)
+
+        # Compute the number of numeric and text columns
+        self.n_num_cols = len(self.schema.get_num_cols())
+        self.n_text_cols = self.n_cols - self.n_num_cols
+
+        # Update the table with column information
+        self.table = pd.DataFrame({
+            "Column Name": self.cols_list,
+            "Data Type": [str(self.schema.dtypes[col_name]) for col_name in self.cols_list],
+            "Inferred Type": [self.schema.types[col_name] for col_name in self.cols_list],
+            "Number of Missing Values": col_missing,
+            "Size (Bytes)": col_sizes,
+        })
+
+    def get_page(self, page, page_size=10):
+        """
+        Reads a page of rows of the table.
+
+        Parameters:
+        page (int): Number of the page, starting at 0.
+        page_size (int): Number of rows per page. Default is 10.
+
+        Returns:
+        pd.DataFrame: Rows of the requested page, indexed by their row number.
+        """
+        rows = self.query(
+            f"SELECT * FROM {quote(self.table_name)} LIMIT {int(page_size)} OFFSET {int(page) * int(page_size)}"
+        )
+        rows.index = pd.RangeIndex(page * page_size, page * page_size + len(rows))
+        return rows
+
+    def get_n_pages(self, page_size):
+        return -(-self.n_rows // page_size)
+
+    def _predicate_count(self, name, column):
+        # SUM of a dialect specific predicate, counting the rows where it is true
+        predicate = DIALECTS[self.dialect][name].format(col=column)
+        return f"SUM(CASE WHEN {predicate} THEN 1 ELSE 0 END)"
+
+    def get_num_summary(self, col_name):
+        """
+        Computes the information displayed for a numeric column, with the same descriptions as NumericColumn.get_summary.
+
+        Parameters:
+        col_name (str): Name of the numeric column.
+
+        Returns:
+        pd.DataFrame: Dataframe with two columns: Description and Value.
+        """
+        table, column = quote(self.table_name), quote(col_name)
+        real = DIALECTS[self.dialect]["real"].format(col=column)
+        n_unique, n_missing, n_values, total, col_min, col_max, n_zeros, n_negatives = self.query_row(
+            f"SELECT COUNT(DISTINCT {column}), SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END), COUNT({column}), "
+            f"SUM({real}), MIN({column}), MAX({column}), "
+            f"SUM(CASE WHEN {column} = 0 THEN 1 ELSE 0 END), SUM(CASE WHEN {column} < 0 THEN 1 ELSE 0 END) "
+            f"FROM {table}"
+        )
+
+        # The values are summed as floats so large integers cannot overflow, and the variance is computed in a
+        # second pass from the deviations to the mean, which avoids the cancellation of the sum of squares formula
+        col_mean = float(total) / n_values if n_values else math.nan
+        col_std = math.nan
+        if n_values > 1:
+            param = DIALECTS[self.dialect]["param"]
+            (squares,) = self.query_row(
+                f"SELECT SUM(({real} - {param}) * ({real} - {param})) FROM {table}", (col_mean, col_mean)
+            )
+            col_std = math.sqrt(float(squares) / (n_values - 1))
+
+        # Only the one or two middle values are transferred for the median
+        col_median = math.nan
+        if n_values:
+            middle, _ = self.pool.query(
+                f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column} "
+                f"LIMIT {2 - n_values % 2} OFFSET {(n_values - 1) // 2}"
+            )
+            col_median = sum(row[0] for row in middle) / len(middle)
+
+        summary_df = pd.DataFrame({
+            "Description": ["Number of Unique Values", "Number of Missing Values", "Average Value",
+                            "Standard Deviation", "Minimum Value", "Maximum Value", "Median Value",
+                            "Number of Zeros", "Number of Negatives"],
+            "Value": [n_unique, n_missing or 0, col_mean, col_std, col_min, col_max, col_median,
+                      n_zeros or 0, n_negatives or 0]
+        })
+        summary_df["Value"] = summary_df["Value"].apply(lambda x: f"{x:.2f}" if x is not None else x)
+        return summary_df
+
+    def get_text_summary(self, col_name):
+        """
+        Computes the information displayed for a text column, with the same descriptions as TextColumn.get_summary.
+
+        Parameters:
+        col_name (str): Name of the text column.
+
+        Returns:
+        pd.DataFrame: Dataframe with two columns: Description and Value.
+        """
+        table, column = quote(self.table_name), quote(col_name)
+        values = self.query_row(
+            f"SELECT COUNT(DISTINCT {column}), SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END), "
+            f"SUM(CASE WHEN {column} = '' THEN 1 ELSE 0 END), {self._predicate_count('whitespace', column)}, "
+            f"SUM(CASE WHEN {column} = LOWER({column}) AND {column} <> UPPER({column}) THEN 1 ELSE 0 END), "
+            f"SUM(CASE WHEN {column} = UPPER({column}) AND {column} <> LOWER({column}) THEN 1 ELSE 0 END), "
+            f"{self._predicate_count('alpha', column)}, {self._predicate_count('digit', column)} "
+            f"FROM {table}"
+        )
+        frequent = self.get_frequent(col_name, end=1)
+        mode = frequent["value"].iloc[0] if len(frequent) else None
+
+        return pd.DataFrame(data={'Description': ['Number of Unique Values',
+                                                  'Number of Rows with Missing Values',
+                                                  'Number of Empty Rows',
+                                                  'Number of Rows with Only Whitespace',
+                                                  'Number of Rows with Only Lowercases',
+                                                  'Number of Rows with Only Uppercases',
+                                                  'Number of Rows with Only Alphabet',
+                                                  'Number of Rows with Only Digits',
+                                                  'Mode Value'],
+                                  'Value': [value or 0 for value in values] + [mode]},
+                            dtype='object').astype(str)
+
+    def get_date_summary(self, col_name):
+        """
+        Computes the information displayed for a datetime column, with the same descriptions as DateColumn.get_summary.
+
+        Parameters:
+        col_name (str): Name of the datetime column.
+
+        Returns:
+        pd.DataFrame: Dataframe with two columns: Description and Value.
+        """
+        table, column = quote(self.table_name), quote(col_name)
+        values = self.query_row(
+            f"SELECT COUNT(DISTINCT {column}), SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END), "
+            f"MIN({column}), MAX({column}), {self._predicate_count('weekend', column)}, "
+            f"{self._predicate_count('weekday', column)}, {self._predicate_count('future', column)}, "
+            f"{self._predicate_count('date_1900', column)}, {self._predicate_count('digit', column)} "
+            f"FROM {table}"
+        )
+
+        return pd.DataFrame({
+            'Description': ['Number of Unique Values', 'Number of Missing Values', 'Min Value', 'Max Value',
+                            'Number of Weekend Dates', 'Number of Weekday Dates', 'Number of Future Dates',
+                            "Number of '1900-01-01' Dates", 'Number of Numeric Dates'],
+            'Value': [value if value is not None else 0 for value in values]
+        }).astype(str)
+
+    def get_frequent(self, col_name, end=20):
+        """
+        Computes the most frequent values of a column with a GROUP BY query.
+
+        Parameters:
+        col_name (str): Name of the column.
+        end (int): Number of values to be returned. Default is 20.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns value, occurrence and percentage.
+        """
+        table, column = quote(self.table_name), quote(col_name)
+        frequent = self.query(
+            f"SELECT {column} AS value, COUNT(*) AS occurrence FROM {table} WHERE {column} IS NOT NULL "
+            f"GROUP BY {column} ORDER BY occurrence DESC, value LIMIT {int(end)}"
+        )
+        frequent["percentage"] = frequent["occurrence"] / max(self.n_rows, 1) * 100
+        return frequent
+
+    def get_histogram(self, col_name, bins=20):
+        """
+        Computes the number of values of a numeric column falling in each of bins equal-width bins.
+
+        Parameters:
+        col_name (str): Name of the numeric column.
+        bins (int): Number of bins. Default is 20.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns bin_start, bin_end and count.
+        """
+        table, column = quote(self.table_name), quote(col_name)
+        col_min, col_max = self.query_row(f"SELECT MIN({column}), MAX({column}) FROM {table}")
+        if col_min is None:
+            return pd.DataFrame(columns=["bin_start", "bin_end", "count"])
+
+        # The bounds are bound as parameters, the values returned by some drivers (Decimal, ...) not being SQL literals
+        col_min, col_max = float(col_min), float(col_max)
+        width = (col_max - col_min) / bins or 1.0
+        param = DIALECTS[self.dialect]["param"]
+        real = DIALECTS[self.dialect]["real"].format(col=column)
+        bin_expr = DIALECTS[self.dialect]["floor"].format(expr=f"({real} - {param}) / {param}")
+        counts = self.query(
+            f"SELECT {bin_expr} AS bin, COUNT(*) AS count FROM {table} WHERE {column} IS NOT NULL GROUP BY bin",
+            (col_min, width),
+        )
+
+        # The maximum value falls on the right edge of the last bin
+        counts["bin"] = counts["bin"].astype(int).clip(upper=bins - 1)
+        counts = counts.groupby("bin", as_index=False)["count"].sum()
+        counts["bin_start"] = col_min + counts["bin"] * width
+        counts["bin_end"] = counts["bin_start"] + width
+        return counts[["bin_start", "bin_end", "count"]]
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+from common.column_cache import COLUMN_CACHE
+from common.fingerprint import dataset_fingerprint
+
+
+class CorrelationMatrix:
+    """
+    --------------------
+    Description
+    --------------------
+    -> CorrelationMatrix (class): Class that accumulates the pairwise Pearson correlation of numeric columns block
+    by block, only keeping sums of shape (n_cols, n_cols) in memory
+
+    --------------------
+    Attributes
+    --------------------
+    -> cols_list (list): List of columns names of the numeric columns (mandatory)
+    -> n_rows (int): Number of rows accumulated so far (default set to 0)
+    -> shift (np.ndarray): Value subtracted from each column to keep the sums accurate (default set to None)
+    -> n_pairs (np.ndarray): Number of rows where both columns are present (default set to zeros)
+    -> sum_x (np.ndarray): Sum of the first column over the rows where both columns are present (default set to zeros)
+    -> sum_xx (np.ndarray): Sum of the squared first column over the same rows (default set to zeros)
+    -> sum_xy (np.ndarray): Sum of the products of both columns over the same rows (default set to zeros)
+    """
+    def __init__(self, cols_list):
+        self.cols_list = list(cols_list)
+        self.n_rows = 0
+        self.shift = None
+        n_cols = len(self.cols_list)
+        self.n_pairs = np.zeros((n_cols, n_cols))
+        self.sum_x = np.zeros((n_cols, n_cols))
+        self.sum_xx = np.zeros((n_cols, n_cols))
+        self.sum_xy = np.zeros((n_cols, n_cols))
+
+    @classmethod
+    def from_df(cls, df, cols_list, method="pearson", chunk_size=100_000):
+        """
+        Computes the correlation matrix of the numeric columns of a dataframe.
+
+        For the Spearman method each column is ranked once over all its non-missing values before accumulating the
+        Pearson correlation of the ranks. When values are missing this differs slightly from ranking every pair of
+        columns over their common rows, which would need a sort per pair.
+
+        Parameters:
+        df (pd.DataFrame): Dataframe to analyse.
+        cols_list (list): Names of the numeric columns to correlate.
+        method (str): 'pearson' or 'spearman'. Default is 'pearson'.
+        chunk_size (int): Number of rows multiplied at once. Default is 100,000.
+
+        Returns:
+        CorrelationMatrix: Correlation accumulated over all the rows of df.
+        """
+        if method not in ("pearson", "spearman"):
+            raise ValueError(f"Unknown correlation method: {method}")
+
+        # Numbers stored as text are converted like NumericColumn does
+        values = df[cols_list].apply(
+            lambda serie: serie if pd.api.types.is_numeric_dtype(serie) else pd.to_numeric(serie, errors="coerce")
+        )
+        if method == "spearman":
+            values = values.rank(method="average")
+
+        correlation = cls(cols_list)
+        for start in range(0, len(values), chunk_size):
+            correlation.update(values.iloc[start:start + chunk_size])
+        return correlation
+
+    def update(self, block):
+        """
+        Adds the rows of a block, for instance a chunk returned by pd.read_csv(..., chunksize=...), handling missing
+        values pairwise.
+
+        Parameters:
+        block (pd.DataFrame): Rows to add, with the numeric columns of cols_list.
+
+        Returns:
+        None
+        """
+        values = block[self.cols_list].to_numpy(dtype=np.float64, na_value=np.nan)
+        present = ~np.isnan(values)
+
+        if self.shift is None:
+            with np.errstate(invalid="ignore"):
+                self.shift = np.nan_to_num(np.nanmean(values, axis=0)) if len(values) else np.zeros(values.shape[1])
+
+        centered = np.where(present, values - self.shift, 0.0)
+        weights = present.astype(np.float64)
+
+        # Each product sums over the rows where both columns of a pair are present
+        self.n_pairs += weights.T @ weights
+        self.sum_x += centered.T @ weights
+        self.sum_xx += (centered ** 2).T @ weights
+        self.sum_xy += centered.T @ centered
+        self.n_rows += len(values)
+
+    def get_matrix(self):
+        """
+        Computes the correlation matrix from the accumulated sums.
+
+        Returns:
+        pd.DataFrame: Square correlation matrix indexed by column names, NaN where a pair has less than 2 common
+        rows or a constant column.
+        """
+        n_pairs = self.n_pairs
+        sum_y = self.sum_x.T
+        sum_yy = self.sum_xx.T
+        covariance = n_pairs * self.sum_xy - self.sum_x * sum_y
+        variance_x = n_pairs * self.sum_xx - self.sum_x ** 2
+        variance_y = n_pairs * sum_yy - sum_y ** 2
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            matrix = covariance / np.sqrt(variance_x * variance_y)
+        matrix[(n_pairs < 2) | (variance_x <= 0) | (variance_y <= 0)] = np.nan
+        matrix = np.clip(matrix, -1.0, 1.0)
+
+        return pd.DataFrame(matrix, index=self.cols_list, columns=self.cols_list)
+
+
+def get_correlation(df, cols_list, method="pearson"):
+    """
+    Returns the correlation matrix of the numeric columns of df, cached per dataset and method.
+
+    Parameters:
+    df (pd.DataFrame): Dataframe to analyse.
+    cols_list (list): Names of the numeric columns to correlate, usually NumericColumn.cols_list.
+    method (str): 'pearson' or 'spearman'. Default is 'pearson'.
+
+    Returns:
+    pd.DataFrame: Square correlation matrix indexed by column names.
+    """
+    key = (dataset_fingerprint(df), tuple(cols_list), method, "correlation")
+    return COLUMN_CACHE.get_or_compute(
+        key,
+        lambda: CorrelationMatrix.from_df(df, list(cols_list), method=method).get_matrix(),
+    )
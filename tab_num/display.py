@@ -1,41 +1,151 @@
 import streamlit as st
+from common.charts import get_heatmap
+from common.executor import cancel_others, render_when_ready, submit, submit_after
+from common.fingerprint import dataset_fingerprint
+from tab_num.correlation import get_correlation
 from tab_num.logics import NumericColumn
+from tab_num.outliers import THRESHOLDS, get_outliers
 
-def display_tab_num_content(file_path=None, df=None):
+def display_tab_num_content(file_path=None, df=None, store=None, schema=None, dataset_key=None):
 
-    # Instantiate the NumericColumn class based on file_path or df
-    if file_path:
-        numeric_col = NumericColumn(file_path=file_path)
-    elif df is not None:
-        numeric_col = NumericColumn(df=df)
+    if store is not None:
+        # A dataset loaded column by column lists its numeric columns from its schema, each one being parsed when first explored
+        numeric_col = None
+        schema = store.schema
+        cols_list = schema.get_num_cols()
+        dataset_key = store.get_key()
     else:
-        st.warning("Please upload a CSV file or provide a dataframe to analyze numeric columns.")
-        return
+        # Instantiate the NumericColumn class based on file_path or df, unless it was done in a previous rerun
+        numeric_col = st.session_state.get("num_column")
+        if numeric_col is None or numeric_col.file_path != file_path or (df is not None and numeric_col.df is not df):
+            if file_path:
+                numeric_col = NumericColumn(file_path=file_path)
+            elif df is not None:
+                numeric_col = NumericColumn(df=df, schema=schema, dataset_key=dataset_key)
+            else:
+                st.warning("Please upload a CSV file or provide a dataframe to analyze numeric columns.")
+                return
 
-    # Find all numeric columns
-    numeric_col.find_num_cols()
+            # Find all numeric columns
+            numeric_col.find_num_cols()
+            st.session_state["num_column"] = numeric_col
+
+        # The schema and fingerprint passed by the dataset are reused on every rerun, a file being classified and hashed once
+        cols_list = numeric_col.cols_list
+        schema = numeric_col.get_schema()
+        if numeric_col.dataset_key is None:
+            numeric_col.dataset_key = dataset_fingerprint(numeric_col.df)
+        dataset_key = numeric_col.dataset_key
+
+    # Computations are owned by the session, so changing the selected column only cancels the ones of this session
+    session_id = st.session_state.get("session_id")
+
+    def submit_on_columns(key, fn, cols, *args):
+        # Runs fn on the dataframe in the background, parsing the columns first for a dataset loaded column by column
+        if store is None:
+            return submit(key, fn, numeric_col.df, *args, session_id=session_id)
+        return submit(key, _on_columns, store, cols, fn, *args, session_id=session_id)
 
     # Display a select box to choose a numeric column
-    selected_col = st.selectbox("Which numeric column do you want to explore?", numeric_col.cols_list)
+    selected_col = st.selectbox("Which numeric column do you want to explore?", cols_list)
+
+    blocks = []
 
     if selected_col:
-        # Set the selected column data
-        numeric_col.set_data(selected_col)
+        # Cancel the computations still pending for a previously selected column
+        cancel_others(dataset_key, "num", selected_col, session_id)
+
+        # Schedule the selected column data and each block of results in the background
+        key = (dataset_key, "num", selected_col)
+        column = submit_on_columns(key + ("serie",), _load_column, [selected_col], selected_col, schema, dataset_key)
+        summary = submit_after(key + ("summary",), column, _compute_summary, session_id=session_id)
+        histogram = submit_after(key + ("histogram",), column, _compute_histogram, session_id=session_id)
+        frequent = submit_after(key + ("frequent",), column, _compute_frequent, session_id=session_id)
 
         # Display an Expander container with results
         with st.expander("Numeric Column Analysis Results"):
             st.subheader(f"Summary of {selected_col}")
-            summary_df = numeric_col.get_summary()
-            st.table(summary_df)
+            summary_slot = st.empty()
 
             st.subheader(f"Histogram of {selected_col}")
-            numeric_col.set_histogram()
-            st.altair_chart(numeric_col.histogram, use_container_width=True)
+            histogram_slot = st.empty()
 
             st.subheader(f"Most Frequent Values in {selected_col}")
-            numeric_col.set_frequent()
-            st.write(numeric_col.frequent)
+            frequent_slot = st.empty()
+
+        blocks += [
+            (summary_slot, summary, st.table),
+            (histogram_slot, histogram, lambda chart: st.altair_chart(chart, use_container_width=True)),
+            (frequent_slot, frequent, st.write),
+        ]
+
+    if len(cols_list) > 1:
+        # Display an Expander container with the correlation between all numeric columns
+        with st.expander("Correlation Matrix"):
+            method = st.radio("Select correlation method:", ["pearson", "spearman"], horizontal=True)
+
+            # A dataset loaded column by column only parses all its numeric columns on request
+            if store is None or st.checkbox("Parse all numeric columns to compute their correlation"):
+                correlation = submit_on_columns(
+                    (dataset_key, "correlation", method), get_correlation, cols_list, cols_list, method,
+                )
+                correlation_slot = st.empty()
+                blocks.append(
+                    (correlation_slot, correlation, lambda matrix: st.altair_chart(get_heatmap(matrix), use_container_width=True))
+                )
+
+    if cols_list:
+        # Display an Expander container with the outliers of the selected column or of all numeric columns
+        with st.expander("Outliers"):
+            methods = {"IQR Fences": "iqr", "Z-Score": "zscore", "Median Absolute Deviation": "mad"}
+            method = methods[st.radio("Select outlier method:", list(methods), horizontal=True)]
+            threshold = st.number_input(
+                "Threshold (multiple of the spread):", min_value=0.1, value=THRESHOLDS[method], step=0.5, key=f"outlier_threshold_{method}"
+            )
+            scope = st.radio("Columns to check:", ["Selected column", "All numeric columns"], horizontal=True)
+            outlier_cols = cols_list if scope == "All numeric columns" or not selected_col else [selected_col]
+            outliers = submit_on_columns(
+                (dataset_key, "outliers", tuple(outlier_cols), method, threshold),
+                get_outliers, outlier_cols, outlier_cols, method, threshold,
+            )
+
+            st.write("**Outliers per Column**")
+            outlier_counts_slot = st.empty()
+            st.write("**Sample of Rows with Outliers**")
+            outlier_rows_slot = st.empty()
+
+        blocks += [
+            (outlier_counts_slot, outliers, lambda detector: st.dataframe(detector.get_counts())),
+            (outlier_rows_slot, outliers, lambda detector: st.dataframe(
+                detector.get_rows(numeric_col.df if store is None else store.get_columns(outlier_cols))
+            )),
+        ]
+
+    # Render each block as soon as its result is ready
+    render_when_ready(blocks)
+
+def _on_columns(store, cols_list, fn, *args):
+    # Parses the columns of a dataset loaded column by column, then calls fn on them
+    return fn(store.get_columns(cols_list), *args)
+
+def _load_column(df, col_name, schema=None, dataset_key=None):
+    numeric_col = NumericColumn(df=df, schema=schema, dataset_key=dataset_key)
+    numeric_col.find_num_cols()
+    numeric_col.set_serie(col_name)
+    return numeric_col
+
+def _compute_summary(numeric_col):
+    numeric_col.set_stats()
+    return numeric_col.get_summary()
+
+def _compute_histogram(numeric_col):
+    numeric_col.set_histogram()
+    return numeric_col.histogram
+
+def _compute_frequent(numeric_col):
+    numeric_col.set_frequent()
+    return numeric_col.frequent
 
 if __name__ == '__main__':
     display_tab_num_content()
-    
\ No newline at end of file
+    
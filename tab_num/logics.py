@@ -1,6 +1,10 @@
+import numpy as np
 import pandas as pd
 import altair as alt
 import streamlit as st
+from common.column_cache import get_null_mask, get_sorted, get_value_counts
+from common.fingerprint import dataset_fingerprint
+from common.schema import NUMERIC_TEXT, get_schema
 
 
 class NumericColumn:
@@ -15,6 +19,8 @@ class NumericColumn:
     --------------------
     -> file_path (str): Path to the uploaded CSV file (optional)
     -> df (pd.Dataframe): Pandas dataframe (optional)
+    -> schema (DatasetSchema): Types inferred for the columns of df, passed by the dataset that loaded it or inferred once (optional)
+    -> dataset_key (str): Fingerprint of df used to share cached results of its columns, passed by the dataset or computed once (optional)
     -> cols_list (list): List of columns names of dataset that are numeric type (default set to empty list)
     -> serie (pd.Series): Pandas serie where the content of a column has been loaded (default set to None)
     -> n_unique (int): Number of unique value of a serie (default set to None)
@@ -30,9 +36,11 @@ class NumericColumn:
     -> frequent (pd.DataFrame): Datframe containing the most frequest value of a serie (default set to empty)
 
     """
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, schema=None, dataset_key=None):
         self.file_path = file_path
         self.df = df
+        self.schema = schema
+        self.dataset_key = dataset_key
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -59,26 +67,47 @@ class NumericColumn:
             if uploaded_file:
                 self.df = pd.read_csv(uploaded_file)
 
-        # Find columns of numeric data type
+        # Find numeric columns, including numbers stored as text, from the schema shared by all tabs
         if self.df is not None:
-            numeric_columns = self.df.select_dtypes(include=['float64', 'int64']).columns
-            self.cols_list = list(numeric_columns)
+            self.cols_list = self.get_schema().get_num_cols()
 
     def set_data(self, col_name):
         
         if self.df is not None and col_name in self.cols_list:
+            self.set_serie(col_name)
+            self.set_stats()
+
+    def set_serie(self, col_name):
+        """
+        Loads the selected column into self.serie without computing any information
+        """
+        if self.df is not None and col_name in self.cols_list:
+            if self.dataset_key is None:
+                self.dataset_key = dataset_fingerprint(self.df)
             self.serie = self.df[col_name]
+            if self.get_schema().types[col_name] == NUMERIC_TEXT:
+                self.convert_serie_to_num()
 
-            # Compute requested information from self.serie
-            self.n_unique = self.serie.nunique()
-            self.n_missing = self.serie.isna().sum()
-            self.col_mean = self.serie.mean()
-            self.col_std = self.serie.std()
-            self.col_min = self.serie.min()
-            self.col_max = self.serie.max()
-            self.col_median = self.serie.median()
-            self.n_zeros = (self.serie == 0).sum()
-            self.n_negatives = (self.serie < 0).sum()
+    def set_stats(self):
+        """
+        Computes all the requested information from self.serie
+        """
+        if self.serie is not None:
+            self.set_unique()
+            self.set_missing()
+            self.set_mean()
+            self.set_std()
+            self.set_min()
+            self.set_max()
+            self.set_median()
+            self.set_zeros()
+            self.set_negatives()
+
+    def get_sorted(self):
+        """
+        Returns the non-missing values of the column sorted in ascending order, shared through the column cache
+        """
+        return get_sorted(self.serie, self.dataset_key, "num")
 
     def convert_serie_to_num(self):
         
@@ -89,6 +118,14 @@ class NumericColumn:
             except ValueError:
                 st.warning("Conversion to numeric type failed. Check the data in the series.")
 
+    def get_schema(self):
+        """
+        Returns the schema of self.df, inferring it only if the dataset did not pass one
+        """
+        if self.schema is None:
+            self.schema = get_schema(self.df)
+        return self.schema
+
     def is_serie_none(self):
         
         if self.serie is not None and not self.serie.empty:
@@ -101,7 +138,7 @@ class NumericColumn:
         Computes all the unique values in the column
         """
         if self.serie is not None and not self.serie.empty:
-            self.n_unique = self.serie.nunique()
+            self.n_unique = len(get_value_counts(self.serie, self.dataset_key, "num"))
 
     def set_missing(self):
         """
@@ -109,12 +146,13 @@ class NumericColumn:
         """
        
         if self.serie is not None and not self.serie.empty:
-            self.n_missing = self.serie.isna().sum()  
+            self.n_missing = get_null_mask(self.serie, self.dataset_key, "num").sum()
 
     def set_zeros(self):
         
         if self.serie is not None and not self.serie.empty:
-            self.n_zeros = (self.serie == 0).sum()
+            values = self.get_sorted()
+            self.n_zeros = np.searchsorted(values, 0, side="right") - np.searchsorted(values, 0, side="left")
         
     def set_negatives(self):
         """
@@ -122,7 +160,7 @@ class NumericColumn:
         """
        
         if self.serie is not None and not self.serie.empty:
-            self.n_negatives = (self.serie < 0).sum()   
+            self.n_negatives = np.searchsorted(self.get_sorted(), 0, side="left")
 
     def set_mean(self):
         """
@@ -145,7 +183,8 @@ class NumericColumn:
         Computes the minimum value of the column
         """
         if self.serie is not None and not self.serie.empty:
-            self.col_min = self.serie.min() 
+            values = self.get_sorted()
+            self.col_min = values[0] if len(values) > 0 else np.nan
 
     def set_max(self):
         """
@@ -153,7 +192,8 @@ class NumericColumn:
         """
        
         if self.serie is not None and not self.serie.empty:
-            self.col_max = self.serie.max()  
+            values = self.get_sorted()
+            self.col_max = values[-1] if len(values) > 0 else np.nan
 
     def set_median(self):
         """
@@ -161,7 +201,14 @@ class NumericColumn:
         """
         
         if self.serie is not None and not self.serie.empty:
-            self.col_median = self.serie.median()
+            values = self.get_sorted()
+            n_values = len(values)
+            if n_values == 0:
+                self.col_median = np.nan
+            elif n_values % 2 == 1:
+                self.col_median = float(values[n_values // 2])
+            else:
+                self.col_median = (float(values[n_values // 2 - 1]) + float(values[n_values // 2])) / 2
 
     def set_histogram(self):
         
@@ -170,7 +217,7 @@ class NumericColumn:
         """
         
         if self.serie is not None and not self.serie.empty:
-            chart = alt.Chart(self.df).mark_bar().encode(
+            chart = alt.Chart(self.serie.to_frame()).mark_bar().encode(
                 alt.X(f"{self.serie.name}:Q", bin=alt.Bin(maxbins=20)),
                 y="count()",
             ).properties(
@@ -182,7 +229,7 @@ class NumericColumn:
     def set_frequent(self, end=20):
         
         if self.serie is not None and not self.serie.empty:
-            frequent_values = self.serie.value_counts().reset_index()
+            frequent_values = get_value_counts(self.serie, self.dataset_key, "num").reset_index()
             frequent_values.columns = ["value", "occurrence"]
             frequent_values["percentage"] = (frequent_values["occurrence"] / len(self.serie)) * 100
             self.frequent = frequent_values.head(end)
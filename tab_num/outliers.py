@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+from common.column_cache import COLUMN_CACHE
+from common.fingerprint import dataset_fingerprint
+
+# Default threshold of each method: multiple of the IQR beyond the quartiles, of the standard deviation from the mean,
+# and of the scaled MAD from the median
+THRESHOLDS = {"iqr": 1.5, "zscore": 3.0, "mad": 3.5}
+
+# Ratio between the standard deviation and the MAD of normally distributed values
+MAD_SCALE = 1.4826
+
+
+def get_numeric_block(df, cols_list):
+    """
+    Converts the numeric columns of a dataframe into a 2-D float array, numbers stored as text being converted like
+    NumericColumn does and missing values becoming NaN.
+
+    Parameters:
+    df (pd.DataFrame): Dataframe to convert.
+    cols_list (list): Names of the numeric columns.
+
+    Returns:
+    np.ndarray: Array of shape (n_rows, len(cols_list)).
+    """
+    values = df[cols_list].apply(
+        lambda serie: serie if pd.api.types.is_numeric_dtype(serie) else pd.to_numeric(serie, errors="coerce")
+    )
+    return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def get_sorted_quantiles(sorted_values, counts, quantiles):
+    """
+    Computes quantiles of every column at once from columns sorted with their missing values last, interpolating
+    linearly between the closest ranks like np.nanquantile.
+
+    Parameters:
+    sorted_values (np.ndarray): Array of shape (n_rows, n_cols) sorted along axis 0, NaN last.
+    counts (np.ndarray): Number of non-missing values of each column.
+    quantiles (list): Quantiles to compute, between 0 and 1.
+
+    Returns:
+    np.ndarray: Array of shape (len(quantiles), n_cols), NaN for the columns without any value.
+    """
+    if len(sorted_values) == 0:
+        return np.full((len(quantiles), sorted_values.shape[1]), np.nan)
+
+    positions = np.outer(quantiles, np.maximum(counts - 1, 0))
+    below = np.floor(positions).astype(np.int64)
+    above = np.minimum(below + 1, np.maximum(counts - 1, 0))
+    fraction = positions - below
+
+    lower = np.take_along_axis(sorted_values, below, axis=0)
+    upper = np.take_along_axis(sorted_values, above, axis=0)
+    result = lower + (upper - lower) * fraction
+    result[:, counts == 0] = np.nan
+    return result
+
+
+class OutlierDetector:
+    """
+    --------------------
+    Description
+    --------------------
+    -> OutlierDetector (class): Class that flags the outliers of numeric columns with IQR fences, z-scores or the
+    median absolute deviation (MAD), computing the bounds of all the columns with batched array operations
+
+    --------------------
+    Attributes
+    --------------------
+    -> cols_list (list): List of columns names of the numeric columns (mandatory)
+    -> method (str): 'iqr', 'zscore' or 'mad' (default set to 'iqr')
+    -> threshold (float): Multiple of the spread beyond which a value is an outlier (default set to the default of the method)
+    -> lower (np.ndarray): Lower bound of each column (default set to None)
+    -> upper (np.ndarray): Upper bound of each column (default set to None)
+    -> n_values (np.ndarray): Number of non-missing values of each column (default set to zeros)
+    -> counts (np.ndarray): Number of outliers of each column (default set to zeros)
+    -> max_rows (int): Maximum number of row positions kept to sample the rows having outliers (default set to 100)
+    -> n_outlier_rows (int): Number of rows having at least one outlier (default set to 0)
+    -> row_positions (np.ndarray): Uniform reservoir sample of at most max_rows positions of the rows having at least one outlier (default set to empty array)
+    -> rng (np.random.Generator): Random generator of the reservoir sampling (default set to seeded with random_state 0)
+    """
+    def __init__(self, cols_list, method="iqr", threshold=None, max_rows=100, random_state=0):
+        if method not in THRESHOLDS:
+            raise ValueError(f"Unknown outlier method: {method}")
+
+        self.cols_list = list(cols_list)
+        self.method = method
+        self.threshold = THRESHOLDS[method] if threshold is None else float(threshold)
+        self.lower = None
+        self.upper = None
+        self.n_values = np.zeros(len(self.cols_list), dtype=np.int64)
+        self.counts = np.zeros(len(self.cols_list), dtype=np.int64)
+        self.max_rows = max_rows
+        self.n_outlier_rows = 0
+        self.row_positions = np.array([], dtype=np.int64)
+        self.rng = np.random.default_rng(random_state)
+
+    @classmethod
+    def from_df(cls, df, cols_list, method="iqr", threshold=None, batch_size=16, chunk_size=100_000, max_rows=100):
+        """
+        Flags the outliers of the numeric columns of a dataframe in two passes: the bounds are computed from the
+        columns sorted batch_size at a time, then the rows are compared with them chunk_size at a time.
+
+        Parameters:
+        df (pd.DataFrame): Dataframe to analyse.
+        cols_list (list): Names of the numeric columns to check.
+        method (str): 'iqr', 'zscore' or 'mad'. Default is 'iqr'.
+        threshold (float): Multiple of the spread beyond which a value is an outlier. Default is the default of the method.
+        batch_size (int): Number of columns sorted at once. Default is 16.
+        chunk_size (int): Number of rows compared at once. Default is 100,000.
+        max_rows (int): Maximum number of offending rows kept for get_rows. Default is 100.
+
+        Returns:
+        OutlierDetector: Bounds, counts and a sample of the offending rows of the columns.
+        """
+        detector = cls(cols_list, method, threshold, max_rows=max_rows)
+        values = get_numeric_block(df, detector.cols_list)
+        detector.set_bounds(values, batch_size)
+        for start in range(0, len(values), chunk_size):
+            detector.update(values[start:start + chunk_size], start)
+        return detector
+
+    def set_bounds(self, values, batch_size=16):
+        """
+        Computes the lower and upper bounds of every column from a 2-D block of values.
+
+        Parameters:
+        values (np.ndarray): Array of shape (n_rows, len(cols_list)), missing values being NaN.
+        batch_size (int): Number of columns sorted at once, bounding the extra memory used. Default is 16.
+
+        Returns:
+        None
+        """
+        n_cols = values.shape[1]
+        self.lower = np.full(n_cols, np.nan)
+        self.upper = np.full(n_cols, np.nan)
+        self.n_values = (~np.isnan(values)).sum(axis=0)
+
+        for start in range(0, n_cols, batch_size):
+            batch = slice(start, start + batch_size)
+            self.lower[batch], self.upper[batch] = self.get_batch_bounds(values[:, batch], self.n_values[batch])
+
+    def get_batch_bounds(self, values, counts):
+        # Bounds of a batch of columns, the quantiles of all of them coming from a single sort
+        with np.errstate(invalid="ignore", divide="ignore"):
+            if self.method == "zscore":
+                center = np.nanmean(values, axis=0) if len(values) else np.full(values.shape[1], np.nan)
+                spread = np.nanstd(values, axis=0, ddof=1) if len(values) else np.full(values.shape[1], np.nan)
+                return center - self.threshold * spread, center + self.threshold * spread
+
+            sorted_values = np.sort(values, axis=0)
+            if self.method == "iqr":
+                q1, q3 = get_sorted_quantiles(sorted_values, counts, [0.25, 0.75])
+                iqr = q3 - q1
+                return q1 - self.threshold * iqr, q3 + self.threshold * iqr
+
+            median = get_sorted_quantiles(sorted_values, counts, [0.5])[0]
+            deviations = np.sort(np.abs(values - median), axis=0)
+            mad = get_sorted_quantiles(deviations, counts, [0.5])[0] * MAD_SCALE
+            return median - self.threshold * mad, median + self.threshold * mad
+
+    def update(self, block, offset=0):
+        """
+        Counts the outliers of a block of rows and keeps a uniform sample of the positions of the rows having at least
+        one with reservoir sampling, so the memory used stays bounded by max_rows whatever the number of outliers.
+
+        Parameters:
+        block (np.ndarray): Array of shape (rows, len(cols_list)).
+        offset (int): Position of the first row of the block in the dataset. Default is 0.
+
+        Returns:
+        None
+        """
+        # Missing values and columns without bounds compare as False
+        with np.errstate(invalid="ignore"):
+            flags = (block < self.lower) | (block > self.upper)
+        self.counts += flags.sum(axis=0)
+        positions = np.flatnonzero(flags.any(axis=1)) + offset
+
+        # The first rows fill the reservoir, then each following row replaces a random slot with probability
+        # max_rows / rows seen. The slots are drawn for the whole block at once, a later row winning a shared slot.
+        n_fill = min(len(positions), self.max_rows - len(self.row_positions))
+        if n_fill > 0:
+            self.row_positions = np.concatenate((self.row_positions, positions[:n_fill]))
+        seen = self.n_outlier_rows + n_fill + np.arange(len(positions) - n_fill)
+        slots = self.rng.integers(0, seen + 1) if len(seen) else seen
+        kept = slots < self.max_rows
+        self.row_positions[slots[kept]] = positions[n_fill:][kept]
+        self.n_outlier_rows += len(positions)
+
+    @property
+    def nbytes(self):
+        """
+        Memory used by the bounds, counts and row positions of the detector, in bytes, so the column cache can
+        account for it.
+        """
+        arrays = [self.lower, self.upper, self.n_values, self.counts, self.row_positions]
+        return sum(array.nbytes for array in arrays if array is not None)
+
+    def get_counts(self):
+        """
+        Formats the bounds and number of outliers of each column as a Pandas dataframe.
+
+        Returns:
+        pd.DataFrame: Dataframe with the columns Column Name, Lower Bound, Upper Bound, Number of Outliers and
+        Percentage, sorted by decreasing number of outliers.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percentage = np.where(self.n_values > 0, self.counts / np.maximum(self.n_values, 1) * 100, 0.0)
+        counts = pd.DataFrame({
+            "Column Name": self.cols_list,
+            "Lower Bound": self.lower,
+            "Upper Bound": self.upper,
+            "Number of Outliers": self.counts,
+            "Percentage": percentage,
+        })
+        return counts.sort_values("Number of Outliers", ascending=False, kind="stable").reset_index(drop=True)
+
+    def get_rows(self, df, n_rows=100, random_state=0):
+        """
+        Returns a uniform sample of the rows having at least one outlier, with the columns they are outliers in,
+        drawn from the reservoir kept by update.
+
+        Parameters:
+        df (pd.DataFrame): Dataframe the detector was computed from.
+        n_rows (int): Maximum number of rows returned, at most max_rows. Default is 100.
+        random_state (int): Seed of the sampling. Default is 0.
+
+        Returns:
+        pd.DataFrame: Sampled rows, in the order of the dataset, with an added Outlier Columns column.
+        """
+        positions = np.sort(self.row_positions)
+        if len(positions) > n_rows:
+            rng = np.random.default_rng(random_state)
+            positions = np.sort(rng.choice(positions, n_rows, replace=False))
+
+        rows = df.iloc[positions]
+        with np.errstate(invalid="ignore"):
+            values = get_numeric_block(rows, self.cols_list)
+            flags = (values < self.lower) | (values > self.upper)
+        names = np.array(self.cols_list, dtype=object)
+        outlier_cols = [", ".join(map(str, names[row_flags])) for row_flags in flags]
+        return pd.concat([rows, pd.Series(outlier_cols, index=rows.index, name="Outlier Columns")], axis=1)
+
+
+def get_outliers(df, cols_list, method="iqr", threshold=None):
+    """
+    Returns the outlier detector of the numeric columns of df, cached per dataset, columns, method and threshold.
+
+    Parameters:
+    df (pd.DataFrame): Dataframe to analyse.
+    cols_list (list): Names of the numeric columns to check, a single column or NumericColumn.cols_list.
+    method (str): 'iqr', 'zscore' or 'mad'. Default is 'iqr'.
+    threshold (float): Multiple of the spread beyond which a value is an outlier. Default is the default of the method.
+
+    Returns:
+    OutlierDetector: Bounds, counts and offending rows of the columns.
+    """
+    key = (dataset_fingerprint(df), tuple(cols_list), method, threshold, "outliers")
+    return COLUMN_CACHE.get_or_compute(
+        key,
+        lambda: OutlierDetector.from_df(df, list(cols_list), method=method, threshold=threshold),
+    )
@@ -1,34 +1,138 @@
 import streamlit as st
 
+from common.executor import cancel_others, render_when_ready, submit, submit_after
+from common.fingerprint import dataset_fingerprint
 from tab_text.logics import TextColumn
 
-def display_tab_text_content(file_path=None, df=None):
-    
-    # Instantiates the TextColumn object
-    if st.session_state.text_column is None:
-        st.session_state.text_column = TextColumn(file_path=file_path, df=df) # Change df to state
+def display_tab_text_content(file_path=None, df=None, store=None, schema=None, dataset_key=None):
 
-    # Calls find_text_cols method to generate list of text columns
-    st.session_state.text_column.find_text_cols()
+    if store is not None:
+        # Lists the text columns of a dataset loaded column by column from its schema
+        cols_list = store.schema.get_text_cols()
+    else:
+        # Instantiates the TextColumn object
+        if st.session_state.text_column is None:
+            st.session_state.text_column = TextColumn(file_path=file_path, df=df, schema=schema, dataset_key=dataset_key) # Change df to state
+
+        # Calls find_text_cols method to generate list of text columns
+        st.session_state.text_column.find_text_cols()
+        cols_list = st.session_state.text_column.cols_list
 
     # Drop down list from text columns
     st.session_state.selected_text_col = st.selectbox(
         'Which text column do you want to explore',
-        st.session_state.text_column.cols_list
+        cols_list
     )
 
-    # Setting up the data for the selected column
-    st.session_state.text_column.set_data(col_name=st.session_state.selected_text_col)
+    if st.session_state.selected_text_col is None:
+        return
+
+    # Cancels the computations this session still has pending for a previously selected column
+    session_id = st.session_state.get('session_id')
+    # The fingerprint passed by the dataset is kept on the TextColumn object, so it is only computed once without one
+    if store is not None:
+        dataset_key = store.get_key()
+    else:
+        if st.session_state.text_column.dataset_key is None:
+            st.session_state.text_column.dataset_key = dataset_fingerprint(st.session_state.text_column.df)
+        dataset_key = st.session_state.text_column.dataset_key
+    cancel_others(dataset_key, 'text', st.session_state.selected_text_col, session_id)
+
+    # Setting up the data for the selected column and each block of results in the background, the column of a
+    # dataset loaded column by column being parsed first
+    key = (dataset_key, 'text', st.session_state.selected_text_col)
+    if store is not None:
+        column = submit(key + ('serie',), _load_projected_column, store, st.session_state.selected_text_col, session_id=session_id)
+    else:
+        column = submit(
+            key + ('serie',), _load_column, st.session_state.text_column.df, st.session_state.selected_text_col,
+            st.session_state.text_column.get_schema(), dataset_key, session_id=session_id,
+        )
+    summary = submit_after(key + ('summary',), column, _compute_summary, session_id=session_id)
+    barchart = submit_after(key + ('barchart',), column, _compute_barchart, session_id=session_id)
+    length_histogram = submit_after(key + ('length_histogram',), column, _compute_length_histogram, session_id=session_id)
+    frequent = submit_after(key + ('frequent',), column, _compute_frequent, session_id=session_id)
+
+    # Slider to choose how similar two values must be to be reported as near duplicates
+    threshold = st.slider('Near-duplicate similarity threshold', min_value=0.5, max_value=1.0, value=0.8, step=0.05)
+    near_duplicates = submit_after(key + (f'near_duplicates_{threshold}',), column, _compute_near_duplicates, threshold, session_id=session_id)
 
     # First Streamlit Expander container
     with st.expander('Text Column', expanded=True):
-        # Display the summary as a Streamlit table
-        st.table(st.session_state.text_column.get_summary())
+        # Placeholder for the summary as a Streamlit table
+        summary_slot = st.empty()
 
-        # Display the bar chart
+        # Placeholder for the bar chart
         st.write('**Bar Chart**')
-        st.altair_chart(st.session_state.text_column.barchart, use_container_width=True)
+        barchart_slot = st.empty()
 
-        # Display the most frequent values dataframe
+        # Placeholder for the histogram of the lengths
+        st.write('**Length Histogram**')
+        length_histogram_slot = st.empty()
+
+        # Placeholder for the most frequent values dataframe
         st.write('**Most Frequent Values**')
-        st.dataframe(st.session_state.text_column.frequent)
\ No newline at end of file
+        frequent_slot = st.empty()
+
+        # Placeholder for the clusters of near-duplicate values
+        st.write('**Near-Duplicate Values**')
+        near_duplicates_slot = st.empty()
+
+        # Displays each block as soon as its result is ready
+        render_when_ready([
+            (summary_slot, summary, st.table),
+            (barchart_slot, barchart, lambda chart: st.altair_chart(chart, use_container_width=True)),
+            (length_histogram_slot, length_histogram, lambda chart: st.altair_chart(chart, use_container_width=True)),
+            (frequent_slot, frequent, st.dataframe),
+            (near_duplicates_slot, near_duplicates, st.dataframe),
+        ])
+
+
+def _load_projected_column(store, col_name):
+
+    # Parses the selected column the first time it is explored
+    return _load_column(store.get_columns([col_name]), col_name, store.schema, store.get_key())
+
+
+def _load_column(df, col_name, schema=None, dataset_key=None):
+
+    # Loads the selected column as text in a new TextColumn object
+    text_column = TextColumn(df=df, schema=schema, dataset_key=dataset_key)
+    text_column.set_serie(col_name)
+    return text_column
+
+
+def _compute_summary(text_column):
+
+    # Computes the summary table, or an empty one if the column only has missing values
+    if not text_column.is_serie_none():
+        text_column.set_stats()
+    return text_column.get_summary()
+
+
+def _compute_barchart(text_column):
+
+    if not text_column.is_serie_none():
+        text_column.set_barchart()
+    return text_column.barchart
+
+
+def _compute_length_histogram(text_column):
+
+    if not text_column.is_serie_none():
+        text_column.set_length_histogram()
+    return text_column.length_histogram
+
+
+def _compute_frequent(text_column):
+
+    if not text_column.is_serie_none():
+        text_column.set_frequent()
+    return text_column.frequent
+
+
+def _compute_near_duplicates(text_column, threshold):
+
+    if not text_column.is_serie_none():
+        text_column.set_near_duplicates(threshold)
+    return text_column.near_duplicates
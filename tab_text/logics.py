@@ -1,11 +1,47 @@
+import numpy as np
 import pandas as pd
 import altair as alt
+from common.column_cache import COLUMN_CACHE, get_factorized, get_null_mask, get_value_counts
+from common.fingerprint import dataset_fingerprint
+from common.schema import get_schema
+from tab_text.near_duplicates import get_near_duplicates
+
+# pyarrow computes the lengths over the string buffer, Pandas string methods are used if it is not installed
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+except ImportError:
+    pa = None
+    pc = None
+
+
+def compute_lengths(values):
+    """
+    Computes the length in characters and the number of whitespace-separated tokens of each value.
+
+    Parameters:
+    values (pd.Index or pd.Series): Text values without missing values.
+
+    Returns:
+    tuple: Lengths (np.ndarray) and token counts (np.ndarray).
+    """
+    if pc is not None:
+        array = pa.array(values, type=pa.large_string(), from_pandas=True)
+        lengths = pc.utf8_length(array).to_numpy(zero_copy_only=False)
+        tokens = pc.count_substring_regex(array, r"\S+").to_numpy(zero_copy_only=False)
+    else:
+        lengths = values.str.len().to_numpy()
+        tokens = values.str.count(r"\S+").to_numpy()
+    return lengths.astype(np.int64), tokens.astype(np.int64)
+
 
 class TextColumn:
 
-    def __init__(self, file_path=None, df=None):
+    def __init__(self, file_path=None, df=None, schema=None, dataset_key=None):
         self.file_path = file_path
         self.df = df
+        self.schema = schema
+        self.dataset_key = dataset_key
         self.cols_list = []
         self.serie = None
         self.n_unique = None
@@ -17,8 +53,19 @@ class TextColumn:
         self.n_upper = None
         self.n_alpha = None
         self.n_digit = None
+        self.len_min = None
+        self.len_max = None
+        self.len_mean = None
+        self.len_p25 = None
+        self.len_median = None
+        self.len_p75 = None
+        self.len_p95 = None
+        self.tokens_mean = None
+        self.tokens_max = None
         self.barchart = alt.Chart()
+        self.length_histogram = alt.Chart()
         self.frequent = pd.DataFrame(columns=['value', 'occurrence', 'percentage'])
+        self.near_duplicates = pd.DataFrame(columns=['cluster', 'value', 'occurrence', 'similarity'])
     
 
     def find_text_cols(self):
@@ -26,7 +73,7 @@ class TextColumn:
         # Checks if df was passed when object instantiated
         if self.df is not None:
             print("Dataframe already loaded.")
-            self.cols_list = self.df.select_dtypes(include=['object', 'string']).columns
+            self.cols_list = self.get_schema().get_text_cols()
             return
 
         # If not load the file from the file path
@@ -38,15 +85,14 @@ class TextColumn:
         except Exception as e:
             print(f"An error occurred while loading the dataframe: {e}")
 
-        # updates all columns with strings/objects
-        self.cols_list = self.df.select_dtypes(include=['object', 'string']).columns
+        # updates all text columns from the schema shared by all tabs
+        self.cols_list = self.get_schema().get_text_cols()
         
 
     def set_data(self, col_name):
 
         # Set up column we are investigating
-        self.serie = self.df[col_name]
-        self.convert_serie_to_text()
+        self.set_serie(col_name)
 
         # Check if column is empty
         if(self.is_serie_none()):
@@ -54,17 +100,34 @@ class TextColumn:
         else:
             print('Column is not empty')
             # Set Values from selected column
-            self.set_unique()
-            self.set_missing()
-            self.set_empty()
-            self.set_mode()
-            self.set_whitespace()
-            self.set_lowercase()
-            self.set_uppercase()
-            self.set_alphabet()
-            self.set_digit()
+            self.set_stats()
             self.set_barchart()
+            self.set_length_histogram()
             self.set_frequent()
+
+
+    def set_serie(self, col_name):
+
+        # Loads the selected column as text without computing any value
+        if self.dataset_key is None:
+            self.dataset_key = dataset_fingerprint(self.df)
+        self.serie = self.df[col_name]
+        self.convert_serie_to_text()
+
+
+    def set_stats(self):
+
+        # Computes the values displayed in the summary table
+        self.set_unique()
+        self.set_missing()
+        self.set_empty()
+        self.set_mode()
+        self.set_whitespace()
+        self.set_lowercase()
+        self.set_uppercase()
+        self.set_alphabet()
+        self.set_digit()
+        self.set_lengths()
         
 
     def convert_serie_to_text(self):
@@ -87,13 +150,13 @@ class TextColumn:
     def set_unique(self):
 
         # Counts unique values in series and stores in n_unique attribute.
-        self.n_unique = self.serie.nunique()
+        self.n_unique = len(self.get_value_counts())
         
 
     def set_missing(self):
 
         # Counts NaN values in series and stores in n_missing attribute.
-        self.n_missing = self.serie.isnull().sum()
+        self.n_missing = get_null_mask(self.serie, self.dataset_key, 'text').sum()
         
 
     def set_empty(self):
@@ -105,7 +168,9 @@ class TextColumn:
     def set_mode(self):
 
         # Counts the first most frequently occurring value in series and stores in n_mode attribute.
-        self.n_mode = self.serie.mode()[0]
+        # Ties are resolved like Series.mode(), which returns the smallest of the most frequent values.
+        str_counts = self.get_value_counts()
+        self.n_mode = str_counts[str_counts == str_counts.iloc[0]].index.min()
 
 
     def set_whitespace(self):
@@ -138,10 +203,24 @@ class TextColumn:
         self.n_digit = self.serie.str.isdigit().sum()
         
 
+    def set_lengths(self):
+
+        # Computes the distribution of the lengths and the number of tokens of the values in one vectorised pass.
+        lengths, tokens = self.get_lengths()
+        if len(lengths) == 0:
+            return
+        self.len_min = lengths.min()
+        self.len_max = lengths.max()
+        self.len_mean = lengths.mean()
+        self.len_p25, self.len_median, self.len_p75, self.len_p95 = np.percentile(lengths, [25, 50, 75, 95])
+        self.tokens_mean = tokens.mean()
+        self.tokens_max = tokens.max()
+
+
     def set_barchart(self):  
 
         # Creates dataframe with unique value for rows and a colummn with the count
-        agg_serie = self.serie.value_counts().reset_index()
+        agg_serie = self.get_value_counts().reset_index()
         agg_serie.rename(columns={agg_serie.columns[0]:self.serie.name, 
                                   agg_serie.columns[1]:'Count of Records'}, 
                          inplace=True)
@@ -154,11 +233,31 @@ class TextColumn:
             )
         )
 
+
+    def set_length_histogram(self, bins=30):
+
+        # Counts the lengths per bin before charting them, so only the bins are sent to the browser
+        lengths, _ = self.get_lengths()
+        if len(lengths) == 0:
+            return
+        n_bins = min(bins, int(lengths.max() - lengths.min()) + 1)
+        counts, edges = np.histogram(lengths, bins=n_bins, range=(lengths.min(), lengths.max() + 1))
+        length_counts = pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'Count of Records': counts})
+
+        # Creates the histogram and stores in length_histogram object
+        self.length_histogram = (
+        alt.Chart(length_counts).mark_bar().encode(
+            x=alt.X('bin_start:Q', bin='binned', title='Length (Characters)'),
+            x2='bin_end:Q',
+            y='Count of Records:Q'
+            )
+        )
+
       
     def set_frequent(self, end=20):
 
         # Create dataframe with rows of unique values and column with count
-        str_counts = self.serie.value_counts()
+        str_counts = self.get_value_counts()
         # Create a column of percentages
         str_percentage = str_counts/len(self.serie)
 
@@ -169,6 +268,41 @@ class TextColumn:
                                 .head(end))
         
 
+    def set_near_duplicates(self, threshold=0.8):
+
+        # Clusters the values spelled almost the same way, using MinHash signatures cached per column
+        self.near_duplicates = get_near_duplicates(self.serie, self.dataset_key, threshold)
+
+
+    def get_schema(self):
+
+        # Returns the schema passed by the dataset that loaded df, inferring it only once otherwise.
+        if self.schema is None:
+            self.schema = get_schema(self.df)
+        return self.schema
+
+
+    def get_value_counts(self):
+
+        # Shares the count of each value between the summary, the bar chart and the frequent values.
+        return get_value_counts(self.serie, self.dataset_key, 'text')
+
+
+    def get_lengths(self):
+
+        # Shares the lengths and token counts of the non-missing values between the summary and the length histogram.
+        # They are computed once per distinct value and then spread to the rows through the factorized codes.
+        def lengths():
+            codes, uniques = get_factorized(self.serie, self.dataset_key, 'text')
+            unique_lengths, unique_tokens = compute_lengths(uniques)
+            codes = codes[codes >= 0]
+            return unique_lengths[codes], unique_tokens[codes]
+
+        if self.dataset_key is None:
+            return lengths()
+        return COLUMN_CACHE.get_or_compute((self.dataset_key, self.serie.name, 'text', 'lengths'), lengths)
+
+
     def get_summary(self):
 
         # Creating the dataframe that shows the summary values.
@@ -180,7 +314,16 @@ class TextColumn:
                                             'Number of Rows with Only Uppercases',
                                             'Number of Rows with Only Alphabet',
                                             'Number of Rows with Only Digits',
-                                            'Mode Value'],
+                                            'Mode Value',
+                                            'Minimum Length',
+                                            'Maximum Length',
+                                            'Average Length',
+                                            '25th Percentile Length',
+                                            'Median Length',
+                                            '75th Percentile Length',
+                                            '95th Percentile Length',
+                                            'Average Number of Tokens',
+                                            'Maximum Number of Tokens'],
                              'Value':[self.n_unique,
                                       self.n_missing,
                                       self.n_empty,
@@ -189,7 +332,16 @@ class TextColumn:
                                       self.n_upper,
                                       self.n_alpha,
                                       self.n_digit,
-                                      self.n_mode]},
+                                      self.n_mode,
+                                      self.len_min,
+                                      self.len_max,
+                                      self.len_mean,
+                                      self.len_p25,
+                                      self.len_median,
+                                      self.len_p75,
+                                      self.len_p95,
+                                      self.tokens_mean,
+                                      self.tokens_max]},
                              dtype='object'
                             ).astype(str)
         
@@ -0,0 +1,196 @@
+import numpy as np
+import pandas as pd
+from common.column_cache import COLUMN_CACHE, get_factorized, get_value_counts
+
+
+def get_shingles(values, shingle_size=5):
+    """
+    Hashes the overlapping character shingles of each value, working on the concatenated UTF-8 buffer of all the values.
+
+    Values are lowercased and their whitespaces collapsed first, and values shorter than a shingle are padded with spaces.
+
+    Parameters:
+    values (pd.Index or pd.Series): Distinct text values.
+    shingle_size (int): Number of bytes of a shingle, at most 8. Default is 5.
+
+    Returns:
+    tuple: Hash of each shingle (np.ndarray of uint64) and index of its value (np.ndarray), sorted by value.
+    """
+    text = pd.Series(values, dtype=object).astype(str).str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+    text = text.str.pad(shingle_size, side="right")
+    encoded = [value.encode("utf-8") for value in text]
+
+    lengths = np.fromiter((len(value) for value in encoded), dtype=np.int64, count=len(encoded))
+    ends = np.cumsum(lengths)
+    buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+    # Shingles starting at every position of the buffer, only keeping the ones inside a single value
+    n_starts = max(len(buffer) - shingle_size + 1, 0)
+    starts = np.arange(n_starts)
+    owners = np.searchsorted(ends, starts, side="right")
+    valid = starts + shingle_size <= ends[owners]
+    starts, owners = starts[valid], owners[valid]
+
+    shingles = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(shingle_size):
+        shingles |= buffer[starts + offset] << np.uint64(8 * offset)
+    return shingles, owners
+
+
+def get_signatures(values, num_perm=128, shingle_size=5, seed=0):
+    """
+    Computes the MinHash signature of each value: for each hash function, the minimum hash of the value's shingles.
+
+    Parameters:
+    values (pd.Index or pd.Series): Distinct text values.
+    num_perm (int): Number of hash functions, i.e. length of the signatures. Default is 128.
+    shingle_size (int): Number of bytes of a shingle. Default is 5.
+    seed (int): Seed of the hash functions. Default is 0.
+
+    Returns:
+    np.ndarray: Signatures of shape (len(values), num_perm).
+    """
+    signatures = np.empty((len(values), num_perm), dtype=np.uint32)
+    if len(values) == 0:
+        return signatures
+
+    shingles, owners = get_shingles(values, shingle_size)
+    segments = np.searchsorted(owners, np.arange(len(values)))
+
+    # Multiply-shift hash functions, i.e. the high 32 bits of a * x + b computed with wrapping 64-bit integers, are
+    # applied to the distinct shingles and then spread to the values before taking the minimum of each value
+    unique_shingles, inverse = np.unique(shingles, return_inverse=True)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+    for i in range(num_perm):
+        hashes = ((unique_shingles * a[i] + b[i]) >> np.uint64(32)).astype(np.uint32)
+        signatures[:, i] = np.minimum.reduceat(hashes[inverse], segments)
+    return signatures
+
+
+def get_cached_signatures(serie, dataset_key, num_perm=128, shingle_size=5):
+    """
+    Returns the signatures of the distinct values of a text column, cached per column in the column cache.
+
+    Parameters:
+    serie (pd.Series): Text column, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    num_perm (int): Number of hash functions. Default is 128.
+    shingle_size (int): Number of bytes of a shingle. Default is 5.
+
+    Returns:
+    np.ndarray: Signatures of the values returned by get_factorized, in the same order.
+    """
+    def compute():
+        _, uniques = get_factorized(serie, dataset_key, 'text')
+        return get_signatures(uniques, num_perm, shingle_size)
+
+    if dataset_key is None:
+        return compute()
+    return COLUMN_CACHE.get_or_compute((dataset_key, serie.name, 'text', f'minhash_{num_perm}_{shingle_size}'), compute)
+
+
+def get_candidate_groups(signatures, n_bands=16, threshold=0.8):
+    """
+    Groups the values sharing at least one LSH bucket, i.e. an identical band of their signatures.
+
+    Each value is linked to the first value of each of its buckets, so the number of links stays linear in the
+    number of values. Links between values less similar than threshold are dropped, and the groups are the connected
+    components of the remaining links.
+
+    Parameters:
+    signatures (np.ndarray): MinHash signatures of shape (n_values, num_perm).
+    n_bands (int): Number of bands the signatures are split into. Default is 16.
+    threshold (float): Minimum estimated Jaccard similarity of two linked values. Default is 0.8.
+
+    Returns:
+    np.ndarray: Group label of each value, values without any candidate being alone in their group.
+    """
+    n_values, num_perm = signatures.shape
+    rows = num_perm // n_bands
+    labels = np.arange(n_values)
+    sources, targets = [], []
+
+    for band in range(n_bands):
+        # Each band is reduced to a single 64-bit bucket key
+        keys = np.zeros(n_values, dtype=np.uint64)
+        for row in range(band * rows, (band + 1) * rows):
+            keys = keys * np.uint64(1_000_003) + signatures[:, row].astype(np.uint64)
+
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        first = np.flatnonzero(np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1])))
+        leaders = order[np.repeat(first, np.diff(np.append(first, n_values)))]
+        linked = leaders != order
+        sources.append(order[linked])
+        targets.append(leaders[linked])
+
+    # Links found in several bands are only checked once
+    pairs = np.unique(np.concatenate(sources).astype(np.int64) * n_values + np.concatenate(targets))
+    sources, targets = pairs // n_values, pairs % n_values
+    similar = (signatures[sources] == signatures[targets]).mean(axis=1) >= threshold
+    sources, targets = sources[similar], targets[similar]
+
+    # Connected components by propagating the smallest label along the links
+    while len(sources):
+        smallest = np.minimum(labels[sources], labels[targets])
+        previous = labels.copy()
+        np.minimum.at(labels, sources, smallest)
+        np.minimum.at(labels, targets, smallest)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            break
+    return labels
+
+
+def get_near_duplicates(serie, dataset_key, threshold=0.8, num_perm=128, n_bands=16):
+    """
+    Finds the clusters of distinct values of a text column that are spelled almost the same way.
+
+    Parameters:
+    serie (pd.Series): Text column, named after the column.
+    dataset_key (str): Fingerprint of the dataset the column comes from.
+    threshold (float): Minimum estimated Jaccard similarity between a value and the most frequent value of its cluster. Default is 0.8.
+    num_perm (int): Number of hash functions. Default is 128.
+    n_bands (int): Number of LSH bands. Default is 16.
+
+    Returns:
+    pd.DataFrame: Dataframe with the columns cluster, value, occurrence and similarity, one row per clustered value,
+    the most frequent value of each cluster coming first.
+    """
+    columns = ['cluster', 'value', 'occurrence', 'similarity']
+    _, uniques = get_factorized(serie, dataset_key, 'text')
+    if len(uniques) < 2:
+        return pd.DataFrame(columns=columns)
+
+    signatures = get_cached_signatures(serie, dataset_key, num_perm)
+    labels = get_candidate_groups(signatures, n_bands, threshold)
+    occurrences = get_value_counts(serie, dataset_key, 'text').reindex(uniques).to_numpy()
+
+    # Only the groups with several values are checked against their most frequent value
+    group_sizes = np.bincount(labels, minlength=len(labels))
+    members = np.flatnonzero(group_sizes[labels] > 1)
+    if len(members) == 0:
+        return pd.DataFrame(columns=columns)
+
+    members = members[np.lexsort((-occurrences[members], labels[members]))]
+    member_labels = labels[members]
+    first = np.concatenate(([True], member_labels[1:] != member_labels[:-1]))
+    representatives = members[np.maximum.accumulate(np.where(first, np.arange(len(members)), 0))]
+    similarity = (signatures[members] == signatures[representatives]).mean(axis=1)
+
+    clusters = pd.DataFrame({
+        'cluster': member_labels,
+        'value': uniques[members],
+        'occurrence': occurrences[members],
+        'similarity': similarity,
+    })
+    clusters = clusters[clusters['similarity'] >= threshold]
+    clusters = clusters[clusters.groupby('cluster')['value'].transform('size') > 1]
+
+    # Clusters are numbered by decreasing number of rows they cover
+    rows = clusters.groupby('cluster')['occurrence'].transform('sum')
+    clusters = clusters.assign(rows=rows).sort_values(['rows', 'cluster', 'similarity'], ascending=[False, True, False], kind='stable')
+    clusters['cluster'] = pd.factorize(clusters['cluster'])[0] + 1
+    return clusters[columns].reset_index(drop=True)
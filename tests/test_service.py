@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from urllib.parse import quote
+
+import pytest
+
+from service.profiles import ProfileStore
+from service.server import create_server
+
+CSV = b"id,price,city,sold\n1,10.5,Paris,2023-01-02\n2,,Lyon,2023-01-03\n3,7.25,Paris,\n4,3.0,Nice,2023-01-05\n"
+
+
+@pytest.fixture
+def service(tmp_path):
+    # Serves a store of at most 2 datasets on a free port for the duration of a test
+    server = create_server("127.0.0.1", 0, ProfileStore(directory=str(tmp_path), max_datasets=2))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def request(url, data=None):
+    # Returns the status code and the decoded JSON body of a request, whatever its status code
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, data=data, method="POST" if data else "GET")) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def upload(base_url, content, name="sales.csv"):
+    code, status = request(f"{base_url}/datasets?name={name}", content)
+    assert code == 202
+    return status["id"]
+
+
+def wait_for_profile(base_url, dataset_id, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        code, status = request(f"{base_url}/datasets/{dataset_id}")
+        assert code == 200
+        if status["status"] not in ("pending", "running"):
+            return status
+        time.sleep(0.05)
+    raise TimeoutError(f"The profile of {dataset_id} was not computed in {timeout} seconds.")
+
+
+def test_upload_and_profile(service):
+    dataset_id = upload(service, CSV)
+
+    status = wait_for_profile(service, dataset_id)
+    assert status == {"id": dataset_id, "name": "sales.csv", "status": "done", "error": None}
+
+    code, profile = request(f"{service}/datasets/{dataset_id}/profile")
+    assert code == 200
+    assert profile["source"] == "sales.csv"
+    assert set(profile["columns"]) == {"id", "price", "city", "sold"}
+
+    code, columns = request(f"{service}/datasets/{dataset_id}/columns")
+    assert code == 200
+    assert columns["price"] == "num"
+
+    code, column = request(f"{service}/datasets/{dataset_id}/columns/price")
+    assert code == 200
+    assert column["summary"]["Number of Missing Values"] == 1
+
+    code, frequent = request(f"{service}/datasets/{dataset_id}/columns/{quote('city')}/frequent")
+    assert code == 200
+    assert frequent[0]["value"] == "Paris" and frequent[0]["occurrence"] == 2
+
+
+def test_identical_uploads_share_their_id(service):
+    assert upload(service, CSV) == upload(service, CSV, name="copy.csv")
+
+
+def test_unknown_paths_answer_404(service):
+    dataset_id = upload(service, CSV)
+    wait_for_profile(service, dataset_id)
+
+    assert request(f"{service}/datasets/{'0' * 32}")[0] == 404
+    assert request(f"{service}/datasets/{'0' * 32}/profile")[0] == 404
+    assert request(f"{service}/datasets/{dataset_id}/columns/missing")[0] == 404
+    assert request(f"{service}/unknown")[0] == 404
+
+
+def test_evicted_dataset_answers_404(service):
+    first_id = upload(service, CSV)
+    upload(service, CSV + b"5,1.0,Lille,2023-01-06\n")
+    upload(service, CSV + b"6,2.0,Lille,2023-01-07\n")
+
+    # The store keeps 2 datasets, so the least recently requested one was removed
+    assert request(f"{service}/datasets/{first_id}")[0] == 404
+    assert request(f"{service}/datasets/{first_id}/summary")[0] == 404
@@ -0,0 +1,121 @@
+import sqlite3
+import uuid
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tab_df.sql import SQLDataset
+
+N_ROWS = 2_000
+NAMES = ["alpha", "Beta", "GAMMA", "delta 2", "", "   ", "123", "x"]
+
+
+@pytest.fixture
+def tables():
+    # Fills an in-memory SQLite table shared by the connections of the pool, and reads it back with pandas
+    uri = f"file:{uuid.uuid4().hex}?mode=memory&cache=shared"
+    keeper = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    rng = np.random.default_rng(0)
+
+    rows = []
+    for position in range(N_ROWS):
+        amount = None if position % 7 == 0 else round(float(rng.normal(50, 20)), 3)
+        # Values around 3e9 overflow 32-bit integers
+        big = None if position % 11 == 0 else int(3_000_000_000 + rng.integers(-5, 6) * 100_000_000)
+        if position % 13 == 0:
+            big = 0
+        if position % 17 == 0:
+            big = -int(3_000_000_000)
+        # Values around 3e18 overflow the 64-bit integer sum of SQLite after a few rows
+        huge = None if position % 19 == 0 else int(3 * 10 ** 18 + int(rng.integers(-1000, 1000)) * 10 ** 15)
+        name = None if position % 5 == 0 else NAMES[int(rng.integers(len(NAMES)))]
+        rows.append((position, amount, big, huge, name))
+
+    keeper.execute('CREATE TABLE "sales" ("id" INTEGER, "amount" REAL, "big" INTEGER, "huge" INTEGER, "name" TEXT)')
+    keeper.executemany('INSERT INTO "sales" VALUES (?, ?, ?, ?, ?)', rows)
+    keeper.commit()
+
+    dataset = SQLDataset(None, "sales", connect=lambda: sqlite3.connect(uri, uri=True, check_same_thread=False))
+    dataset.set_df()
+    dataset.set_data()
+    df = pd.read_sql_query('SELECT * FROM "sales"', keeper)
+    yield dataset, df
+
+    dataset.close()
+    keeper.close()
+
+
+def get_values(summary_df):
+    return dict(zip(summary_df["Description"], summary_df["Value"]))
+
+
+@pytest.mark.parametrize("col_name", ["amount", "big", "huge"])
+def test_num_summary_matches_pandas(tables, col_name):
+    dataset, df = tables
+    serie = df[col_name]
+    values = get_values(dataset.get_num_summary(col_name))
+
+    expected = {
+        "Number of Unique Values": serie.nunique(),
+        "Number of Missing Values": serie.isna().sum(),
+        "Average Value": serie.mean(),
+        "Standard Deviation": serie.std(),
+        "Minimum Value": serie.min(),
+        "Maximum Value": serie.max(),
+        "Median Value": serie.median(),
+        "Number of Zeros": (serie == 0).sum(),
+        "Number of Negatives": (serie < 0).sum(),
+    }
+    for description, value in expected.items():
+        assert float(values[description]) == pytest.approx(float(value), rel=1e-9, abs=0.01), description
+
+
+def test_text_summary_matches_pandas(tables):
+    dataset, df = tables
+    serie = df["name"]
+    text = serie.dropna()
+    values = get_values(dataset.get_text_summary("name"))
+
+    counts = text.value_counts()
+    expected = {
+        "Number of Unique Values": text.nunique(),
+        "Number of Rows with Missing Values": serie.isna().sum(),
+        "Number of Empty Rows": (text == "").sum(),
+        "Number of Rows with Only Whitespace": text.str.isspace().sum(),
+        "Number of Rows with Only Lowercases": text.str.islower().sum(),
+        "Number of Rows with Only Uppercases": text.str.isupper().sum(),
+        "Number of Rows with Only Alphabet": text.str.isalpha().sum(),
+        "Number of Rows with Only Digits": text.str.isdigit().sum(),
+        "Mode Value": counts[counts == counts.iloc[0]].index.min(),
+    }
+    for description, value in expected.items():
+        assert values[description] == str(value), description
+
+
+@pytest.mark.parametrize("col_name", ["amount", "big", "huge", "name"])
+def test_frequent_matches_pandas(tables, col_name):
+    dataset, df = tables
+    frequent = dataset.get_frequent(col_name, end=5)
+
+    counts = df[col_name].value_counts().rename_axis("value").reset_index(name="occurrence")
+    counts = counts.sort_values(["occurrence", "value"], ascending=[False, True], kind="stable").head(5)
+    assert frequent["value"].tolist() == counts["value"].tolist()
+    assert frequent["occurrence"].tolist() == counts["occurrence"].tolist()
+    assert frequent["percentage"].tolist() == pytest.approx((counts["occurrence"] / len(df) * 100).tolist())
+
+
+@pytest.mark.parametrize("col_name", ["amount", "big", "huge"])
+def test_histogram_matches_pandas(tables, col_name):
+    dataset, df = tables
+    histogram = dataset.get_histogram(col_name, bins=20)
+
+    values = df[col_name].dropna().astype(float)
+    expected, edges = np.histogram(values, bins=20, range=(values.min(), values.max()))
+    counts = np.zeros(20, dtype=np.int64)
+    bins = np.rint((histogram["bin_start"] - values.min()) / (edges[1] - edges[0])).astype(int)
+    counts[bins] = histogram["count"]
+
+    assert counts.sum() == len(values)
+    assert counts.tolist() == expected.tolist()
+    assert histogram["bin_start"].tolist() == pytest.approx(edges[:-1][bins].tolist())